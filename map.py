@@ -1,12 +1,15 @@
 import tkinter as tk
-import heapq
+import os
 import math
 import json
 import socket
 import threading
 import time
-from ui_components import make_back_button
-from profiler import profile
+from ui_components import make_back_button, make_button
+from renderers import CanvasRenderer
+from pose_filter import PoseFilter
+from profiler import profile, count
+from pathfinding import aisle_goals, make_planner, plan_to_any, PathFollower, PlanWorker, RoutePlanner
 
 CELL_SIZE = 30 # pixels per grid cell
 
@@ -18,12 +21,32 @@ THETA_IN_DEGREES = True
 THETA_OFFSET_DEGREES = 90.0
 
 # Performance Tuning
-DRAW_INTERVAL_MS = 20
+DRAW_INTERVAL_MS = 20  # Frame interval while the pose or camera is still settling
+POSE_POLL_MS = 100  # How often the latest UDP pose is checked (and wakes the renderer)
 PATH_RECALC_INTERVAL_S = 1.0
 CAMERA_SMOOTHING = 0.12
+# Predict the drawn pose with pose_filter.PoseFilter; off, the drawn pose blends towards the last packet
+POSE_FILTER_ENABLED = True
+POSE_SMOOTHING = 0.2  # Per-frame blend towards the latest pose when the filter is off
 POSE_EPSILON = 0.02
 THETA_EPSILON = 0.01
 CAMERA_EPSILON = 0.5  # Only update camera if moved this many pixels
+VIEW_WIDTH = 800
+VIEW_HEIGHT = 440  # Slightly less than the window to account for the header
+TILE_CELLS = 16  # Static layer tile edge, in cells
+TILE_MARGIN_PX = 120  # Tiles this far outside the view are kept drawn
+# Map scales (x CELL_SIZE) the zoom buttons and wheel step through; each gets its own static layer
+ZOOM_LEVELS = (0.35, 0.6, 1.0, 1.6)
+DEFAULT_ZOOM = 1.0
+LABEL_MIN_ZOOM = 1.0  # Aisle labels and the goal caption from this scale up
+CELL_DETAIL_ZOOM = 1.6  # Shelves drawn cell by cell from this scale up
+# See pathfinding.PLANNERS for the available engines; tests/benchmark_suite.py compares them.
+# Deployments can pick one without code changes via CADDYMATE_PATH_ENGINE.
+PATH_ENGINE = os.environ.get("CADDYMATE_PATH_ENGINE", "distance_field")
+PATH_CACHE_ENABLED = True  # Share planned paths across StoreMap instances
+PLAN_POLL_MS = 30  # How often finished background plans are handed to the UI
+ROUTE_MAX_DEVIATION = 1.5  # Cells the cart may stray from the path before replanning
+ROUTE_MAX_HEADING_ERROR_DEG = 120.0  # Heading away from the path that triggers a replan
 
 # Map Configuration
 AISLE_ROWS = 2
@@ -31,26 +54,41 @@ AISLE_ROWS = 2
 def generate_map(num_aisles, num_rows):
     """
     Generates a grid representation of the store layout.
+
+    Shelves are laid out in num_rows rows with an aisle on either side of
+    every shelf, so each row holds ceil(num_aisles / num_rows) aisles and the
+    grid grows to fit them. generate_map(16, 2) is the stock 39x28 store.
+    Each aisle records its label anchors ("top", "bottom"), its midpoint
+    "goal" and "goals": both aisle ends and the middle of every bay.
+
+    Args:
+        num_aisles (int): Number of aisles to place.
+        num_rows (int): Number of shelf rows.
+
+    Returns:
+        tuple: (grid, aisle_locs, grid_width, grid_height).
     """
     SHELF_WIDTH = 2
     SHELF_HEIGHT = 8
     SHELF_SPACING_X = 5  # Distance from start of one shelf to start of next (3 to 8)
+    SHELF_SPACING_Y = 13  # Distance from start of one shelf row to the next
+    BAY_LENGTH = 4  # Shelf rows per bay; each bay gets its own goal cell
     
     START_X = 3
-    ROW_1_Y = 3
-    ROW_2_Y = 16
+    START_Y = 3
     
-    SHELVES_PER_ROW = 7
+    num_rows = max(1, num_rows)
+    aisles_per_row = max(2, math.ceil(num_aisles / num_rows))
+    SHELVES_PER_ROW = aisles_per_row - 1
     
     # Calculate Grid Size
     # Width: Start + Shelves + End Margin
-    # Last shelf ends at: START_X + (6 * 5) + 2 = 35
-    # Add space for last aisle (approx 3 wide) + wall = 39
-    grid_width = 39
+    # Last shelf ends at: START_X + (SHELVES_PER_ROW - 1) * 5 + 2
+    # Add space for last aisle (approx 3 wide) + wall
+    grid_width = START_X + (SHELVES_PER_ROW - 1) * SHELF_SPACING_X + SHELF_WIDTH + 4
     
-    # Height: Row 2 Start + Height + Margin
-    # 16 + 8 + 3 = 27 + wall = 28
-    grid_height = 28
+    # Height: Last Row Start + Height + Margin + wall
+    grid_height = START_Y + (num_rows - 1) * SHELF_SPACING_Y + SHELF_HEIGHT + 4
     
     grid = [[0 for _ in range(grid_width)] for _ in range(grid_height)]
     aisle_locs = {}
@@ -63,323 +101,382 @@ def generate_map(num_aisles, num_rows):
         grid[0][c] = 1
         grid[grid_height-1][c] = 1
 
+    row_starts = [START_Y + k * SHELF_SPACING_Y for k in range(num_rows)]
+
     # Place Shelves
-    for row_start_y in [ROW_1_Y, ROW_2_Y]:
+    for row_start_y in row_starts:
         for i in range(SHELVES_PER_ROW):
             sx = START_X + i * SHELF_SPACING_X
             for r in range(row_start_y, row_start_y + SHELF_HEIGHT):
                 for c in range(sx, sx + SHELF_WIDTH):
-                    if 0 <= r < grid_height and 0 <= c < grid_width:
-                        grid[r][c] = 1
+                    grid[r][c] = 1
 
-    # Define Aisles (8 per row)
+    # Define Aisles (one either side of every shelf)
     aisle_count = 1
-    for row_start_y in [ROW_1_Y, ROW_2_Y]:
+    for row_start_y in row_starts:
         for i in range(SHELVES_PER_ROW + 1):
+            if aisle_count > num_aisles:
+                break
             cx = 1.5 + i * SHELF_SPACING_X
             top_y = row_start_y
             bot_y = row_start_y + SHELF_HEIGHT - 1
             mid_y = (top_y + bot_y) / 2
+            # Both aisle ends plus the middle of every bay along the shelf
+            bay_rows = [top_y + b * BAY_LENGTH + BAY_LENGTH // 2 for b in range(SHELF_HEIGHT // BAY_LENGTH)]
+            goal_rows = sorted({top_y, bot_y, *bay_rows})
             
             aisle_locs[str(aisle_count)] = {
                 "top": (top_y, cx),
                 "bottom": (bot_y, cx),
-                "goal": (int(mid_y), int(cx))
+                "goal": (int(mid_y), int(cx)),
+                "goals": [(r, int(cx)) for r in goal_rows]
             }
             aisle_count += 1
             
     return grid, aisle_locs, grid_width, grid_height
 
-@profile
-def theta_star(grid, start, goal):
+def shelf_rectangles(grid):
     """
-    Implements the Theta* pathfinding algorithm (any-angle variant of A*).
+    Covers the occupied cells of a grid with axis-aligned rectangles.
+
+    Each row is split into maximal runs of occupied cells, and a run is
+    merged with the identical run on the rows below it. Shelves and walls
+    become one rectangle each instead of one per cell.
 
     Args:
         grid (list): 2D list representing the map (0=walkable, 1=obstacle).
-        start (tuple): (row, col) starting coordinates.
-        goal (tuple): (row, col) goal coordinates.
 
     Returns:
-        list: A list of (row, col) tuples representing the path, or None if no path found.
+        list: (row0, col0, row1, col1) rectangles with exclusive ends.
     """
-    rows, cols = len(grid), len(grid[0])
-    open_set = []
-    heapq.heappush(open_set, (0, start))
-    parent = {start: start}
-    g_score = {start: 0.0}
-
-    def heuristic(a, b):
-        """Euclidean distance heuristic."""
-        return math.hypot(a[0] - b[0], a[1] - b[1])
-
-    def distance(a, b):
-        return math.hypot(a[0] - b[0], a[1] - b[1])
-
-    def line_of_sight(a, b):
-        """Checks line-of-sight between two grid cells without cutting corners."""
-        r0, c0 = a
-        r1, c1 = b
-        if grid[r0][c0] == 1 or grid[r1][c1] == 1:
-            return False
+    rects = []
+    open_runs = {}  # (col0, col1) -> first row of a run still being extended
+    for r in range(len(grid) + 1):
+        runs = set()
+        if r < len(grid):
+            row = grid[r]
+            c = 0
+            while c < len(row):
+                if row[c] == 1:
+                    start = c
+                    while c < len(row) and row[c] == 1:
+                        c += 1
+                    runs.add((start, c))
+                else:
+                    c += 1
+        for run in [run for run in open_runs if run not in runs]:
+            rects.append((open_runs.pop(run), run[0], r, run[1]))
+        for run in runs:
+            open_runs.setdefault(run, r)
+    return rects
+
+def tile_contents(grid, aisle_locs, tile_cells=TILE_CELLS, per_cell=False):
+    """
+    Splits the static layer (shelf rectangles and aisle labels) into square tiles.
 
-        dr = r1 - r0
-        dc = c1 - c0
-        step_r = 1 if dr > 0 else -1
-        step_c = 1 if dc > 0 else -1
-        dr = abs(dr)
-        dc = abs(dc)
-
-        r = r0
-        c = c0
-        if dc > dr:
-            err = dc / 2.0
-            while c != c1:
-                if grid[r][c] == 1:
-                    return False
-                err -= dr
-                if err < 0:
-                    # Prevent cutting a corner; both adjacent cells must be clear
-                    if grid[r + step_r][c] == 1 or grid[r][c + step_c] == 1:
-                        return False
-                    r += step_r
-                    err += dc
-                c += step_c
-        else:
-            err = dr / 2.0
-            while r != r1:
-                if grid[r][c] == 1:
-                    return False
-                err -= dc
-                if err < 0:
-                    if grid[r + step_r][c] == 1 or grid[r][c + step_c] == 1:
-                        return False
-                    c += step_c
-                    err += dr
-                r += step_r
-
-        return grid[r1][c1] == 0
-
-    neighbors = [
-        (0, 1), (0, -1), (1, 0), (-1, 0),
-        (1, 1), (1, -1), (-1, 1), (-1, -1)
-    ]
-
-    while open_set:
-        _, current = heapq.heappop(open_set)
-
-        if current == goal:
-            path = [current]
-            while current != parent[current]:
-                current = parent[current]
-                path.append(current)
-            return path[::-1]
-
-        for dr, dc in neighbors:
-            neighbour = (current[0] + dr, current[1] + dc)
-
-            if not (0 <= neighbour[0] < rows and 0 <= neighbour[1] < cols):
-                continue
-            if grid[neighbour[0]][neighbour[1]] == 1:
-                continue
-
-            if neighbour not in g_score:
-                g_score[neighbour] = float("inf")
-
-            if line_of_sight(parent[current], neighbour):
-                tentative_g = g_score[parent[current]] + distance(parent[current], neighbour)
-                if tentative_g < g_score[neighbour]:
-                    parent[neighbour] = parent[current]
-                    g_score[neighbour] = tentative_g
-                    f = tentative_g + heuristic(neighbour, goal)
-                    heapq.heappush(open_set, (f, neighbour))
-            else:
-                tentative_g = g_score[current] + distance(current, neighbour)
-                if tentative_g < g_score[neighbour]:
-                    parent[neighbour] = current
-                    g_score[neighbour] = tentative_g
-                    f = tentative_g + heuristic(neighbour, goal)
-                    heapq.heappush(open_set, (f, neighbour))
+    Merged shelf rectangles are clipped at tile edges; each label belongs to
+    the tile containing its anchor point.
 
-    return None
+    Args:
+        grid (list): 2D list representing the map (0=walkable, 1=obstacle).
+        aisle_locs (dict): Aisle locations as returned by generate_map; pass
+            an empty dict for a layer without labels.
+        tile_cells (int): Tile edge in cells.
+        per_cell (bool): One rectangle per occupied cell instead of merged blocks.
 
+    Returns:
+        dict: {(tile_row, tile_col): {"rects": [(row0, col0, row1, col1), ...],
+        "labels": [(x, y, text), ...]}} with label positions in cells.
+    """
+    tiles = {}
+
+    def tile(key):
+        return tiles.setdefault(key, {"rects": [], "labels": []})
+
+    if per_cell:
+        rects = [(r, c, r + 1, c + 1) for r, row in enumerate(grid) for c, v in enumerate(row) if v == 1]
+    else:
+        rects = shelf_rectangles(grid)
+    for r0, c0, r1, c1 in rects:
+        for tr in range(r0 // tile_cells, (r1 - 1) // tile_cells + 1):
+            for tc in range(c0 // tile_cells, (c1 - 1) // tile_cells + 1):
+                tile((tr, tc))["rects"].append((
+                    max(r0, tr * tile_cells), max(c0, tc * tile_cells),
+                    min(r1, (tr + 1) * tile_cells), min(c1, (tc + 1) * tile_cells),
+                ))
+
+    for aisle, locs in aisle_locs.items():
+        for (r, c), offset in ((locs["top"], -2), (locs["bottom"], 2)):
+            x = c + 0.5
+            y = r + offset + 0.5
+            tile((int(y // tile_cells), int(x // tile_cells)))["labels"].append((x, y, f"Aisle {aisle}"))
+    return tiles
+
+def lod_tile_cells(zoom):
+    """Returns the tile edge in cells at a zoom level, so tiles keep roughly the same size on screen."""
+    return max(1, round(TILE_CELLS / zoom))
+
+def lod_tiles(grid, aisle_locs, zoom):
+    """
+    Returns the static layer's tiles with the detail shown at a zoom level.
 
-class StoreMap(tk.Frame):
+    Below LABEL_MIN_ZOOM only the merged shelf blocks are kept; from
+    CELL_DETAIL_ZOOM shelves are split back into individual cells.
     """
-    A Tkinter widget that renders the store map, robot position, and navigation path.
+    return tile_contents(
+        grid,
+        aisle_locs if zoom >= LABEL_MIN_ZOOM else {},
+        lod_tile_cells(zoom),
+        per_cell=zoom >= CELL_DETAIL_ZOOM,
+    )
+
+class TiledLayer:
     """
-    def __init__(self, parent, target_aisle, max_aisles, on_back, on_arrival=None, fonts=None):
-        """Initializes the map view and starts the position polling loop."""
-        super().__init__(parent)
-        self.configure(bg="#f0f0f0")
-        self.pack(fill="both", expand=True)
-        
-        self.on_back = on_back
-        self.on_arrival = on_arrival
-        self.target_aisle = str(target_aisle)
-        self.fonts = fonts
-        
-        # Generate Map
-        self.grid, self.aisle_locations, self.GRID_WIDTH, self.GRID_HEIGHT = generate_map(max_aisles, AISLE_ROWS)
-        
-        # UI Setup
-        self.setup_ui()
-        
-        # Robot state (Placeholder starting position)
-        self.robot_x = 2.0
-        self.robot_y = 2.0
-        self.robot_theta = 0.0
-
-        self.target_x = self.robot_x
-        self.target_y = self.robot_y
-        self.sensor_x = self.robot_x
-        self.sensor_y = self.robot_y
-        self.sensor_theta = self.robot_theta
-        self.current_goal = None
-        self.remaining_path = []
-        self._last_path_time = 0.0
-        self._last_path_cell = None
+    Static map layer that only keeps the tiles around the view on a renderer.
+
+    sync() is called as the camera moves: tiles that leave the view (plus
+    TILE_MARGIN_PX) hand their items to a free list, and tiles that
+    enter reuse those items before creating new ones. The number of drawn
+    items stays bounded by the view size, not the store size.
+    """
+
+    def __init__(self, renderer, tiles, font, tile_cells=TILE_CELLS, margin_px=TILE_MARGIN_PX,
+                 cell_px=CELL_SIZE, outline=""):
+        self.renderer = renderer
+        self.tiles = tiles
+        self.font = font
+        self.cell_px = cell_px
+        self.tile_px = tile_cells * cell_px
+        self.margin_px = margin_px
+        self.outline = outline
+        self.live = {}  # tile key -> (rect item ids, label item ids)
+        self.free_rects = []
+        self.free_labels = []
+        self.stats = {"created": 0, "recycled": 0, "released": 0}
+        self._span = None
+
+    def visible(self, x, y, width, height):
+        """Returns the keys of the non-empty tiles within margin of a view rectangle (pixels)."""
+        m = self.margin_px
+        t = self.tile_px
+        r0 = int((y - m) // t)
+        r1 = int((y + height + m) // t)
+        c0 = int((x - m) // t)
+        c1 = int((x + width + m) // t)
+        return (r0, c0, r1, c1), [
+            (r, c) for r in range(r0, r1 + 1) for c in range(c0, c1 + 1) if (r, c) in self.tiles
+        ]
+
+    @profile
+    def sync(self, x, y, width, height):
+        """Brings the tiles in line with a view rectangle; cheap if no tile changed."""
+        span, keys = self.visible(x, y, width, height)
+        if span == self._span:
+            return
+        self._span = span
+        wanted = set(keys)
+        for key in [key for key in self.live if key not in wanted]:
+            self._release(key)
+        created = False
+        for key in keys:
+            if key not in self.live:
+                created = self._draw(key) or created
+        if created:
+            # New items are stacked on top; keep the static layer under the route and cart,
+            # and "underlay" items (the cart's beam) under the static layer
+            self.renderer.tag_lower("static")
+            self.renderer.tag_lower("underlay")
+
+    def hide(self):
+        """Takes every tile off screen, keeping the items for reuse; the next sync redraws."""
+        for key in list(self.live):
+            self._release(key)
+        self._span = None
+
+    def _release(self, key):
+        """Hides a tile's items and returns them to the free lists."""
+        rect_ids, label_ids = self.live.pop(key)
+        for item in rect_ids + label_ids:
+            self.renderer.itemconfigure(item, state="hidden")
+        self.free_rects.extend(rect_ids)
+        self.free_labels.extend(label_ids)
+        self.stats["released"] += 1
+
+    def _draw(self, key):
+        """Shows one tile, reusing free items; returns True if any item was created."""
+        renderer = self.renderer
+        tile = self.tiles[key]
+        px = self.cell_px
+        created = False
+        rect_ids = []
+        for r0, c0, r1, c1 in tile["rects"]:
+            coords = (c0 * px, r0 * px, c1 * px, r1 * px)
+            if self.free_rects:
+                item = self.free_rects.pop()
+                renderer.coords(item, *coords)
+                renderer.itemconfigure(item, state="normal")
+                self.stats["recycled"] += 1
+            else:
+                item = renderer.create_rectangle(*coords, fill="#404040", outline=self.outline,
+                                               tags=("static", "shelf"))
+                self.stats["created"] += 1
+                created = True
+            rect_ids.append(item)
+        label_ids = []
+        for x, y, text in tile["labels"]:
+            if self.free_labels:
+                item = self.free_labels.pop()
+                renderer.coords(item, x * px, y * px)
+                renderer.itemconfigure(item, text=text, state="normal")
+                self.stats["recycled"] += 1
+            else:
+                item = renderer.create_text(x * px, y * px, text=text, font=self.font, fill="#666",
+                                          tags=("static", "label"))
+                self.stats["created"] += 1
+                created = True
+            label_ids.append(item)
+        self.live[key] = (rect_ids, label_ids)
+        return created
+
+    def item_count(self):
+        """Returns the number of items the layer owns, shown or free."""
+        shown = sum(len(rects) + len(labels) for rects, labels in self.live.values())
+        return shown + len(self.free_rects) + len(self.free_labels)
+
+class MapView:
+    """
+    Draws the store map, cart and route through a renderer (see renderers.py).
+
+    Holds the smoothed cart pose, camera, zoom level and the state used to
+    skip redundant drawing, but no widgets or timers: StoreMap drives it on
+    a tk.Canvas, and benchmarks drive it headless with a RecordingRenderer
+    or RasterRenderer.
+    """
+
+    def __init__(self, renderer, grid, aisle_locs, view_width=VIEW_WIDTH, view_height=VIEW_HEIGHT,
+                 pose=(2.0, 2.0, 0.0), smoothing=POSE_SMOOTHING):
+        self.renderer = renderer
+        # Share of the way to the target pose moved per frame; 1.0 draws the target as given
+        self.smoothing = smoothing
+        self.grid = grid
+        self.aisle_locations = aisle_locs
+        self.grid_width = len(grid[0])
+        self.grid_height = len(grid)
+        self.view_width = view_width
+        self.view_height = view_height
+
+        # Zoom; each level's static layer is built the first time it is shown
+        self.zoom_index = ZOOM_LEVELS.index(DEFAULT_ZOOM)
+        self.cell_px = CELL_SIZE * DEFAULT_ZOOM
+        self._lod_layers = {}
+        renderer.set_extent(self.grid_width * self.cell_px, self.grid_height * self.cell_px)
+        self.draw_static_layer()
+
+        self.robot_x, self.robot_y, self.robot_theta = pose
         self._camera_x = None
         self._camera_y = None
         self._last_draw_pose = (self.robot_x, self.robot_y, self.robot_theta)
         self._last_drawn_camera = (None, None)
         self._last_drawn_path = None
-        self._last_drawn_goal = None
 
-        self._udp_stop = threading.Event()
-        self._udp_lock = threading.Lock()
-        
         self.robot_beam_id = None
         self.robot_circle_id = None
         self.path_line_id = None
+        self.path_head_id = None
         self.goal_circle_id = None
         self.goal_text_id = None
         self._last_line_points = None
         self._last_goal_coords = None
-        
-        self.draw_robot(self.robot_x, self.robot_y, self.robot_theta)
-        self.update_visuals()
-        
-        # Auto-start navigation
-        self.start_navigation()
-        self.start_udp_listener()
-        self.poll_position_update()
-        self.bind("<Destroy>", self._on_destroy)
-
-    def _on_destroy(self, _event):
-        """Stops background UDP listener when the widget is destroyed."""
-        self._udp_stop.set()
+        self._head_anchor = None
 
-    def start_udp_listener(self):
-        """Starts a background UDP listener for (x, z, theta) pose updates."""
-        thread = threading.Thread(target=self._udp_listener, daemon=True)
-        thread.start()
-
-    def _udp_listener(self):
-        """Receives pose updates over UDP and updates the sensor position."""
-        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        try:
-            sock.bind((UDP_HOST, UDP_PORT))
-            sock.settimeout(0.5)
-            while not self._udp_stop.is_set():
-                try:
-                    data, _ = sock.recvfrom(UDP_BUFFER_BYTES)
-                except socket.timeout:
-                    continue
-
-                message = data.decode("utf-8", errors="ignore").strip()
-                if not message:
-                    continue
-
-                pose = self._parse_pose_message(message)
-                if pose:
-                    print(f"Received pose: {pose}")
-                    x, z, theta = pose
-                    if THETA_IN_DEGREES:
-                        theta = math.radians(theta + THETA_OFFSET_DEGREES)
-                    with self._udp_lock:
-                        self.sensor_x = x
-                        self.sensor_y = z
-                        self.sensor_theta = theta
-        finally:
-            sock.close()
-
-    def _parse_pose_message(self, message):
-        """Parses JSON or CSV pose messages into (x, z, theta)."""
-        try:
-            payload = json.loads(message)
-            x = float(payload.get("x"))
-            z = float(payload.get("z"))
-            theta = float(payload.get("theta"))
-            return x, z, theta
-        except Exception:
-            pass
-
-        try:
-            parts = [p.strip() for p in message.split(",")]
-            if len(parts) >= 3:
-                return float(parts[0]), float(parts[1]), float(parts[2])
-        except Exception:
-            pass
-
-        return None
+        self.draw_robot(self.robot_x, self.robot_y, self.robot_theta)
 
-    def setup_ui(self):
-        """Sets up the canvas and draws the static map elements (shelves, labels)."""
-        # Header
-        header = tk.Frame(self, bg="#f0f0f0")
-        header.pack(fill="x", padx=10, pady=5)
-        
-        make_back_button(header, self.on_back, self.fonts)
-        tk.Label(header, text=f"Navigating to Aisle {self.target_aisle}", font=("Arial", 16, "bold"), bg="#f0f0f0").pack(side="left")
+    @profile
+    def draw_static_layer(self):
+        """
+        Prepares the shelves, walls and aisle labels of the current zoom level as tiles.
+
+        Nothing is drawn yet: frame() syncs the tiles around the camera
+        whenever the view moves.
+        """
+        layer = self._lod_layers.get(self.zoom_index)
+        if layer is None:
+            zoom = ZOOM_LEVELS[self.zoom_index]
+            layer = TiledLayer(
+                self.renderer,
+                lod_tiles(self.grid, self.aisle_locations, zoom),
+                ("Arial", round(14 * zoom), "bold"),
+                lod_tile_cells(zoom),
+                cell_px=self.cell_px,
+                outline="#5a5a5a" if zoom >= CELL_DETAIL_ZOOM else "",
+            )
+            self._lod_layers[self.zoom_index] = layer
+        self.static_layer = layer
+
+    def set_zoom(self, index):
+        """
+        Switches the map to ZOOM_LEVELS[index] (clamped); the next frame redraws at that scale.
+
+        The previous level's tiles are hidden but kept, so zooming back reuses
+        them; the camera snaps to the cart at the new scale.
+
+        Returns:
+            bool: True if the level changed.
+        """
+        index = max(0, min(index, len(ZOOM_LEVELS) - 1))
+        if index == self.zoom_index:
+            return False
+        self.static_layer.hide()
+        self.zoom_index = index
+        self.cell_px = CELL_SIZE * ZOOM_LEVELS[index]
+        self.draw_static_layer()
+        self.renderer.set_extent(self.grid_width * self.cell_px, self.grid_height * self.cell_px)
+        if self.goal_text_id is not None:
+            self.renderer.itemconfigure(self.goal_text_id, state=self._goal_text_state())
+        # Everything scale-dependent is redrawn on the next frame
+        self._camera_x = None
+        self._camera_y = None
+        self._last_drawn_camera = (None, None)
+        self._last_draw_pose = (math.inf, math.inf, math.inf)
+        self._last_line_points = None
+        self._last_goal_coords = None
+        self._last_drawn_path = None
+        return True
 
-        FULL_W = self.GRID_WIDTH * CELL_SIZE
-        FULL_H = self.GRID_HEIGHT * CELL_SIZE
-        VIEW_W = 800
-        VIEW_H = 440 # Slightly less to account for header
+    def _goal_text_state(self):
+        """The goal caption is only shown where labels are."""
+        return "normal" if ZOOM_LEVELS[self.zoom_index] >= LABEL_MIN_ZOOM else "hidden"
 
-        self.canvas = tk.Canvas(
-            self,
-            width=VIEW_W,
-            height=VIEW_H,
-            bg="white",
-            scrollregion=(0, 0, FULL_W, FULL_H),
-            highlightthickness=0
-        )
-        self.canvas.pack(fill="both", expand=True)
+    def snap_to(self, x, y, theta):
+        """Jumps the drawn cart to a pose (no smoothing) and recentres the camera on the next frame."""
+        self.robot_x = x
+        self.robot_y = y
+        self.robot_theta = theta
+        self._camera_x = None
+        self._camera_y = None
 
-        # Draw grid and shelves
-        for r in range(self.GRID_HEIGHT):
-            for c in range(self.GRID_WIDTH):
-                x1 = c * CELL_SIZE
-                y1 = r * CELL_SIZE
-                x2 = x1 + CELL_SIZE
-                y2 = y1 + CELL_SIZE
-
-                if self.grid[r][c] == 1:
-                    self.canvas.create_rectangle(x1, y1, x2, y2, fill="#404040", outline="", tags="shelf")
-
-        # Draw Aisle Labels
-        for aisle, locs in self.aisle_locations.items():
-            # Top Label
-            r, c = locs["top"]
-            x = c * CELL_SIZE + CELL_SIZE / 2
-            y = (r - 2) * CELL_SIZE + CELL_SIZE / 2
-            self.canvas.create_text(x, y, text=f"Aisle {aisle}", font=("Arial", 14, "bold"), fill="#666")
-
-            # Bottom Label
-            r, c = locs["bottom"]
-            y = (r + 2) * CELL_SIZE + CELL_SIZE / 2
-            self.canvas.create_text(x, y, text=f"Aisle {aisle}", font=("Arial", 14, "bold"), fill="#666")
+    def clear_route(self):
+        """Removes the path lines and goal marker of the previous route."""
+        for item in (self.path_line_id, self.path_head_id, self.goal_circle_id, self.goal_text_id):
+            if item is not None:
+                self.renderer.delete(item)
+        self.path_line_id = None
+        self.path_head_id = None
+        self._head_anchor = None
+        self.goal_circle_id = None
+        self.goal_text_id = None
+        self._last_line_points = None
+        self._last_goal_coords = None
+        self._last_drawn_path = None
 
     @profile
     def draw_robot(self, x, y, theta):
-        """Draws the robot icon and direction beam on the canvas."""
-        px = x * CELL_SIZE + CELL_SIZE/2
-        py = y * CELL_SIZE + CELL_SIZE/2
-        r = CELL_SIZE / 2.5
+        """Draws the robot icon and direction beam."""
+        px = x * self.cell_px + self.cell_px/2
+        py = y * self.cell_px + self.cell_px/2
+        r = self.cell_px / 2.5
 
-        beam_len = CELL_SIZE * 3
+        beam_len = self.cell_px * 3
         beam_angle = 0.5 # radians (~30 degrees)
         
         beam_points = [
@@ -392,80 +489,110 @@ class StoreMap(tk.Frame):
         
         # Reuse or create beam
         if self.robot_beam_id is None:
-            self.robot_beam_id = self.canvas.create_polygon(*beam_points, fill="#fef08a", outline="#fde047")
-            self.canvas.tag_lower(self.robot_beam_id, "shelf")
+            self.robot_beam_id = self.renderer.create_polygon(*beam_points, fill="#fef08a", outline="#fde047", tags="underlay")
+            # Under the shelves; tiles may not be drawn yet, so lower it to the bottom
+            self.renderer.tag_lower(self.robot_beam_id)
         else:
-            self.canvas.coords(self.robot_beam_id, *beam_points)
+            self.renderer.coords(self.robot_beam_id, *beam_points)
         
         # Reuse or create circle
         if self.robot_circle_id is None:
-            self.robot_circle_id = self.canvas.create_oval(px-r, py-r, px+r, py+r, fill="#f97316", outline="white", width=2)
+            self.robot_circle_id = self.renderer.create_oval(px-r, py-r, px+r, py+r, fill="#f97316", outline="white", width=2)
         else:
-            self.canvas.coords(self.robot_circle_id, px-r, py-r, px+r, py+r)
+            self.renderer.coords(self.robot_circle_id, px-r, py-r, px+r, py+r)
 
     @profile
     def draw_path(self, path, goal_cell):
-        """Draws the navigation line and goal marker on the canvas."""
-        # Build line points
+        """
+        Draws the static tail of the route (its remaining waypoints) and the goal marker.
+
+        Only needed when the route changes; the segment from the cart to the
+        first waypoint is drawn every frame by draw_path_head.
+        """
+        px = self.cell_px
+        half = px / 2
         line_points = []
         for (r, c) in path:
-            cx = c * CELL_SIZE + CELL_SIZE/2
-            cy = r * CELL_SIZE + CELL_SIZE/2
-            line_points.extend([cx, cy])
+            line_points.append(c * px + half)
+            line_points.append(r * px + half)
+        self._head_anchor = tuple(line_points[:2]) or None
 
-        # Only update line if points changed
-        line_points_tuple = tuple(line_points) if line_points else ()
+        line_points_tuple = tuple(line_points)
         if self._last_line_points != line_points_tuple:
             if len(line_points) >= 4:
                 if self.path_line_id is None:
-                    self.path_line_id = self.canvas.create_line(*line_points, fill="#3b82f6", width=8, capstyle=tk.ROUND, joinstyle=tk.ROUND)
+                    self.path_line_id = self.renderer.create_line(*line_points, fill="#3b82f6", width=8, capstyle=tk.ROUND, joinstyle=tk.ROUND)
                 else:
-                    self.canvas.coords(self.path_line_id, *line_points)
+                    self.renderer.coords(self.path_line_id, *line_points)
             else:
-                # Hide line if path is too short
+                # Hide the tail if only the first waypoint (or none) is left
                 if self.path_line_id is not None:
-                    self.canvas.coords(self.path_line_id, 0, 0, 0, 0)
+                    self.renderer.coords(self.path_line_id, 0, 0, 0, 0)
             self._last_line_points = line_points_tuple
 
         # Calculate goal coordinates
         tr, tc = goal_cell
-        tx = tc * CELL_SIZE + CELL_SIZE/2
-        ty = tr * CELL_SIZE + CELL_SIZE/2
-        tr_size = CELL_SIZE / 1.5
+        tx = tc * self.cell_px + self.cell_px/2
+        ty = tr * self.cell_px + self.cell_px/2
+        tr_size = self.cell_px / 1.5
         goal_coords = (tx, ty, tr_size)
         
         # Only update goal if position changed
         if self._last_goal_coords != goal_coords:
             if self.goal_circle_id is None:
-                self.goal_circle_id = self.canvas.create_oval(tx-tr_size, ty-tr_size, tx+tr_size, ty+tr_size, fill="#dc2626", outline="white", width=2)
+                self.goal_circle_id = self.renderer.create_oval(tx-tr_size, ty-tr_size, tx+tr_size, ty+tr_size, fill="#dc2626", outline="white", width=2)
             else:
-                self.canvas.coords(self.goal_circle_id, tx-tr_size, ty-tr_size, tx+tr_size, ty+tr_size)
+                self.renderer.coords(self.goal_circle_id, tx-tr_size, ty-tr_size, tx+tr_size, ty+tr_size)
             
             if self.goal_text_id is None:
-                self.goal_text_id = self.canvas.create_text(tx, ty, text="GOAL", fill="white", font=("Arial", 10, "bold"))
+                self.goal_text_id = self.renderer.create_text(tx, ty, text="GOAL", fill="white", font=("Arial", 10, "bold"),
+                                                            state=self._goal_text_state())
             else:
-                self.canvas.coords(self.goal_text_id, tx, ty)
+                self.renderer.coords(self.goal_text_id, tx, ty)
             
             self._last_goal_coords = goal_coords
 
     @profile
-    def update_visuals(self):
-        """Periodically updates the robot's visual position (smoothing) and camera view."""
-        if not self.winfo_exists():
-            return
-
-        with self._udp_lock:
-            sx = self.sensor_x
-            sy = self.sensor_y
-            stheta = self.sensor_theta
+    def draw_path_head(self, x, y):
+        """Draws the route segment from the cart at (x, y) to the first remaining waypoint."""
+        px = self.cell_px
+        if self._head_anchor is None:
+            points = (0, 0, 0, 0)
+        else:
+            points = (x * px + px / 2, y * px + px / 2) + self._head_anchor
+        if self.path_head_id is None:
+            self.path_head_id = self.renderer.create_line(*points, fill="#3b82f6", width=8, capstyle=tk.ROUND)
+        else:
+            self.renderer.coords(self.path_head_id, *points)
+
+    def frame(self, sensor_pose, remaining_path, goal, route_version):
+        """
+        Draws one frame: smooths the cart's drawn pose and the camera towards their targets.
+
+        Args:
+            sensor_pose (tuple): Target (x, y, theta) of the cart: the latest packet, or the
+                filtered prediction for this frame.
+            remaining_path (list): (row, col) waypoints still ahead of the cart.
+            goal (tuple): (row, col) goal cell, or None while there is no route.
+            route_version (int): Changes whenever goal or remaining_path does;
+                the path tail is only redrawn then.
+
+        Returns:
+            bool: True once pose and camera have settled, i.e. further frames
+            would draw nothing until the pose or route changes.
+        """
+        sx, sy, stheta = sensor_pose
 
         # Only smooth position if there's a meaningful difference
         dx = sx - self.robot_x
         dy = sy - self.robot_y
         
         if abs(dx) > 0.001 or abs(dy) > 0.001:
-            self.robot_x += dx * 0.2
-            self.robot_y += dy * 0.2
+            self.robot_x += dx * self.smoothing
+            self.robot_y += dy * self.smoothing
+        else:
+            self.robot_x = sx
+            self.robot_y = sy
             
         # Only smooth angle if there's a meaningful difference
         diff = stheta - self.robot_theta
@@ -473,23 +600,27 @@ class StoreMap(tk.Frame):
         diff = (diff + math.pi) % (2 * math.pi) - math.pi
         
         if abs(diff) > 0.001:
-            self.robot_theta += diff * 0.2
+            self.robot_theta += diff * self.smoothing
+        else:
+            self.robot_theta = stheta
+        pose_settled = max(abs(dx), abs(dy), abs(diff)) <= 0.001
 
-        # Skip redraws if pose is effectively unchanged
+        # Skip redraws if pose is effectively unchanged; the settled pose is drawn exactly
         lx, ly, ltheta = self._last_draw_pose
         pose_changed = (
             abs(self.robot_x - lx) > POSE_EPSILON
             or abs(self.robot_y - ly) > POSE_EPSILON
             or abs(self.robot_theta - ltheta) > THETA_EPSILON
+            or (pose_settled and self._last_draw_pose != (self.robot_x, self.robot_y, self.robot_theta))
         )
 
-        # Camera follow (800x440 viewport), smoothed each frame
-        FULL_W = self.GRID_WIDTH * CELL_SIZE
-        FULL_H = self.GRID_HEIGHT * CELL_SIZE
-        view_w = 800
-        view_h = 440
-        target_cam_x = (self.robot_x * CELL_SIZE) - (view_w / 2)
-        target_cam_y = (self.robot_y * CELL_SIZE) - (view_h / 2)
+        # Camera follow, smoothed each frame
+        FULL_W = self.grid_width * self.cell_px
+        FULL_H = self.grid_height * self.cell_px
+        view_w = self.view_width
+        view_h = self.view_height
+        target_cam_x = (self.robot_x * self.cell_px) - (view_w / 2)
+        target_cam_y = (self.robot_y * self.cell_px) - (view_h / 2)
 
         max_cam_x = max(0.0, FULL_W - view_w)
         max_cam_y = max(0.0, FULL_H - view_h)
@@ -500,79 +631,515 @@ class StoreMap(tk.Frame):
             self._camera_x = target_cam_x
             self._camera_y = target_cam_y
         else:
-            # Only update camera if target changed
-            old_target_x = self._camera_x
-            old_target_y = self._camera_y
             self._camera_x += (target_cam_x - self._camera_x) * CAMERA_SMOOTHING
             self._camera_y += (target_cam_y - self._camera_y) * CAMERA_SMOOTHING
+            if (abs(target_cam_x - self._camera_x) <= CAMERA_EPSILON
+                    and abs(target_cam_y - self._camera_y) <= CAMERA_EPSILON):
+                self._camera_x = target_cam_x
+                self._camera_y = target_cam_y
+        camera_settled = self._camera_x == target_cam_x and self._camera_y == target_cam_y
 
-        # Only update canvas view if camera has moved significantly
+        # Only move the view if camera has moved significantly
         last_cam_x, last_cam_y = self._last_drawn_camera
         camera_changed = (
             last_cam_x is None
             or last_cam_y is None
             or abs(self._camera_x - last_cam_x) > CAMERA_EPSILON
             or abs(self._camera_y - last_cam_y) > CAMERA_EPSILON
+            or (camera_settled and self._last_drawn_camera != (self._camera_x, self._camera_y))
         )
 
         if camera_changed and FULL_W > 0 and FULL_H > 0:
-            self.canvas.xview_moveto(self._camera_x / FULL_W)
-            self.canvas.yview_moveto(self._camera_y / FULL_H)
+            self.renderer.set_view(self._camera_x, self._camera_y)
             self._last_drawn_camera = (self._camera_x, self._camera_y)
+            self.static_layer.sync(self._camera_x, self._camera_y, view_w, view_h)
 
-        # Check if path or goal has changed
-        current_path_key = (tuple(self.remaining_path) if self.remaining_path else None, self.current_goal)
-        path_or_goal_changed = (current_path_key != self._last_drawn_path)
+        # The tail is redrawn only when the route changed; the head follows the cart
+        path_or_goal_changed = route_version != self._last_drawn_path
 
         # Only redraw if something changed
         if pose_changed or path_or_goal_changed:
-            if self.current_goal and (pose_changed or path_or_goal_changed):
-                vis_path = [(self.robot_y, self.robot_x)] + self.remaining_path
-                self.draw_path(vis_path, self.current_goal)
-                self._last_drawn_path = current_path_key
+            if goal:
+                if path_or_goal_changed:
+                    self.draw_path(remaining_path, goal)
+                    self._last_drawn_path = route_version
+                self.draw_path_head(self.robot_x, self.robot_y)
 
             if pose_changed:
                 self.draw_robot(self.robot_x, self.robot_y, self.robot_theta)
                 self._last_draw_pose = (self.robot_x, self.robot_y, self.robot_theta)
 
-        self.after(DRAW_INTERVAL_MS, self.update_visuals)
+        return pose_settled and camera_settled
+
+class StoreMap(tk.Frame):
+    """
+    A Tkinter widget that renders the store map, robot position, and navigation path.
+
+    The widget is meant to live for the whole session: navigate() re-targets
+    it and hide() takes it off screen, so the layout, static layer, planner
+    state and pose listener are built only once. Drawing is done by a
+    MapView on the widget's canvas; this class owns the timers, pose input
+    and route planning.
+    """
+    def __init__(self, parent, target_aisle, max_aisles, on_back, on_arrival=None, fonts=None):
+        """
+        Initializes the map view and starts the position polling loop.
+
+        target_aisle may be a single aisle or a list of aisles; a list starts a
+        shopping route that visits every aisle in an optimized order and only
+        calls on_arrival after the last stop.
+        """
+        super().__init__(parent)
+        self.configure(bg="#f0f0f0")
+        self.pack(fill="both", expand=True)
+        
+        self.on_back = on_back
+        self.on_arrival = on_arrival
+        self._set_stops(target_aisle)
+        self.fonts = fonts
+        
+        # Generate Map
+        self.grid, self.aisle_locations, self.GRID_WIDTH, self.GRID_HEIGHT = generate_map(max_aisles, AISLE_ROWS)
+
+        # Path planner (distance fields are shared per layout and built on the plan
+        # worker, so replans are table walks and the UI never waits for a build)
+        self.planner = make_planner(PATH_ENGINE, self.grid, self.aisle_locations, cached=PATH_CACHE_ENABLED)
+        self.route_planner = RoutePlanner(self.planner, self.aisle_locations)
+        # Every planner call runs on this worker so searches never block the UI
+        self.plan_worker = PlanWorker()
+        # Build per-layout tables and the costs between the route's stops up front;
+        # a background job is never superseded by the plan jobs queued behind it
+        precompute = getattr(self.planner, "precompute", None)
+        if precompute is not None:
+            self.plan_worker.submit_background(precompute)
+        if len(self.stops) > 1:
+            route_planner = self.route_planner
+            stops = list(self.stops)
+            self.plan_worker.submit_background(lambda: route_planner.warm(stops))
+        self._plan_poll_id = None
+        # Tracks the cart along the current path so replans only happen off route
+        self.follower = PathFollower(ROUTE_MAX_DEVIATION, math.radians(ROUTE_MAX_HEADING_ERROR_DEG))
+        
+        # UI Setup (the map view starts at the placeholder pose below)
+        self.setup_ui()
+        
+        # Robot state (Placeholder starting position)
+        self.target_x = self.view.robot_x
+        self.target_y = self.view.robot_y
+        self.sensor_x = self.view.robot_x
+        self.sensor_y = self.view.robot_y
+        self.sensor_theta = self.view.robot_theta
+        self.current_goal = None
+        self.remaining_path = []
+        # Bumped whenever current_goal or remaining_path changes; the path tail is redrawn only then
+        self._route_version = 0
+        self._last_path_time = 0.0
+        self._last_path_cell = None
+        # Set when a plan to the target found no path; polling retries it
+        self._awaiting_path = False
+
+        self._visible = True
+        self._visuals_id = None
+        self._poll_id = None
+        # Frame counters; the renderer is awake from a wake-up until it settles
+        self.render_stats = {"frames": 0, "wakeups": 0, "awake_s": 0.0}
+        self._render_started = time.monotonic()
+        self._awake_since = None
+
+        self._udp_stop = threading.Event()
+        self._udp_lock = threading.Lock()
+        # Predicts the drawn pose between packets (guarded by _udp_lock like the sensor pose)
+        self.pose_filter = PoseFilter() if POSE_FILTER_ENABLED else None
+
+        self.update_visuals()
+        
+        # Auto-start navigation
+        self.start_navigation()
+        self.start_udp_listener()
+        self.poll_position_update()
+        self.bind("<Destroy>", self._on_destroy)
+
+    def _on_destroy(self, _event):
+        """Stops the background UDP listener and planner when the widget is destroyed."""
+        self._udp_stop.set()
+        self.plan_worker.stop()
+
+    def start_udp_listener(self):
+        """Starts a background UDP listener for (x, z, theta) pose updates."""
+        thread = threading.Thread(target=self._udp_listener, daemon=True)
+        thread.start()
+
+    def _udp_listener(self):
+        """Receives pose updates over UDP and updates the sensor position."""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            sock.bind((UDP_HOST, UDP_PORT))
+            sock.settimeout(0.5)
+            while not self._udp_stop.is_set():
+                try:
+                    data, _ = sock.recvfrom(UDP_BUFFER_BYTES)
+                except socket.timeout:
+                    continue
+
+                message = data.decode("utf-8", errors="ignore").strip()
+                if not message:
+                    continue
+
+                pose = self._parse_pose_message(message)
+                if pose:
+                    print(f"Received pose: {pose}")
+                    x, z, theta = pose
+                    if THETA_IN_DEGREES:
+                        theta = math.radians(theta + THETA_OFFSET_DEGREES)
+                    with self._udp_lock:
+                        self.sensor_x = x
+                        self.sensor_y = z
+                        self.sensor_theta = theta
+                        if self.pose_filter is not None:
+                            self.pose_filter.update(x, z, theta, time.monotonic())
+        finally:
+            sock.close()
+
+    def _parse_pose_message(self, message):
+        """Parses JSON or CSV pose messages into (x, z, theta)."""
+        try:
+            payload = json.loads(message)
+            x = float(payload.get("x"))
+            z = float(payload.get("z"))
+            theta = float(payload.get("theta"))
+            return x, z, theta
+        except Exception:
+            pass
+
+        try:
+            parts = [p.strip() for p in message.split(",")]
+            if len(parts) >= 3:
+                return float(parts[0]), float(parts[1]), float(parts[2])
+        except Exception:
+            pass
+
+        return None
+
+    def _set_stops(self, target_aisle):
+        """Sets the aisle, or list of aisles, to visit from the first stop."""
+        if isinstance(target_aisle, (list, tuple)):
+            self.stops = [str(a) for a in target_aisle]
+        else:
+            self.stops = [str(target_aisle)]
+        self.stop_index = 0
+        self.target_aisle = self.stops[0]
+
+    def navigate(self, target_aisle, on_arrival=None):
+        """
+        Shows the map and starts navigating to a new aisle, or list of aisles.
+
+        Reuses the layout, shelf layer, planner and pose listener; only the
+        route is recalculated.
+        """
+        self.plan_worker.cancel()
+        self.on_arrival = on_arrival
+        self._set_stops(target_aisle)
+        self.title_label.config(text=self._title_text())
+        # Drop the old route first so the restarted polling cannot arrive at it
+        self.current_goal = None
+        self.follower.set_path([])
+        self.remaining_path = []
+        self._route_version += 1
+        self._last_path_time = 0.0
+        self._last_path_cell = None
+        self._awaiting_path = False
+        self.view.clear_route()
+        self.show()
+        self.start_navigation()
+
+    def show(self):
+        """Puts the map back on screen and restarts its redraw and polling loops."""
+        if not self._visible:
+            # Redraws were paused while hidden; jump to the latest pose
+            self.view.snap_to(*self._target_pose())
+            self.pack(fill="both", expand=True)
+            self._visible = True
+        self._stop_loops()
+        self.update_visuals()
+        self.poll_position_update()
+
+    def hide(self):
+        """Takes the map off screen without destroying it; the pose listener keeps running."""
+        self.plan_worker.cancel()
+        self._stop_loops()
+        self.pack_forget()
+        self._visible = False
+
+    def _stop_loops(self):
+        """Cancels the pending redraw and position polling callbacks."""
+        for after_id in (self._visuals_id, self._poll_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self._visuals_id = None
+        self._poll_id = None
+        self._sleep_renderer()
+
+    def request_frame(self):
+        """Schedules a redraw unless one is already pending or the map is hidden."""
+        if self._visuals_id is None and self._visible:
+            self._visuals_id = self.after_idle(self.update_visuals)
+
+    def _sleep_renderer(self):
+        """Closes the current awake interval; nothing is redrawn until request_frame."""
+        if self._awake_since is not None:
+            self.render_stats["awake_s"] += time.monotonic() - self._awake_since
+            self._awake_since = None
+            count("render_sleeps")
+
+    def frame_rate(self):
+        """Returns the mean frames per second since the map was created."""
+        elapsed = time.monotonic() - self._render_started
+        return self.render_stats["frames"] / elapsed if elapsed > 0 else 0.0
+
+    def idle_ratio(self):
+        """Returns the fraction of time since the map was created that the renderer slept."""
+        now = time.monotonic()
+        elapsed = now - self._render_started
+        if elapsed <= 0:
+            return 0.0
+        awake = self.render_stats["awake_s"]
+        if self._awake_since is not None:
+            awake += now - self._awake_since
+        return max(0.0, 1.0 - awake / elapsed)
+
+    def _title_text(self):
+        """Returns the header text for the current stop."""
+        if len(self.stops) > 1:
+            return f"Stop {self.stop_index + 1} of {len(self.stops)}: Aisle {self.target_aisle}"
+        return f"Navigating to Aisle {self.target_aisle}"
+
+    def setup_ui(self):
+        """Sets up the canvas and draws the static map elements (shelves, labels)."""
+        # Header
+        header = tk.Frame(self, bg="#f0f0f0")
+        header.pack(fill="x", padx=10, pady=5)
+        
+        make_back_button(header, self.on_back, self.fonts)
+        for text, command in (("+", self.zoom_in), ("\u2212", self.zoom_out)):
+            make_button(header, text, command, self.fonts, large=False, primary=False, width=3).pack(side="right", padx=4)
+        self.title_label = tk.Label(header, text=self._title_text(), font=("Arial", 16, "bold"), bg="#f0f0f0")
+        self.title_label.pack(side="left")
+
+        self.canvas = tk.Canvas(
+            self,
+            width=VIEW_WIDTH,
+            height=VIEW_HEIGHT,
+            bg="white",
+            highlightthickness=0
+        )
+        self.canvas.pack(fill="both", expand=True)
+        # Wheel and pinch (delivered as Ctrl+wheel by most touchpads) zoom; X11 reports buttons 4/5
+        self.canvas.bind("<MouseWheel>", lambda e: self.zoom_in() if e.delta > 0 else self.zoom_out())
+        self.canvas.bind("<Button-4>", lambda e: self.zoom_in())
+        self.canvas.bind("<Button-5>", lambda e: self.zoom_out())
+
+        self.view = MapView(CanvasRenderer(self.canvas), self.grid, self.aisle_locations,
+                            smoothing=1.0 if POSE_FILTER_ENABLED else POSE_SMOOTHING)
+
+    def zoom_in(self):
+        """Steps to the next larger map scale."""
+        if self.view.set_zoom(self.view.zoom_index + 1):
+            self.request_frame()
+
+    def zoom_out(self):
+        """Steps to the next smaller map scale."""
+        if self.view.set_zoom(self.view.zoom_index - 1):
+            self.request_frame()
+
+    @profile
+    def update_visuals(self):
+        """
+        Draws one frame of the map view with the latest sensor pose.
+
+        Runs every DRAW_INTERVAL_MS only while the pose or camera is still
+        converging, then sleeps until request_frame is called for a new pose
+        or path.
+        """
+        self._visuals_id = None
+        if not self.winfo_exists():
+            return
+        if self._awake_since is None:
+            self._awake_since = time.monotonic()
+            self.render_stats["wakeups"] += 1
+        self.render_stats["frames"] += 1
+        count("render_frames")
+
+        settled = self.view.frame(self._target_pose(), self.remaining_path, self.current_goal, self._route_version)
+
+        # Full rate while smoothing converges, then sleep until the next pose or path
+        if settled:
+            self._sleep_renderer()
+        else:
+            self._visuals_id = self.after(DRAW_INTERVAL_MS, self.update_visuals)
+
+    def _target_pose(self):
+        """Returns the pose to draw now: the filter's prediction, or the latest packet."""
+        with self._udp_lock:
+            if self.pose_filter is not None:
+                predicted = self.pose_filter.predict(time.monotonic())
+                if predicted is not None:
+                    return predicted
+            return self.sensor_x, self.sensor_y, self.sensor_theta
+
+    def _submit_plan(self, job, on_result):
+        """Runs job on the planner worker and hands its result to on_result via after()."""
+        self.plan_worker.submit(job, on_result)
+        if self._plan_poll_id is None:
+            self._plan_poll_id = self.after(PLAN_POLL_MS, self._deliver_plans)
+
+    def _deliver_plans(self):
+        """Applies finished background plans on the Tk thread."""
+        self._plan_poll_id = None
+        if not self.winfo_exists():
+            return
+        self.plan_worker.deliver()
+        if self.plan_worker.outstanding():
+            self._plan_poll_id = self.after(PLAN_POLL_MS, self._deliver_plans)
 
     def start_navigation(self):
-        """Calculates the initial path to the target aisle."""
-        if self.target_aisle in self.aisle_locations:
-            goal = self.aisle_locations[self.target_aisle]["goal"]
-            start = (int(self.robot_y), int(self.robot_x))
-            path = theta_star(self.grid, start, goal)
+        """Orders the route stops (if any) and calculates the initial path in the background."""
+        start = (int(self.view.robot_y), int(self.view.robot_x))
+        stops = list(self.stops)
+        route_planner = self.route_planner
+        planner = self.planner
+        aisle_locations = self.aisle_locations
+
+        def job():
+            ordered = route_planner.order(start, stops) if len(stops) > 1 else stops
+            ordered = ordered or stops
+            goals = aisle_goals(aisle_locations.get(ordered[0]))
+            path = plan_to_any(planner, start, goals) if goals else None
+            return ordered, path[-1] if path else None, path
+
+        self._submit_plan(job, self._on_navigation_planned)
+
+    def _on_navigation_planned(self, result):
+        """Applies the route order and first path computed by start_navigation."""
+        ordered, goal, path = result if result else (self.stops, None, None)
+        if ordered != self.stops:
+            self.stops = ordered
+            self.stop_index = 0
+            self.target_aisle = self.stops[0]
+            self.title_label.config(text=self._title_text())
+        if path:
+            self._set_path(goal, path)
+        else:
+            self._await_path()
+
+    def _await_path(self):
+        """Notes that the target could not be reached; polling retries after PATH_RECALC_INTERVAL_S."""
+        self._awaiting_path = True
+        self._last_path_time = time.monotonic()
+
+    def _set_path(self, goal, path):
+        """Makes path (including its start cell) the route to goal."""
+        self._awaiting_path = False
+        self.current_goal = goal
+        self.follower.set_path(path)
+        self.remaining_path = self.follower.remaining()
+        self._route_changed()
+
+    def _route_changed(self):
+        """Marks the route (goal or remaining waypoints) as changed and schedules a redraw."""
+        self._route_version += 1
+        self.request_frame()
+
+    def _plan_to_target(self, start):
+        """Calculates the path from start to the current target aisle in the background."""
+        if self.target_aisle not in self.aisle_locations:
+            return
+        goals = aisle_goals(self.aisle_locations[self.target_aisle])
+        planner = self.planner
+
+        def on_result(path):
+            # The path ends at whichever of the aisle's goal cells was cheapest
             if path:
-                self.current_goal = goal
-                self.remaining_path = path[1:]
+                self._set_path(path[-1], path)
+            else:
+                self._await_path()
+
+        self._submit_plan(lambda: plan_to_any(planner, start, goals), on_result)
+
+    def _replan(self, start):
+        """Replans from start to the target aisle, keeping the old path until it lands."""
+        aisle = self.target_aisle
+        goals = aisle_goals(self.aisle_locations[aisle])
+        planner = self.planner
+
+        def on_result(path):
+            # A newer stop may have been selected while this plan was running.
+            # The path may end at a different goal cell if that one is now cheaper.
+            if path and aisle == self.target_aisle and self.current_goal is not None:
+                self._set_path(path[-1], path)
+
+        self._submit_plan(lambda: plan_to_any(planner, start, goals), on_result)
+
+    def advance_stop(self, current_cell):
+        """Moves on to the next aisle of a shopping route."""
+        self.stop_index += 1
+        self.target_aisle = self.stops[self.stop_index]
+        self.title_label.config(text=self._title_text())
+        # No goal until the new path arrives, so arrival is not re-triggered
+        # for the stop just reached; the old line stays drawn meanwhile.
+        self.current_goal = None
+        self._route_changed()
+        self._plan_to_target(current_cell)
+        self._last_path_cell = current_cell
+        self._last_path_time = time.monotonic()
 
     @profile
     def poll_position_update(self):
-        """Updates the robot's logical position using the latest UDP data."""
+        """Updates the robot's logical position using the latest UDP data and wakes the renderer on a new pose."""
         if not self.winfo_exists():
             return
 
+        with self._udp_lock:
+            sx = self.sensor_x
+            sy = self.sensor_y
+            stheta = self.sensor_theta
+        if self._target_pose() != (self.view.robot_x, self.view.robot_y, self.view.robot_theta):
+            self.request_frame()
+
         if self.current_goal:
             # Check if we have arrived at the goal (within 1.5 units)
             gy, gx = self.current_goal
-            with self._udp_lock:
-                sx = self.sensor_x
-                sy = self.sensor_y
             dist = math.hypot(sx - gx, sy - gy)
             if dist < 1.5:
-                if self.on_arrival:
-                    self.on_arrival()
+                if self.stop_index + 1 >= len(self.stops):
+                    if self.on_arrival:
+                        self.on_arrival()
+                    return
+                # Shopping route: head for the next stop (advance_stop plans it)
+                self.advance_stop((int(sy), int(sx)))
+                self._poll_id = self.after(POSE_POLL_MS, self.poll_position_update)
                 return
 
+            # Trim the passed part of the path; replan only once the cart leaves it
+            off_route = self.follower.update(sy, sx, stheta)
+            remaining = self.follower.remaining()
+            if remaining != self.remaining_path:
+                self.remaining_path = remaining
+                self._route_changed()
+
             now = time.monotonic()
             current_cell = (int(sy), int(sx))
-            if now - self._last_path_time >= PATH_RECALC_INTERVAL_S:
+            if off_route and now - self._last_path_time >= PATH_RECALC_INTERVAL_S:
                 if current_cell != self._last_path_cell:
-                    path = theta_star(self.grid, current_cell, self.current_goal)
-                    if path:
-                        self.remaining_path = path[1:]
+                    # Supersedes any replan still queued for a cell we have left
+                    self._replan(current_cell)
                     self._last_path_cell = current_cell
                 self._last_path_time = now
+        elif self._awaiting_path and not self.plan_worker.outstanding():
+            # The last plan found no path (e.g. the cart was boxed in); try again
+            now = time.monotonic()
+            if now - self._last_path_time >= PATH_RECALC_INTERVAL_S:
+                self._awaiting_path = False
+                self._last_path_time = now
+                self._plan_to_target((int(sy), int(sx)))
 
-        self.after(100, self.poll_position_update)
\ No newline at end of file
+        self._poll_id = self.after(POSE_POLL_MS, self.poll_position_update)
\ No newline at end of file
@@ -0,0 +1,20 @@
+"""
+Path planning for the CaddyMate store map.
+"""
+from .bitset import BitsetGrid
+from .cache import CachedPlanner, PathCache, get_path_cache, layout_version
+from .clearance import ClearanceMap, ClearanceThetaStar
+from .core import theta_star, theta_star_any, line_of_sight, aisle_goals, plan_to_any
+from .distance_field import DistanceField, DistanceFieldSet, clear_distance_fields, get_distance_fields
+from .flat import FlatThetaStar
+from .follower import PathFollower
+from .grid import OccupancyGrid
+from .hierarchical import ClusterGraph, HierarchicalPlanner, clear_cluster_graphs, get_cluster_graph
+from .incremental import IncrementalPlanner
+from .jump_point import JumpPointPlanner
+from .lazy_theta import LazyThetaStar
+from .planners import PLANNERS, make_planner
+from .route import RoutePlanner
+from .sparse_graph import SparseGraphPlanner, grid_graph
+from .visibility_graph import VisibilityGraphPlanner
+from .worker import PlanWorker
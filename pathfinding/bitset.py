@@ -0,0 +1,132 @@
+"""
+Bitmask occupancy grid with memoized line-of-sight.
+
+Every row and every column of the grid is packed into a Python int with one
+bit per blocked cell. line_of_sight walks a segment one cell at a time, but
+the cells it inspects on any one row (or column, for steep segments) form a
+single contiguous run: the cells the walk passes through plus the corner
+cells beside each step to the next row. Each run is tested with one shift
+and mask, so a straight segment costs one integer operation and a
+near-straight one only a few.
+
+Theta* tests the same (parent, neighbour) segments again and again, both
+within a search and across searches on the same layout. Results are kept in
+a bitset keyed by segment: bit pair (a * cells + b) records whether the
+segment from cell a to cell b is known and whether it is clear. The bitset
+is allocated in small blocks on first use, so only the parts of the segment
+space a search touches take memory.
+
+The bitmask test alone is slower than the list walk in core.line_of_sight
+(0.6-0.9x), and Theta* on the stock store is slower on this grid (p50 0.37
+vs 0.33 ms in tests/benchmark_baselines.json). The cache makes up for it
+only on larger layouts: about 2.2x on "large" and 2.4x on "warehouse".
+"""
+
+# Bits per cache block (two per segment); 512 bytes each
+BLOCK_SHIFT = 12
+BLOCK_MASK = (1 << BLOCK_SHIFT) - 1
+# Bound on allocated blocks (4 MB); the cache is dropped when it fills
+CACHE_BLOCK_LIMIT = 8192
+
+
+class BitsetGrid:
+    """
+    Occupancy grid with row/column bitmasks and a line-of-sight cache.
+
+    Indexing with grid[r][c] behaves like the list-of-lists grid produced by
+    generate_map, so a BitsetGrid can be passed to theta_star, which then
+    uses its line_of_sight method.
+    """
+
+    def __init__(self, grid, cached=True):
+        self.lists = [[1 if v == 1 else 0 for v in row] for row in grid]
+        self.rows = len(self.lists)
+        self.cols = len(self.lists[0])
+        self.size = self.rows * self.cols
+        self.row_masks = [
+            sum(1 << c for c, v in enumerate(row) if v) for row in self.lists
+        ]
+        self.col_masks = [
+            sum(1 << r for r in range(self.rows) if self.lists[r][c]) for c in range(self.cols)
+        ]
+        self.cached = cached
+        self.hits = 0
+        self.misses = 0
+        self._blocks = {}
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        return self.lists[r]
+
+    def segment_clear(self, a, b):
+        """
+        Checks line-of-sight between two cells with one mask test per row or column.
+
+        Inspects exactly the cells core.line_of_sight does, so the results match.
+        """
+        r0, c0 = a
+        r1, c1 = b
+        dr = r1 - r0
+        dc = c1 - c0
+        if abs(dc) > abs(dr):
+            major, minor = abs(dc), abs(dr)
+            masks, line, line_step = self.row_masks, r0, 1 if dr > 0 else -1
+            pos, pos_step = c0, 1 if dc > 0 else -1
+        else:
+            major, minor = abs(dr), abs(dc)
+            masks, line, line_step = self.col_masks, c0, 1 if dc > 0 else -1
+            pos, pos_step = r0, 1 if dr > 0 else -1
+
+        # On minor line j the walk covers major offsets [k_j, k_(j+1) + 1],
+        # where k_j = floor((2j - 1) * major / (2 * minor)) is the step at
+        # which it moves onto line j; the run ends include the corner cells.
+        start = 0
+        for j in range(minor + 1):
+            end = major if j == minor else (2 * j + 1) * major // (2 * minor) + 1
+            lo = pos + pos_step * start
+            hi = pos + pos_step * end
+            if lo > hi:
+                lo, hi = hi, lo
+            if masks[line] >> lo & ((1 << (hi - lo + 1)) - 1):
+                return False
+            line += line_step
+            start = end - 1
+        return True
+
+    def line_of_sight(self, a, b):
+        """Checks line-of-sight between two cells, answering repeats from the cache."""
+        if not self.cached:
+            return self.segment_clear(a, b)
+
+        cols = self.cols
+        bit = ((a[0] * cols + a[1]) * self.size + b[0] * cols + b[1]) << 1
+        block = self._blocks.get(bit >> BLOCK_SHIFT)
+        offset = bit & BLOCK_MASK
+        if block is not None:
+            state = block[offset >> 3] >> (offset & 7) & 3
+            if state:
+                self.hits += 1
+                return state == 3
+
+        self.misses += 1
+        visible = self.segment_clear(a, b)
+        if block is None:
+            if len(self._blocks) >= CACHE_BLOCK_LIMIT:
+                self._blocks.clear()
+            block = self._blocks[bit >> BLOCK_SHIFT] = bytearray(1 << (BLOCK_SHIFT - 3))
+        # Bit 0: known, bit 1: clear
+        block[offset >> 3] |= (3 if visible else 1) << (offset & 7)
+        return visible
+
+    def hit_rate(self):
+        """Returns the fraction of line-of-sight checks answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear_cache(self):
+        """Drops every cached result and resets the hit/miss counts."""
+        self._blocks.clear()
+        self.hits = 0
+        self.misses = 0
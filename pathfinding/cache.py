@@ -0,0 +1,125 @@
+"""
+Process-wide LRU cache of planned paths.
+
+Keys include a layout version derived from the grid contents, so a layout
+produced by generate_map with different shelves never reuses stale paths.
+Hit and miss counts are reported through the profiler module.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from profiler import count
+from .core import plan_to_any
+
+PATH_CACHE_SIZE = 4096
+
+_MISSING = object()
+
+
+def layout_version(grid):
+    """
+    Returns a short digest identifying the contents of a grid.
+
+    Args:
+        grid (list): 2D list representing the map (0=walkable, 1=obstacle).
+
+    Returns:
+        str: Hex digest that changes whenever any cell or the grid size changes.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{len(grid)}x{len(grid[0])}".encode("ascii"))
+    for row in grid:
+        digest.update(bytes(int(v) for v in row))
+    return digest.hexdigest()
+
+
+class PathCache:
+    """Thread-safe LRU mapping of (layout version, engine, start, goal) to paths."""
+
+    def __init__(self, maxsize=PATH_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        """Returns the cached path for key, marking it most recently used."""
+        with self._lock:
+            path = self._entries.get(key, _MISSING)
+            if path is _MISSING:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if path is _MISSING:
+            count("path_cache_miss")
+            return default
+        count("path_cache_hit")
+        return path
+
+    def put(self, key, path):
+        """Stores a path (or None for "unreachable"), evicting the oldest entry if full."""
+        with self._lock:
+            self._entries[key] = path
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes every entry and resets the hit/miss counts."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_path_cache = PathCache()
+
+
+def get_path_cache():
+    """Get the process-wide path cache."""
+    return _path_cache
+
+
+class CachedPlanner:
+    """Wraps a planner so repeated (start, goal) queries are served from the cache."""
+
+    def __init__(self, planner, engine, grid, cache=None):
+        self.planner = planner
+        self.engine = engine
+        self.version = layout_version(grid)
+        self.cache = cache if cache is not None else _path_cache
+
+    def __getattr__(self, name):
+        # Anything else (stats, cost lookups, ...) comes from the wrapped planner
+        return getattr(self.planner, name)
+
+    def plan(self, start, goal):
+        key = (self.version, self.engine, start, goal)
+        path = self.cache.get(key, _MISSING)
+        if path is _MISSING:
+            path = self.planner.plan(start, goal)
+            self.cache.put(key, tuple(path) if path is not None else None)
+            return path
+        self.planner.stats["expansions"] = 0
+        return list(path) if path is not None else None
+
+    def plan_any(self, start, goals):
+        goals = tuple(goals)
+        key = (self.version, self.engine, start, goals)
+        path = self.cache.get(key, _MISSING)
+        if path is _MISSING:
+            path = plan_to_any(self.planner, start, goals)
+            self.cache.put(key, tuple(path) if path is not None else None)
+            return path
+        self.planner.stats["expansions"] = 0
+        return list(path) if path is not None else None
+
+    def update_cells(self, changes):
+        """Forwards cell changes to the wrapped planner and moves to a new layout version."""
+        self.planner.update_cells(changes)
+        self.version = layout_version(self.planner.grid)
@@ -0,0 +1,294 @@
+"""
+Clearance costmap from a Euclidean distance transform of the layout.
+
+The distance from every free cell to the nearest shelf or wall cell is
+computed once per layout with scipy.ndimage. It answers clearance queries
+with a table lookup and is used in three ways:
+
+- Inflation: cells closer to an obstacle than the robot radius are blocked.
+- Line of sight: a segment that fits inside the obstacle-free disk around its
+  start cannot touch an obstacle, so it is accepted without walking its cells.
+- Cost: segments near shelves cost more, so paths keep their distance when
+  there is room to.
+"""
+import heapq
+import math
+import os
+from array import array
+import numpy as np
+from scipy import ndimage
+from profiler import profile
+from .core import NEIGHBORS, free_neighbour, smooth_path
+from .flat import FlatThetaStar, flat_line_of_sight
+
+# Cart radius in cells; cells with clearance below radius + 0.5 are blocked
+ROBOT_RADIUS = float(os.environ.get("CADDYMATE_ROBOT_RADIUS", "0.0"))
+CLEARANCE_COMFORT = 2.0  # cells of clearance below which segments are penalised
+CLEARANCE_WEIGHT = 0.5  # extra cost fraction for a segment touching a shelf
+# Every cell line_of_sight inspects lies within this distance of the segment
+LOS_MARGIN = 1.5
+
+
+class ClearanceMap:
+    """Distance from every cell to the nearest obstacle cell, in cells."""
+
+    def __init__(self, grid):
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        # Pad with obstacles so the grid edge counts as a wall
+        free = np.zeros((self.rows + 2, self.cols + 2), dtype=bool)
+        free[1:-1, 1:-1] = np.asarray([list(row) for row in grid]) == 0
+        self.distance = ndimage.distance_transform_edt(free)[1:-1, 1:-1]
+        # Plain lists keep scalar lookups cheap
+        self.lists = self.distance.tolist()
+        self.flat = array("d", self.distance.ravel().tolist())
+
+    def clearance(self, cell):
+        """Returns the distance from a cell to the nearest obstacle (0 for obstacles)."""
+        return self.lists[cell[0]][cell[1]]
+
+    def inflated(self, radius):
+        """
+        Returns a copy of the grid with cells too close to obstacles blocked.
+
+        Args:
+            radius (float): Robot radius in cells.
+
+        Returns:
+            list: 2D list (0=walkable, 1=obstacle).
+        """
+        if radius <= 0:
+            return (self.distance == 0).astype(np.uint8).tolist()
+        return (self.distance < radius + 0.5).astype(np.uint8).tolist()
+
+    def penalties(self, comfort=CLEARANCE_COMFORT, weight=CLEARANCE_WEIGHT):
+        """Returns a flat array of per-cell cost penalties in [0, weight]."""
+        shortfall = np.clip((comfort - self.distance) / comfort, 0.0, 1.0)
+        return array("d", (shortfall * weight).ravel().tolist())
+
+
+def escape_path(grid, targets, start):
+    """
+    Returns the shortest 8-connected path from start to the nearest cell marked
+    in targets (a flat row-major buffer), moving only over grid's free cells.
+    """
+    rows, cols = len(grid), len(grid[0])
+    parents = {start: start}
+    dist = {start: 0.0}
+    open_set = [(0.0, start)]
+    while open_set:
+        d, cell = heapq.heappop(open_set)
+        if d > dist[cell]:
+            continue
+        r, c = cell
+        if targets[r * cols + c]:
+            path = [cell]
+            while parents[cell] != cell:
+                cell = parents[cell]
+                path.append(cell)
+            return path[::-1]
+        for dr, dc in NEIGHBORS:
+            nr, nc = r + dr, c + dc
+            if not (0 <= nr < rows and 0 <= nc < cols) or grid[nr][nc] == 1:
+                continue
+            if dr and dc and (grid[nr][c] == 1 or grid[r][nc] == 1):
+                continue
+            nd = d + math.hypot(dr, dc)
+            if nd < dist.get((nr, nc), math.inf):
+                dist[(nr, nc)] = nd
+                parents[(nr, nc)] = cell
+                heapq.heappush(open_set, (nd, (nr, nc)))
+    return None
+
+
+class ClearanceThetaStar(FlatThetaStar):
+    """
+    Theta* on the inflated grid with clearance-based line of sight and costs.
+
+    Inflation can block narrow aisles and leave small free pockets. A start
+    or goal that is blocked, or not in the same free area as the other end,
+    is connected over the real grid to the nearest cell of the main free area.
+    """
+
+    def __init__(self, grid, aisle_locs=None, robot_radius=ROBOT_RADIUS,
+                 comfort=CLEARANCE_COMFORT, weight=CLEARANCE_WEIGHT):
+        self.base_grid = grid
+        self.clearance_map = ClearanceMap(grid)
+        inflated = self.clearance_map.inflated(robot_radius)
+        super().__init__(inflated, aisle_locs)
+        self.inflated_grid = inflated
+        labels, _ = ndimage.label(np.asarray(inflated) == 0)
+        labels = labels.ravel()
+        sizes = np.bincount(labels)
+        sizes[0] = 0
+        self.areas = array("i", labels.tolist())
+        self.main_area = bytearray((labels == sizes.argmax()).astype(np.uint8).tobytes())
+        # Free-disk radius for accepting line of sight, measured on the inflated grid
+        free_radius = ClearanceMap(inflated).flat
+        self.los_radius = array("d", (d - LOS_MARGIN for d in free_radius))
+        # Each endpoint carries half of its penalty into the segment cost
+        self.half_penalty = array("d", (p / 2 for p in self.clearance_map.penalties(comfort, weight)))
+
+    def plan(self, start, goal):
+        """
+        Returns an any-angle path from start to goal that keeps clear of shelves.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        return self.plan_any(start, [goal])
+
+    def plan_any(self, start, goals):
+        """
+        Returns the clear path to the cheapest of several goals with a single search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are skipped.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        rows, cols = self.rows, self.cols
+        if not (0 <= start[0] < rows and 0 <= start[1] < cols):
+            return None
+        goals = [goal for goal in goals if self.base_grid[goal[0]][goal[1]] != 1]
+        if not goals:
+            return None
+
+        head = [start]
+        if self.base_grid[start[0]][start[1]] == 1:
+            first = free_neighbour(self.base_grid, start, goals[0])
+            if first is None:
+                return None
+            head.append(first)
+
+        # Goals sharing the start's free area are searched for directly; the
+        # rest are reached through the main free area.
+        area = self.areas[head[-1][0] * cols + head[-1][1]]
+        local = [goal for goal in goals if area and self.areas[goal[0] * cols + goal[1]] == area]
+        tails = {goal: [goal] for goal in local}
+        if not self.main_area[head[-1][0] * cols + head[-1][1]] and not local:
+            escape = escape_path(self.base_grid, self.main_area, head[-1])
+            if escape is None:
+                return None
+            head += escape[1:]
+        if self.main_area[head[-1][0] * cols + head[-1][1]]:
+            for goal in goals:
+                if goal in local:
+                    continue
+                tail = escape_path(self.base_grid, self.main_area, goal)
+                if tail is not None:
+                    tail.reverse()
+                    tails.setdefault(tail[0], tail)
+        if not tails:
+            return None
+
+        middle = self._search(head[-1], list(tails))
+        if middle is None:
+            return None
+        tail = tails[middle[-1]]
+        path = head[:-1] + middle + tail[1:]
+        if len(head) > 1 or len(tail) > 1:
+            path = smooth_path(self.base_grid, path)
+        return path
+
+    @profile
+    def _search(self, start, goals):
+        """theta_star_any's search with clearance shortcuts and penalised segment costs."""
+        rows, cols = self.rows, self.cols
+        # Bump the generation first: wrapping replaces the stamp buffer
+        gen = self._next_generation()
+        cells = self.cells
+        g = self.g
+        parent = self.parent
+        stamp = self.stamp
+        moves = self.moves
+        los_radius = self.los_radius
+        half_penalty = self.half_penalty
+        hypot = math.hypot
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        inf = math.inf
+
+        heuristic = self._heuristic(goals)
+        targets = {gr * cols + gc for gr, gc in goals}
+        source = start[0] * cols + start[1]
+        stamp[source] = gen
+        g[source] = 0.0
+        parent[source] = source
+        open_set = [(0, source)]
+        expansions = 0
+        los_checks = 0
+        los_shortcuts = 0
+
+        while open_set:
+            _, current = heappop(open_set)
+            expansions += 1
+
+            if current in targets:
+                self.stats["expansions"] = expansions
+                self.stats["los_checks"] = los_checks
+                self.stats["los_shortcuts"] = los_shortcuts
+                path = [divmod(current, cols)]
+                while current != parent[current]:
+                    current = parent[current]
+                    path.append(divmod(current, cols))
+                return path[::-1]
+
+            cr = current // cols
+            cc = current - cr * cols
+            p = parent[current]
+            pr = p // cols
+            pc = p - pr * cols
+            g_parent = g[p]
+            g_current = g[current]
+            p_radius = los_radius[p]
+            p_penalty = 1.0 + half_penalty[p]
+            c_penalty = 1.0 + half_penalty[current]
+
+            for dr, dc, offset, step in moves:
+                nr = cr + dr
+                nc = cc + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                n = current + offset
+                if cells[n]:
+                    continue
+
+                if stamp[n] != gen:
+                    stamp[n] = gen
+                    g[n] = inf
+
+                length = hypot(pr - nr, pc - nc)
+                if length < p_radius:
+                    visible = True
+                    los_shortcuts += 1
+                else:
+                    los_checks += 1
+                    visible = flat_line_of_sight(cells, cols, p, pr, pc, n, nr, nc)
+
+                if visible:
+                    tentative_g = g_parent + length * (p_penalty + half_penalty[n])
+                    if tentative_g < g[n]:
+                        parent[n] = p
+                        g[n] = tentative_g
+                        heappush(open_set, (tentative_g + heuristic(nr, nc), n))
+                else:
+                    # Unlike theta_star's fallback step, never cut a shelf corner
+                    if dr and dc and (cells[current + dr * cols] or cells[current + dc]):
+                        continue
+                    tentative_g = g_current + step * (c_penalty + half_penalty[n])
+                    if tentative_g < g[n]:
+                        parent[n] = current
+                        g[n] = tentative_g
+                        heappush(open_set, (tentative_g + heuristic(nr, nc), n))
+
+        self.stats["expansions"] = expansions
+        self.stats["los_checks"] = los_checks
+        self.stats["los_shortcuts"] = los_shortcuts
+        return None
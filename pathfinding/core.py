@@ -0,0 +1,272 @@
+"""
+Grid search primitives shared by the CaddyMate path planners.
+"""
+import heapq
+import math
+from profiler import profile
+
+NEIGHBORS = [
+    (0, 1), (0, -1), (1, 0), (-1, 0),
+    (1, 1), (1, -1), (-1, 1), (-1, -1)
+]
+
+
+def distance(a, b):
+    """Euclidean distance between two (row, col) cells."""
+    return math.hypot(a[0] - b[0], a[1] - b[1])
+
+
+def path_cost(path):
+    """Total Euclidean length of a (row, col) path."""
+    return sum(distance(a, b) for a, b in zip(path, path[1:]))
+
+
+def line_of_sight(grid, a, b):
+    """Checks line-of-sight between two grid cells without cutting corners."""
+    r0, c0 = a
+    r1, c1 = b
+    if grid[r0][c0] == 1 or grid[r1][c1] == 1:
+        return False
+
+    dr = r1 - r0
+    dc = c1 - c0
+    step_r = 1 if dr > 0 else -1
+    step_c = 1 if dc > 0 else -1
+    dr = abs(dr)
+    dc = abs(dc)
+
+    r = r0
+    c = c0
+    if dc > dr:
+        err = dc / 2.0
+        while c != c1:
+            if grid[r][c] == 1:
+                return False
+            err -= dr
+            if err < 0:
+                # Prevent cutting a corner; both adjacent cells must be clear
+                if grid[r + step_r][c] == 1 or grid[r][c + step_c] == 1:
+                    return False
+                r += step_r
+                err += dc
+            c += step_c
+    else:
+        err = dr / 2.0
+        while r != r1:
+            if grid[r][c] == 1:
+                return False
+            err -= dc
+            if err < 0:
+                if grid[r + step_r][c] == 1 or grid[r][c + step_c] == 1:
+                    return False
+                c += step_c
+                err += dr
+            r += step_r
+
+    return grid[r1][c1] == 0
+
+
+def free_neighbour(grid, cell, toward):
+    """
+    Picks the free 8-neighbour of an occupied cell that is closest to a target.
+
+    Theta* can leave an occupied start cell, so planners that need a free
+    start use this to take the same first step.
+    """
+    rows, cols = len(grid), len(grid[0])
+    r, c = cell
+    best = None
+    best_d = math.inf
+    for dr, dc in NEIGHBORS:
+        nr, nc = r + dr, c + dc
+        if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] == 0:
+            d = distance((nr, nc), toward)
+            if d < best_d:
+                best_d = d
+                best = (nr, nc)
+    return best
+
+
+def octile(a, b):
+    """Octile distance; consistent for 8-connected moves."""
+    dr = abs(a[0] - b[0])
+    dc = abs(a[1] - b[1])
+    return max(dr, dc) + (math.sqrt(2.0) - 1.0) * min(dr, dc)
+
+
+def smooth_path(grid, path):
+    """
+    Removes waypoints that can be skipped with a clear line of sight.
+
+    The grid-graph engines (D* Lite, JPS, the hierarchical planner and
+    csgraph) search 8-connected moves, allowing a diagonal only when both
+    orthogonal cells are free, which is line_of_sight's corner rule. Their
+    paths are passed through here so they come out as any-angle waypoints
+    comparable to theta_star's.
+    """
+    if path is None or len(path) < 3:
+        return path
+
+    smoothed = [path[0]]
+    anchor = path[0]
+    for i in range(1, len(path) - 1):
+        if not line_of_sight(grid, anchor, path[i + 1]):
+            anchor = path[i]
+            smoothed.append(anchor)
+    smoothed.append(path[-1])
+    return smoothed
+
+
+def aisle_goals(locs):
+    """Returns the goal cells of an aisle from its aisle_locs entry (empty if unknown)."""
+    if not locs:
+        return []
+    return locs.get("goals") or [locs["goal"]]
+
+
+def plan_to_any(planner, start, goals):
+    """
+    Returns the path from start to whichever of several goals is cheapest to reach.
+
+    Planners with a multi-target search (a plan_any method) answer with one
+    query; the others fall back to planning to each goal in turn.
+
+    Args:
+        planner: Any planner with a plan(start, goal) method.
+        start (tuple): (row, col) starting coordinates.
+        goals (list): (row, col) goal cells.
+
+    Returns:
+        list: The path to the cheapest goal (its last cell), or None if none is reachable.
+    """
+    if not isinstance(goals, (list, tuple)):
+        goals = list(goals)
+    search = getattr(planner, "plan_any", None)
+    if search is not None:
+        return search(start, goals)
+    best = None
+    best_cost = math.inf
+    for goal in goals:
+        path = planner.plan(start, goal)
+        if path and path_cost(path) < best_cost:
+            best = path
+            best_cost = path_cost(path)
+    return best
+
+
+def theta_star(grid, start, goal, stats=None):
+    """
+    Implements the Theta* pathfinding algorithm (any-angle variant of A*).
+
+    Args:
+        grid (list): 2D list representing the map (0=walkable, 1=obstacle), an
+            OccupancyGrid to batch the line-of-sight checks with NumPy, or a
+            BitsetGrid to test them with bitmasks and memoize the results.
+        start (tuple): (row, col) starting coordinates.
+        goal (tuple): (row, col) goal coordinates.
+        stats (dict, optional): Receives the node expansion count under "expansions"
+            and the number of line-of-sight checks under "los_checks".
+
+    Returns:
+        list: A list of (row, col) tuples representing the path, or None if no path found.
+    """
+    return theta_star_any(grid, start, [goal], stats)
+
+
+@profile
+def theta_star_any(grid, start, goals, stats=None):
+    """
+    Theta* towards several goal cells at once, stopping at the cheapest one.
+
+    The heuristic is the distance to the nearest goal, so it stays admissible
+    and the first goal expanded is the cheapest to reach. One search replaces
+    a theta_star call per goal.
+
+    Args:
+        grid (list): 2D list, OccupancyGrid or BitsetGrid, as for theta_star.
+        start (tuple): (row, col) starting coordinates.
+        goals (list): (row, col) goal cells; blocked goals are never reached.
+        stats (dict, optional): Receives "expansions" and "los_checks" as for theta_star.
+
+    Returns:
+        list: The path to the cheapest goal (its last cell), or None if none is reachable.
+    """
+    rows, cols = len(grid), len(grid[0])
+    targets = set(goals)
+    open_set = []
+    heapq.heappush(open_set, (0, start))
+    parent = {start: start}
+    g_score = {start: 0.0}
+    expansions = 0
+    los_checks = 0
+    batch_los = getattr(grid, "batch_line_of_sight", None)
+    grid_los = getattr(grid, "line_of_sight", None)
+
+    if len(targets) == 1:
+        (gr, gc), = targets
+
+        def heuristic(a):
+            """Euclidean distance heuristic."""
+            return math.hypot(a[0] - gr, a[1] - gc)
+    else:
+        def heuristic(a):
+            """Euclidean distance to the nearest goal."""
+            return min(math.hypot(a[0] - b[0], a[1] - b[1]) for b in targets)
+
+    while open_set:
+        _, current = heapq.heappop(open_set)
+        expansions += 1
+
+        if current in targets:
+            if stats is not None:
+                stats["expansions"] = expansions
+                stats["los_checks"] = los_checks
+            path = [current]
+            while current != parent[current]:
+                current = parent[current]
+                path.append(current)
+            return path[::-1]
+
+        candidates = []
+        for dr, dc in NEIGHBORS:
+            neighbour = (current[0] + dr, current[1] + dc)
+
+            if not (0 <= neighbour[0] < rows and 0 <= neighbour[1] < cols):
+                continue
+            if grid[neighbour[0]][neighbour[1]] == 1:
+                continue
+            candidates.append(neighbour)
+
+        los_checks += len(candidates)
+        # Every candidate is tested against the same parent, so an
+        # OccupancyGrid can check them all in one vectorized call.
+        if batch_los is not None:
+            visible = batch_los(parent[current], candidates)
+        elif grid_los is not None:
+            visible = [grid_los(parent[current], n) for n in candidates]
+        else:
+            visible = [line_of_sight(grid, parent[current], n) for n in candidates]
+
+        for neighbour, has_los in zip(candidates, visible):
+            if neighbour not in g_score:
+                g_score[neighbour] = float("inf")
+
+            if has_los:
+                tentative_g = g_score[parent[current]] + distance(parent[current], neighbour)
+                if tentative_g < g_score[neighbour]:
+                    parent[neighbour] = parent[current]
+                    g_score[neighbour] = tentative_g
+                    f = tentative_g + heuristic(neighbour)
+                    heapq.heappush(open_set, (f, neighbour))
+            else:
+                tentative_g = g_score[current] + distance(current, neighbour)
+                if tentative_g < g_score[neighbour]:
+                    parent[neighbour] = current
+                    g_score[neighbour] = tentative_g
+                    f = tentative_g + heuristic(neighbour)
+                    heapq.heappush(open_set, (f, neighbour))
+
+    if stats is not None:
+        stats["expansions"] = expansions
+        stats["los_checks"] = los_checks
+    return None
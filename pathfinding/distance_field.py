@@ -0,0 +1,211 @@
+"""
+Precomputed cost-to-goal fields for the fixed aisle goals.
+
+A field is built once per layout by running Theta* backwards from the goal
+until the whole grid is settled. Every reachable cell then stores its cost to
+the goal and an any-angle parent pointer, so a path from any cell is found by
+following parents instead of searching. A field seeded from several goals
+leads to the nearest of them, which answers multi-goal queries just as fast.
+
+Each field holds a full-grid table, so a layout keeps at most one field per
+aisle plus FIELD_CACHE_MARGIN others (e.g. arbitrary goal cells sent to the
+planning service), evicting the least recently used.
+"""
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from profiler import count, profile
+from .cache import layout_version
+from .core import NEIGHBORS, aisle_goals, distance, line_of_sight
+
+# Fields kept per layout beyond one per aisle
+FIELD_CACHE_MARGIN = 16
+
+
+class DistanceField:
+    """Cost-to-goal table with any-angle parent pointers for one or more goals."""
+
+    def __init__(self, grid, goal, *goals):
+        self.grid = grid
+        self.goal = goal
+        self.goals = (goal,) + goals
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.cost = []
+        self.parent = []
+        self.build()
+
+    @profile
+    def build(self):
+        """Runs a reverse Theta* (Dijkstra ordering) from the goals over every cell."""
+        grid = self.grid
+        rows, cols = self.rows, self.cols
+        cost = self.cost = [math.inf] * (rows * cols)
+        parent = self.parent = [-1] * (rows * cols)
+
+        open_set = []
+        for gr, gc in self.goals:
+            if not (0 <= gr < rows and 0 <= gc < cols) or grid[gr][gc] == 1:
+                continue
+            goal_idx = gr * cols + gc
+            cost[goal_idx] = 0.0
+            parent[goal_idx] = goal_idx
+            open_set.append((0.0, goal_idx))
+        heapq.heapify(open_set)
+
+        while open_set:
+            g, idx = heapq.heappop(open_set)
+            if g > cost[idx]:
+                continue
+
+            current = divmod(idx, cols)
+            p_idx = parent[idx]
+            p_cell = divmod(p_idx, cols)
+
+            for dr, dc in NEIGHBORS:
+                nr = current[0] + dr
+                nc = current[1] + dc
+                if not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+                if grid[nr][nc] == 1:
+                    continue
+
+                n_idx = nr * cols + nc
+                neighbour = (nr, nc)
+                # The cart walks from the neighbour towards the goal, so test
+                # the segment in that direction.
+                if line_of_sight(grid, neighbour, p_cell):
+                    tentative_g = cost[p_idx] + distance(neighbour, p_cell)
+                    via = p_idx
+                else:
+                    tentative_g = g + distance(neighbour, current)
+                    via = idx
+
+                if tentative_g < cost[n_idx]:
+                    cost[n_idx] = tentative_g
+                    parent[n_idx] = via
+                    heapq.heappush(open_set, (tentative_g, n_idx))
+
+    def cost_from(self, cell):
+        """Returns the cost to the (nearest) goal from a cell, or inf if it is unreachable."""
+        r, c = cell
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return math.inf
+        return self.cost[r * self.cols + c]
+
+    def path_from(self, start):
+        """
+        Returns the path from start to the (nearest) goal by walking parent pointers.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples from start to the goal, or None if
+            no goal can be reached.
+        """
+        r, c = start
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return None
+
+        cols = self.cols
+        idx = r * cols + c
+        path = [start]
+        if self.parent[idx] == -1:
+            # Start is blocked or enclosed; step to the best free neighbour
+            # the same way Theta* would leave an occupied start cell.
+            best_idx = -1
+            best_cost = math.inf
+            for dr, dc in NEIGHBORS:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < self.rows and 0 <= nc < cols):
+                    continue
+                n_idx = nr * cols + nc
+                total = self.cost[n_idx] + math.hypot(dr, dc)
+                if total < best_cost:
+                    best_cost = total
+                    best_idx = n_idx
+            if best_idx == -1:
+                return None
+            idx = best_idx
+            path.append(divmod(idx, cols))
+
+        parent = self.parent
+        while parent[idx] != idx:
+            idx = parent[idx]
+            path.append(divmod(idx, cols))
+        return path
+
+
+class DistanceFieldSet:
+    """Lazily built, LRU-bounded distance fields for the goals of one layout."""
+
+    def __init__(self, grid, aisle_locs):
+        self.grid = grid
+        self.goals = {aisle: tuple(aisle_goals(locs)) for aisle, locs in aisle_locs.items()}
+        self.maxsize = len(self.goals) + FIELD_CACHE_MARGIN
+        self._fields = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._fields)
+
+    def _get(self, key, goals):
+        """Returns the field for key, building it from goals and evicting the oldest if full."""
+        with self._lock:
+            field = self._fields.get(key)
+            if field is None:
+                field = DistanceField(self.grid, *goals)
+                self._fields[key] = field
+                while len(self._fields) > self.maxsize:
+                    self._fields.popitem(last=False)
+                    count("distance_field_evicted")
+            else:
+                self._fields.move_to_end(key)
+        return field
+
+    def field(self, goal):
+        """Returns the field for a goal cell, building it on first use."""
+        return self._get(goal, (goal,))
+
+    def field_any(self, goals):
+        """Returns the field to the nearest of several goal cells, building it on first use."""
+        goals = tuple(goals)
+        if len(goals) == 1:
+            return self.field(goals[0])
+        return self._get(goals, goals)
+
+    def build_all(self):
+        """Precomputes, for every aisle, the field to the nearest of its goal cells."""
+        for goals in self.goals.values():
+            self.field_any(goals)
+
+    def path(self, start, goal):
+        """Returns the path from start to goal, matching theta_star's output."""
+        return self.field(goal).path_from(start)
+
+    def path_any(self, start, goals):
+        """Returns the path from start to the cheapest of several goals."""
+        return self.field_any(goals).path_from(start)
+
+
+_field_sets = {}
+_field_sets_lock = threading.Lock()
+
+
+def get_distance_fields(grid, aisle_locs):
+    """Returns the shared DistanceFieldSet for a layout, creating it if needed."""
+    key = (layout_version(grid), tuple(sorted((a, tuple(aisle_goals(l))) for a, l in aisle_locs.items())))
+    with _field_sets_lock:
+        fields = _field_sets.get(key)
+        if fields is None:
+            fields = DistanceFieldSet(grid, aisle_locs)
+            _field_sets[key] = fields
+    return fields
+
+
+def clear_distance_fields():
+    """Drops every shared DistanceFieldSet, e.g. after a layout is retired."""
+    with _field_sets_lock:
+        _field_sets.clear()
@@ -0,0 +1,210 @@
+"""
+Integer-indexed Theta* with search state reused across calls.
+
+theta_star keys its parent and g-score dicts by (row, col) tuples, so every
+search allocates a tuple per neighbour and grows two dicts. Here cells are
+flat indices (row * cols + col) into preallocated array buffers owned by the
+planner. Instead of clearing the buffers between searches, each search bumps
+a generation number; a cell's g-score only counts when its stamp matches the
+current generation. Apart from heap entries and the returned path, a search
+allocates nothing that grows with the grid.
+
+Expansion order, tie-breaking and line-of-sight rules match theta_star, so
+both return the same paths. plan_any searches towards several goals at once,
+like theta_star_any.
+"""
+import heapq
+import math
+from array import array
+from profiler import profile
+from .core import NEIGHBORS
+
+# Stamps are unsigned 32-bit; wrap well before overflowing
+GENERATION_LIMIT = 2 ** 32 - 1
+
+
+def flat_line_of_sight(cells, cols, a, ar, ac, b, br, bc):
+    """
+    line_of_sight over a flat occupancy buffer, using integer error terms.
+
+    Args:
+        cells (bytearray): Row-major occupancy (0=walkable, 1=obstacle).
+        cols (int): Grid width.
+        a, b (int): Flat indices of the two cells.
+        ar, ac, br, bc (int): Their row and column.
+
+    Returns:
+        bool: True if the segment is clear without cutting corners.
+    """
+    if cells[a] or cells[b]:
+        return False
+
+    dr = br - ar
+    dc = bc - ac
+    step_c = 1 if dc > 0 else -1
+    step_r = cols if dr > 0 else -cols
+    dr = abs(dr)
+    dc = abs(dc)
+
+    idx = a
+    # Errors are doubled so the half-cell start offset stays an integer
+    if dc > dr:
+        err = dc
+        for _ in range(dc):
+            if cells[idx]:
+                return False
+            err -= 2 * dr
+            if err < 0:
+                # Prevent cutting a corner; both adjacent cells must be clear
+                if cells[idx + step_r] or cells[idx + step_c]:
+                    return False
+                idx += step_r
+                err += 2 * dc
+            idx += step_c
+    else:
+        err = dr
+        for _ in range(dr):
+            if cells[idx]:
+                return False
+            err -= 2 * dc
+            if err < 0:
+                if cells[idx + step_r] or cells[idx + step_c]:
+                    return False
+                idx += step_c
+                err += 2 * dr
+            idx += step_r
+
+    return True
+
+
+class FlatThetaStar:
+    """Theta* over flat cell indices with preallocated, generation-stamped buffers."""
+
+    def __init__(self, grid, aisle_locs=None):
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.cells = bytearray(1 if grid[r][c] == 1 else 0 for r in range(self.rows) for c in range(self.cols))
+        size = self.rows * self.cols
+        self.g = array("d", bytes(8 * size))
+        self.parent = array("i", bytes(4 * size))
+        self.stamp = array("I", bytes(4 * size))
+        self.generation = 0
+        # (dr, dc, flat offset, step cost) in theta_star's neighbour order
+        self.moves = [(dr, dc, dr * self.cols + dc, math.hypot(dr, dc)) for dr, dc in NEIGHBORS]
+        self.stats = {"expansions": 0}
+
+    def _next_generation(self):
+        self.generation += 1
+        if self.generation >= GENERATION_LIMIT:
+            self.stamp = array("I", bytes(4 * self.rows * self.cols))
+            self.generation = 1
+        return self.generation
+
+    @staticmethod
+    def _heuristic(goals):
+        """Returns a (row, col) -> distance-to-nearest-goal function."""
+        hypot = math.hypot
+        if len(goals) == 1:
+            (gr, gc), = goals
+            return lambda r, c: hypot(r - gr, c - gc)
+        return lambda r, c: min([hypot(r - gr, c - gc) for gr, gc in goals])
+
+    def plan(self, start, goal):
+        """
+        Returns the same any-angle path as theta_star, reusing the search buffers.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        return self.plan_any(start, [goal])
+
+    @profile
+    def plan_any(self, start, goals):
+        """
+        Returns the path to the cheapest of several goals with a single search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are never reached.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        rows, cols = self.rows, self.cols
+        cells = self.cells
+        # Bump the generation first: wrapping replaces the stamp buffer
+        gen = self._next_generation()
+        g = self.g
+        parent = self.parent
+        stamp = self.stamp
+        moves = self.moves
+        hypot = math.hypot
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        inf = math.inf
+
+        heuristic = self._heuristic(goals)
+        targets = {gr * cols + gc for gr, gc in goals}
+        source = start[0] * cols + start[1]
+        stamp[source] = gen
+        g[source] = 0.0
+        parent[source] = source
+        open_set = [(0, source)]
+        expansions = 0
+        los_checks = 0
+
+        while open_set:
+            _, current = heappop(open_set)
+            expansions += 1
+
+            if current in targets:
+                self.stats["expansions"] = expansions
+                self.stats["los_checks"] = los_checks
+                path = [divmod(current, cols)]
+                while current != parent[current]:
+                    current = parent[current]
+                    path.append(divmod(current, cols))
+                return path[::-1]
+
+            cr = current // cols
+            cc = current - cr * cols
+            p = parent[current]
+            pr = p // cols
+            pc = p - pr * cols
+            g_parent = g[p]
+            g_current = g[current]
+
+            for dr, dc, offset, step in moves:
+                nr = cr + dr
+                nc = cc + dc
+                if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                    continue
+                n = current + offset
+                if cells[n]:
+                    continue
+
+                los_checks += 1
+                if stamp[n] != gen:
+                    stamp[n] = gen
+                    g[n] = inf
+
+                if flat_line_of_sight(cells, cols, p, pr, pc, n, nr, nc):
+                    tentative_g = g_parent + hypot(pr - nr, pc - nc)
+                    if tentative_g < g[n]:
+                        parent[n] = p
+                        g[n] = tentative_g
+                        heappush(open_set, (tentative_g + heuristic(nr, nc), n))
+                else:
+                    tentative_g = g_current + step
+                    if tentative_g < g[n]:
+                        parent[n] = current
+                        g[n] = tentative_g
+                        heappush(open_set, (tentative_g + heuristic(nr, nc), n))
+
+        self.stats["expansions"] = expansions
+        self.stats["los_checks"] = los_checks
+        return None
@@ -0,0 +1,96 @@
+"""
+Path-corridor tracking for the live cart pose.
+
+The follower projects each pose onto the current path, drops the segments
+the cart has already passed and reports whether the cart has left the
+corridor around the route. The map only needs to replan when that happens,
+not every time the cart enters a new cell.
+"""
+import math
+
+MAX_DEVIATION = 1.5  # cells of cross-track error before the cart counts as off route
+MAX_HEADING_ERROR = math.radians(120)  # heading away from the route that forces a replan
+LOOKAHEAD_SEGMENTS = 4  # how many segments ahead a pose may be matched to
+
+
+def project(point, a, b):
+    """
+    Projects a point onto segment a-b.
+
+    Args:
+        point, a, b (tuple): (row, col) coordinates.
+
+    Returns:
+        tuple: (t, distance) with t in [0, 1] along the segment.
+    """
+    sr = b[0] - a[0]
+    sc = b[1] - a[1]
+    length_sq = sr * sr + sc * sc
+    if length_sq == 0:
+        t = 0.0
+    else:
+        t = ((point[0] - a[0]) * sr + (point[1] - a[1]) * sc) / length_sq
+        t = max(0.0, min(1.0, t))
+    return t, math.hypot(point[0] - (a[0] + t * sr), point[1] - (a[1] + t * sc))
+
+
+class PathFollower:
+    """Tracks progress along a planned path and flags when the cart leaves it."""
+
+    def __init__(self, max_deviation=MAX_DEVIATION, max_heading_error=MAX_HEADING_ERROR):
+        self.max_deviation = max_deviation
+        self.max_heading_error = max_heading_error
+        self.points = []
+        self.segment = 0
+        self.cross_track = 0.0
+        self.heading_error = 0.0
+
+    def set_path(self, path):
+        """Starts following a new path, including its start cell."""
+        self.points = list(path) if path else []
+        self.segment = 0
+        self.cross_track = 0.0
+        self.heading_error = 0.0
+
+    def remaining(self):
+        """Returns the waypoints still ahead of the cart."""
+        return self.points[self.segment + 1:]
+
+    def update(self, row, col, theta=None):
+        """
+        Matches a pose to the path and trims the segments already passed.
+
+        Args:
+            row, col (float): Cart position in grid coordinates.
+            theta (float, optional): Cart heading in radians (0 = +col, pi/2 = +row).
+
+        Returns:
+            bool: True if the cart is outside the corridor or heading away
+                from the route and a replan is needed.
+        """
+        points = self.points
+        if len(points) < 2:
+            return True
+
+        pose = (row, col)
+        last = len(points) - 2
+        best = self.segment
+        best_distance = math.inf
+        for i in range(self.segment, min(self.segment + LOOKAHEAD_SEGMENTS, last) + 1):
+            _, d = project(pose, points[i], points[i + 1])
+            # Prefer later segments on ties, so at a corner the cart moves on
+            if d <= best_distance:
+                best = i
+                best_distance = d
+        self.segment = best
+        self.cross_track = best_distance
+
+        self.heading_error = 0.0
+        if theta is not None:
+            a, b = points[best], points[best + 1]
+            if a != b:
+                direction = math.atan2(b[0] - a[0], b[1] - a[1])
+                diff = (theta - direction + math.pi) % (2 * math.pi) - math.pi
+                self.heading_error = abs(diff)
+
+        return self.cross_track > self.max_deviation or self.heading_error > self.max_heading_error
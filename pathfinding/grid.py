@@ -0,0 +1,152 @@
+"""
+NumPy-backed occupancy grid with vectorized line-of-sight checks.
+
+The cells visited by line_of_sight only depend on the (row, col) delta of a
+segment, so the flat-index offsets of every cell it inspects (the traversed
+cells, the corner cells that stop diagonal corner cutting and the end cell)
+are computed once per delta and cached. Testing a batch of segments is then a
+single gather over the flat grid followed by a segmented OR.
+
+This only pays off for long segments. Theta* on the stock 39x28 store is
+slower on this grid than on the list grid (p50 0.50 vs 0.33 ms in
+tests/benchmark_baselines.json); on the 1000x1000 warehouse layout it is
+about 2x faster.
+"""
+from itertools import accumulate
+import numpy as np
+
+# Bound on cached deltas; long-range segments on huge grids would otherwise
+# grow the cache without limit.
+OFFSET_CACHE_LIMIT = 200000
+
+
+def segment_cells(dr, dc):
+    """
+    Returns the relative cells line_of_sight inspects for a (dr, dc) segment.
+
+    Args:
+        dr (int): Row delta from the start cell to the end cell.
+        dc (int): Column delta from the start cell to the end cell.
+
+    Returns:
+        tuple: (rows, cols) int64 arrays of cell offsets relative to the start.
+    """
+    step_r = 1 if dr > 0 else -1
+    step_c = 1 if dc > 0 else -1
+    adr = abs(dr)
+    adc = abs(dc)
+
+    if adc > adr:
+        major, minor, step_major, step_minor = adc, adr, step_c, step_r
+    else:
+        major, minor, step_major, step_minor = adr, adc, step_r, step_c
+
+    if major == 0:
+        return np.zeros(1, dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+    # Closed form of the Bresenham walk: after k major steps the error term
+    # major/2 - k*minor + m*major has forced m = ceil((2k*minor - major) / 2major)
+    # minor steps.
+    k = np.arange(major + 1, dtype=np.int64)
+    m = np.maximum(0, -((major - 2 * k * minor) // (2 * major)))
+    before = m[:-1]
+    stepped = m[1:] > before
+
+    along_major = [k[:-1] * step_major]
+    along_minor = [before * step_minor]
+    # Corner cells beside every minor step
+    corner_k = k[:-1][stepped]
+    corner_m = before[stepped]
+    along_major += [corner_k * step_major, (corner_k + 1) * step_major]
+    along_minor += [(corner_m + 1) * step_minor, corner_m * step_minor]
+    along_major.append(np.array([major * step_major], dtype=np.int64))
+    along_minor.append(np.array([minor * step_minor], dtype=np.int64))
+
+    major_offsets = np.concatenate(along_major)
+    minor_offsets = np.concatenate(along_minor)
+    if adc > adr:
+        return minor_offsets, major_offsets
+    return major_offsets, minor_offsets
+
+
+class OccupancyGrid:
+    """
+    uint8 occupancy grid (0=walkable, 1=obstacle) with batched line-of-sight.
+
+    Indexing with grid[r][c] behaves like the list-of-lists grid produced by
+    generate_map, so an OccupancyGrid can be passed to any planner.
+    """
+
+    def __init__(self, grid):
+        self.cells = np.ascontiguousarray(grid, dtype=np.uint8)
+        self.rows, self.cols = self.cells.shape
+        self.flat = self.cells.ravel()
+        # Plain nested lists keep scalar lookups as fast as the original grid
+        self.lists = self.cells.tolist()
+        self._offsets = {}
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, r):
+        return self.lists[r]
+
+    def segment_offsets(self, dr, dc):
+        """Returns the cached flat-index offsets inspected for a (dr, dc) segment."""
+        key = (dr, dc)
+        offsets = self._offsets.get(key)
+        if offsets is None:
+            if len(self._offsets) >= OFFSET_CACHE_LIMIT:
+                self._offsets.clear()
+            rows, cols = segment_cells(dr, dc)
+            offsets = rows * self.cols + cols
+            self._offsets[key] = offsets
+        return offsets
+
+    def line_of_sight(self, a, b):
+        """Checks line-of-sight between two cells without cutting corners."""
+        offsets = self.segment_offsets(b[0] - a[0], b[1] - a[1])
+        return not self.flat[a[0] * self.cols + a[1] + offsets].any()
+
+    def batch_line_of_sight(self, origin, targets):
+        """
+        Checks line-of-sight from one cell to many cells in a single vectorized call.
+
+        Args:
+            origin (tuple): (row, col) cell every segment starts from.
+            targets (list): (row, col) cells the segments end at.
+
+        Returns:
+            numpy.ndarray: Boolean array, True where the target is visible.
+        """
+        if not targets:
+            return np.zeros(0, dtype=bool)
+        r0, c0 = origin
+        segments = [self.segment_offsets(r - r0, c - c0) for r, c in targets]
+        bounds = list(accumulate([len(s) for s in segments[:-1]], initial=0))
+        indices = np.concatenate(segments)
+        indices += r0 * self.cols + c0
+        return np.maximum.reduceat(self.flat[indices], bounds) == 0
+
+    def batch_line_of_sight_pairs(self, starts, ends):
+        """
+        Checks line-of-sight for many independent (start, end) segments at once.
+
+        Args:
+            starts (array-like): (N, 2) array of start cells.
+            ends (array-like): (N, 2) array of end cells.
+
+        Returns:
+            numpy.ndarray: Boolean array of length N.
+        """
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1, 2)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1, 2)
+        if len(starts) == 0:
+            return np.zeros(0, dtype=bool)
+        deltas = (ends - starts).tolist()
+        segments = [self.segment_offsets(dr, dc) for dr, dc in deltas]
+        lengths = [len(s) for s in segments]
+        bounds = list(accumulate(lengths[:-1], initial=0))
+        indices = np.concatenate(segments)
+        indices += np.repeat(starts[:, 0] * self.cols + starts[:, 1], lengths)
+        return np.maximum.reduceat(self.flat[indices], bounds) == 0
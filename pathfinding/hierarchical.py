@@ -0,0 +1,408 @@
+"""
+Hierarchical (HPA*-style) planner for large store layouts.
+
+The grid is divided into square clusters. Wherever two neighbouring clusters
+share a run of free border cells, one or two entrances are placed on it, and
+the cells either side of an entrance become nodes of an abstract graph.
+Inside a cluster, nodes are linked by the shortest path that stays within
+the cluster; those links are computed the first time the abstract search
+reaches the cluster and then reused by every later query on the layout.
+
+A query only searches the cells of the start and goal clusters to connect
+them to the abstract graph. The rest of the route comes from the stored
+links, and the joined path goes through core.smooth_path.
+"""
+import heapq
+import math
+import threading
+from profiler import profile
+from .cache import layout_version
+from .core import distance, free_neighbour, line_of_sight, path_cost, smooth_path, theta_star_any
+
+CLUSTER_SIZE = 16
+# Border runs longer than this get an entrance at each end instead of one in the middle
+ENTRANCE_SPLIT = 6
+
+SQRT2 = math.sqrt(2.0)
+MOVES = [
+    (0, 1, 1.0), (0, -1, 1.0), (1, 0, 1.0), (-1, 0, 1.0),
+    (1, 1, SQRT2), (1, -1, SQRT2), (-1, 1, SQRT2), (-1, -1, SQRT2),
+]
+
+
+def cluster_search(grid, bounds, source, targets):
+    """
+    8-connected Dijkstra from source that never leaves bounds.
+
+    Diagonal moves need both orthogonal cells free. The search stops once
+    every target is settled.
+
+    Args:
+        grid (list): 2D list representing the map (0=walkable, 1=obstacle).
+        bounds (tuple): (row0, col0, row1, col1), end-exclusive.
+        source (tuple): (row, col) cell to search from.
+        targets (iterable): Cells whose costs are wanted.
+
+    Returns:
+        tuple: (costs, parents, expansions) where costs maps each reached
+            target to its cost and parents maps cells to their predecessor.
+    """
+    r0, c0, r1, c1 = bounds
+    remaining = set(targets)
+    remaining.discard(source)
+    dist = {source: 0.0}
+    parents = {source: source}
+    costs = {source: 0.0}
+    open_set = [(0.0, source)]
+    expansions = 0
+
+    while open_set and remaining:
+        g, cell = heapq.heappop(open_set)
+        if g > dist[cell]:
+            continue
+        expansions += 1
+        if cell in remaining:
+            remaining.discard(cell)
+            costs[cell] = g
+
+        r, c = cell
+        for dr, dc, step in MOVES:
+            nr = r + dr
+            nc = c + dc
+            if not (r0 <= nr < r1 and c0 <= nc < c1) or grid[nr][nc] == 1:
+                continue
+            if dr and dc and (grid[nr][c] == 1 or grid[r][nc] == 1):
+                continue
+            neighbour = (nr, nc)
+            tentative_g = g + step
+            if tentative_g < dist.get(neighbour, math.inf):
+                dist[neighbour] = tentative_g
+                parents[neighbour] = cell
+                heapq.heappush(open_set, (tentative_g, neighbour))
+
+    return costs, parents, expansions
+
+
+def trace(parents, cell):
+    """Follows parent links from cell back to the search source; returns source-first."""
+    path = [cell]
+    while parents[cell] != cell:
+        cell = parents[cell]
+        path.append(cell)
+    return path[::-1]
+
+
+class ClusterGraph:
+    """Abstract graph of cluster entrances for one layout, shared between planners."""
+
+    def __init__(self, grid, cluster_size=CLUSTER_SIZE):
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.size = cluster_size
+        self.cluster_rows = -(-self.rows // cluster_size)
+        self.cluster_cols = -(-self.cols // cluster_size)
+
+        self.cells = []
+        self.node_ids = {}
+        self.edges = []
+        self.cluster_nodes = {}
+        # Intra-cluster links: {(a, b): waypoints}, filled in per cluster on demand
+        self.links = {}
+        self._built = set()
+        self._lock = threading.Lock()
+        self.build()
+
+    def cluster_of(self, cell):
+        """Returns the (cluster row, cluster col) containing a cell."""
+        return cell[0] // self.size, cell[1] // self.size
+
+    def bounds(self, cluster):
+        """Returns the (row0, col0, row1, col1) cell bounds of a cluster."""
+        r0 = cluster[0] * self.size
+        c0 = cluster[1] * self.size
+        return r0, c0, min(r0 + self.size, self.rows), min(c0 + self.size, self.cols)
+
+    def _node(self, cell):
+        node = self.node_ids.get(cell)
+        if node is None:
+            node = len(self.cells)
+            self.node_ids[cell] = node
+            self.cells.append(cell)
+            self.edges.append([])
+            self.cluster_nodes.setdefault(self.cluster_of(cell), []).append(node)
+        return node
+
+    def _add_entrances(self, pairs):
+        """Places entrances along one cluster border given its facing cell pairs."""
+        grid = self.grid
+        run = []
+        for a, b in pairs + [(None, None)]:
+            if a is not None and grid[a[0]][a[1]] == 0 and grid[b[0]][b[1]] == 0:
+                run.append((a, b))
+                continue
+            if run:
+                if len(run) > ENTRANCE_SPLIT:
+                    chosen = [run[0], run[-1]]
+                else:
+                    chosen = [run[len(run) // 2]]
+                for ca, cb in chosen:
+                    na = self._node(ca)
+                    nb = self._node(cb)
+                    self.edges[na].append((nb, 1.0))
+                    self.edges[nb].append((na, 1.0))
+                run = []
+
+    @profile
+    def build(self):
+        """Finds the entrances on every border between neighbouring clusters."""
+        for cr in range(self.cluster_rows):
+            for cc in range(self.cluster_cols):
+                r0, c0, r1, c1 = self.bounds((cr, cc))
+                if c1 < self.cols:
+                    self._add_entrances([((r, c1 - 1), (r, c1)) for r in range(r0, r1)])
+                if r1 < self.rows:
+                    self._add_entrances([((r1 - 1, c), (r1, c)) for c in range(c0, c1)])
+
+    def ensure_cluster(self, cluster):
+        """Links every pair of entrance nodes inside a cluster, once per layout."""
+        if cluster in self._built:
+            return
+        with self._lock:
+            if cluster in self._built:
+                return
+            nodes = self.cluster_nodes.get(cluster, [])
+            bounds = self.bounds(cluster)
+            for i, a in enumerate(nodes):
+                others = nodes[i + 1:]
+                if not others:
+                    continue
+                costs, parents, _ = cluster_search(
+                    self.grid, bounds, self.cells[a], [self.cells[b] for b in others]
+                )
+                for b in others:
+                    cell = self.cells[b]
+                    if cell not in costs:
+                        continue
+                    cells = trace(parents, cell)
+                    # line_of_sight is not symmetric, so each direction is
+                    # shortened on its own
+                    forward = smooth_path(self.grid, cells)
+                    backward = smooth_path(self.grid, cells[::-1])
+                    self.links[(a, b)] = forward
+                    self.links[(b, a)] = backward
+                    self.edges[a].append((b, path_cost(forward)))
+                    self.edges[b].append((a, path_cost(backward)))
+            self._built.add(cluster)
+
+
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def get_cluster_graph(grid, cluster_size=CLUSTER_SIZE):
+    """Returns the shared ClusterGraph for a layout, creating it if needed."""
+    key = (layout_version(grid), cluster_size)
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = ClusterGraph(grid, cluster_size)
+            _graphs[key] = graph
+    return graph
+
+
+def clear_cluster_graphs():
+    """Drops every shared ClusterGraph, e.g. after a layout is retired."""
+    with _graphs_lock:
+        _graphs.clear()
+
+
+class HierarchicalPlanner:
+    """Plans over the shared cluster graph, searching cells only near the endpoints."""
+
+    def __init__(self, grid, aisle_locs=None, cluster_size=CLUSTER_SIZE):
+        self.grid = grid
+        self.graph = get_cluster_graph(grid, cluster_size)
+        self.stats = {"expansions": 0}
+
+    def plan(self, start, goal):
+        """
+        Returns an any-angle path from start to goal via the cluster graph.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        return self.plan_any(start, [goal])
+
+    def plan_any(self, start, goals):
+        """
+        Returns the path to the cheapest of several goals with a single abstract search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are never reached.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        grid = self.grid
+        rows, cols = len(grid), len(grid[0])
+        if not (0 <= start[0] < rows and 0 <= start[1] < cols):
+            return None
+        goals = [goal for goal in goals if grid[goal[0]][goal[1]] != 1]
+        if not goals:
+            return None
+
+        search_start = start
+        if grid[start[0]][start[1]] == 1:
+            toward = min(goals, key=lambda goal: distance(start, goal))
+            search_start = free_neighbour(grid, start, toward)
+            if search_start is None:
+                return None
+
+        path = self._search(search_start, goals)
+        if path is None:
+            # Entrances miss diagonal-only crossings at cluster corners; fall
+            # back to a full search rather than report a false "no path".
+            path = theta_star_any(grid, search_start, goals, stats=self.stats)
+            if path is None:
+                return None
+        if search_start != start:
+            path.insert(0, start)
+        return path
+
+    def _search(self, start, goals):
+        """A* over the abstract graph with start and goals linked in through their clusters."""
+        graph = self.graph
+        grid = self.grid
+        self.stats["los_checks"] = len(goals)
+        visible = [line_of_sight(grid, start, goal) for goal in goals]
+        if len(goals) == 1 and visible[0]:
+            self.stats["expansions"] = 0
+            return [start, goals[0]]
+
+        start_cluster = graph.cluster_of(start)
+        graph.ensure_cluster(start_cluster)
+        start_nodes = graph.cluster_nodes.get(start_cluster, [])
+        start_targets = [graph.cells[n] for n in start_nodes]
+
+        # Goal k is abstract node -2 - k; only the endpoint clusters are searched cell by cell
+        goal_ids = {}
+        goal_parents = {}
+        to_goal = {}
+        expansions = 0
+        for k, goal in enumerate(goals):
+            goal_id = -2 - k
+            goal_ids[goal_id] = goal
+            goal_cluster = graph.cluster_of(goal)
+            graph.ensure_cluster(goal_cluster)
+            if goal_cluster == start_cluster:
+                start_targets.append(goal)
+            goal_nodes = graph.cluster_nodes.get(goal_cluster, [])
+            goal_costs, goal_parents[goal_id], goal_expansions = cluster_search(
+                grid, graph.bounds(goal_cluster), goal, [graph.cells[n] for n in goal_nodes]
+            )
+            expansions += goal_expansions
+            for n in goal_nodes:
+                if graph.cells[n] in goal_costs:
+                    to_goal.setdefault(n, []).append((goal_id, goal_costs[graph.cells[n]]))
+
+        start_costs, start_parents, start_expansions = cluster_search(
+            grid, graph.bounds(start_cluster), start, start_targets
+        )
+        expansions += start_expansions
+
+        if len(goals) == 1:
+            (gr, gc), = goals
+
+            def heuristic(cell):
+                return math.hypot(cell[0] - gr, cell[1] - gc)
+        else:
+            def heuristic(cell):
+                return min([math.hypot(cell[0] - gr, cell[1] - gc) for gr, gc in goals])
+
+        start_id = -1
+        g_score = {start_id: 0.0}
+        parent = {start_id: start_id}
+        open_set = [(heuristic(start), start_id)]
+        closed = set()
+        # Goals reached from start in a straight line rather than through its cluster
+        direct = set()
+
+        for goal_id, goal in goal_ids.items():
+            if visible[-2 - goal_id]:
+                cost = distance(start, goal)
+                direct.add(goal_id)
+            elif goal in start_costs and graph.cluster_of(goal) == start_cluster:
+                cost = start_costs[goal]
+            else:
+                continue
+            g_score[goal_id] = cost
+            parent[goal_id] = start_id
+            heapq.heappush(open_set, (cost, goal_id))
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            expansions += 1
+
+            if current in goal_ids:
+                self.stats["expansions"] = expansions
+                chain = [current]
+                while chain[-1] != start_id:
+                    chain.append(parent[chain[-1]])
+                chain.reverse()
+                return self._refine(chain, start, goal_ids, start_parents, goal_parents, direct)
+
+            if current == start_id:
+                successors = [
+                    (n, start_costs[graph.cells[n]])
+                    for n in start_nodes if graph.cells[n] in start_costs
+                ]
+            else:
+                graph.ensure_cluster(graph.cluster_of(graph.cells[current]))
+                successors = graph.edges[current]
+                if current in to_goal:
+                    successors = successors + to_goal[current]
+
+            base = g_score[current]
+            for nxt, cost in successors:
+                tentative_g = base + cost
+                if tentative_g < g_score.get(nxt, math.inf):
+                    g_score[nxt] = tentative_g
+                    parent[nxt] = current
+                    cell = goal_ids[nxt] if nxt in goal_ids else graph.cells[nxt]
+                    heapq.heappush(open_set, (tentative_g + heuristic(cell), nxt))
+
+        self.stats["expansions"] = expansions
+        return None
+
+    def _refine(self, chain, start, goal_ids, start_parents, goal_parents, direct):
+        """Joins the cell paths behind an abstract node chain and shortens the result."""
+        graph = self.graph
+        cells = graph.cells
+        path = []
+        for a, b in zip(chain, chain[1:]):
+            if a == -1 and b in direct:
+                segment = [start, goal_ids[b]]
+            elif a == -1 and b in goal_ids:
+                segment = trace(start_parents, goal_ids[b])
+            elif a == -1:
+                segment = trace(start_parents, cells[b])
+            elif b in goal_ids:
+                segment = trace(goal_parents[b], cells[a])[::-1]
+            else:
+                segment = graph.links.get((a, b), [cells[a], cells[b]])
+            if path and path[-1] == segment[0]:
+                segment = segment[1:]
+            path.extend(segment)
+
+        smoothed = smooth_path(self.grid, path)
+        self.stats["los_checks"] += max(len(path) - 2, 0)
+        return smoothed
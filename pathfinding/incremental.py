@@ -0,0 +1,265 @@
+"""
+Incremental any-angle planner built on D* Lite.
+
+The search runs backwards from the goal and keeps its g/rhs tables between
+calls. When the cart moves, only the key modifier changes; when cells are
+blocked or cleared, only the vertices around them are repaired. The
+8-connected result goes through core.smooth_path.
+
+Several goal cells are searched as one virtual goal: every goal is seeded
+with rhs = 0, so the tree leads to whichever is cheapest. The tree belongs
+to one goal set and is kept for as long as queries use that set.
+
+Costs and keys are kept as integers (octile steps scaled by STEP_COST). The
+key modifier grows with every start move, and float keys that should tie
+drift apart by an ULP, which ends the search with an underconsistent vertex
+still queued and leaves g[start] below the true cost.
+"""
+import heapq
+import math
+from .core import NEIGHBORS, free_neighbour, smooth_path
+
+SQRT2 = math.sqrt(2.0)
+# Integer step costs for the D* Lite tables (diagonal = round(STEP_COST * sqrt 2))
+STEP_COST = 10000
+DIAGONAL_COST = round(STEP_COST * SQRT2)
+
+
+def octile_cost(a, b):
+    """Octile distance in integer STEP_COST units; consistent with _move_cost."""
+    dr = abs(a[0] - b[0])
+    dc = abs(a[1] - b[1])
+    return STEP_COST * max(dr, dc) + (DIAGONAL_COST - STEP_COST) * min(dr, dc)
+
+
+class IncrementalPlanner:
+    """
+    D* Lite planner that reuses its search tree across replans.
+
+    The planner keeps a private copy of the grid; use update_cells to change
+    cell states so the search tree can be repaired in place. Queries to the
+    same goal (or goal set, via plan_any) reuse the tree; a new one resets it.
+    """
+
+    def __init__(self, grid, aisle_locs=None):
+        self.grid = [list(row) for row in grid]
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.goals = None
+        self.stats = {"expansions": 0}
+        self._last_start = None
+
+    def _reset(self, goals, start):
+        """Discards the search tree and seeds a new one for the goal set."""
+        size = self.rows * self.cols
+        self.goals = goals
+        self.g = [math.inf] * size
+        self.rhs = [math.inf] * size
+        self.open_set = []
+        self.open_key = {}
+        self.km = 0
+        self._last_start = start
+
+        self._goal_idxs = set()
+        for goal in goals:
+            goal_idx = goal[0] * self.cols + goal[1]
+            self._goal_idxs.add(goal_idx)
+            self.rhs[goal_idx] = 0
+            self._push(goal_idx, (octile_cost(start, goal), 0))
+
+    def _push(self, idx, key):
+        self.open_key[idx] = key
+        heapq.heappush(self.open_set, (key[0], key[1], idx))
+
+    def _top_key(self):
+        """Returns the smallest valid key in the queue, dropping stale entries."""
+        open_set = self.open_set
+        while open_set:
+            k1, k2, idx = open_set[0]
+            if self.open_key.get(idx) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(open_set)
+        return (math.inf, math.inf)
+
+    def _calc_key(self, idx, start):
+        best = min(self.g[idx], self.rhs[idx])
+        cell = divmod(idx, self.cols)
+        return (best + octile_cost(start, cell) + self.km, best)
+
+    def _move_cost(self, r, c, dr, dc):
+        """Cost of stepping from (r, c) by (dr, dc), or inf if blocked."""
+        grid = self.grid
+        nr, nc = r + dr, c + dc
+        if not (0 <= nr < self.rows and 0 <= nc < self.cols):
+            return math.inf
+        if grid[r][c] == 1 or grid[nr][nc] == 1:
+            return math.inf
+        if dr and dc:
+            # Diagonal moves may not cut the corner of an occupied cell
+            if grid[r + dr][c] == 1 or grid[r][c + dc] == 1:
+                return math.inf
+            return DIAGONAL_COST
+        return STEP_COST
+
+    def _update_vertex(self, idx, start):
+        if idx not in self._goal_idxs:
+            r, c = divmod(idx, self.cols)
+            best = math.inf
+            g = self.g
+            cols = self.cols
+            for dr, dc in NEIGHBORS:
+                cost = self._move_cost(r, c, dr, dc)
+                if cost == math.inf:
+                    continue
+                total = cost + g[(r + dr) * cols + c + dc]
+                if total < best:
+                    best = total
+            self.rhs[idx] = best
+
+        self.open_key.pop(idx, None)
+        if self.g[idx] != self.rhs[idx]:
+            self._push(idx, self._calc_key(idx, start))
+
+    def _neighbour_indices(self, idx):
+        r, c = divmod(idx, self.cols)
+        for dr, dc in NEIGHBORS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                yield nr * self.cols + nc
+
+    def _compute_shortest_path(self, start):
+        start_idx = start[0] * self.cols + start[1]
+        g = self.g
+        rhs = self.rhs
+        expansions = 0
+
+        while True:
+            top = self._top_key()
+            if not (top < self._calc_key(start_idx, start) or rhs[start_idx] != g[start_idx]):
+                break
+            if top[0] == math.inf:
+                break
+
+            _, _, idx = heapq.heappop(self.open_set)
+            del self.open_key[idx]
+            expansions += 1
+
+            new_key = self._calc_key(idx, start)
+            if top < new_key:
+                self._push(idx, new_key)
+            elif g[idx] > rhs[idx]:
+                g[idx] = rhs[idx]
+                for n_idx in self._neighbour_indices(idx):
+                    self._update_vertex(n_idx, start)
+            else:
+                g[idx] = math.inf
+                self._update_vertex(idx, start)
+                for n_idx in self._neighbour_indices(idx):
+                    self._update_vertex(n_idx, start)
+
+        self.stats["expansions"] = expansions
+
+    def _extract_path(self, start):
+        """Follows the cheapest successors from start to the nearest goal."""
+        cols = self.cols
+        g = self.g
+        if g[start[0] * cols + start[1]] == math.inf:
+            return None
+
+        goal_idxs = self._goal_idxs
+        path = [start]
+        visited = {start}
+        current = start
+        while True:
+            if current[0] * cols + current[1] in goal_idxs:
+                return path
+            r, c = current
+            best = None
+            best_total = math.inf
+            for dr, dc in NEIGHBORS:
+                cost = self._move_cost(r, c, dr, dc)
+                if cost == math.inf:
+                    continue
+                total = cost + g[(r + dr) * cols + c + dc]
+                if total < best_total:
+                    best_total = total
+                    best = (r + dr, c + dc)
+            if best is None or best in visited:
+                # A cycle means the g-values are inconsistent; never walk it
+                return None
+            visited.add(best)
+            path.append(best)
+            current = best
+
+    def plan(self, start, goal):
+        """
+        Returns an any-angle path from start to goal, repairing the previous search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        return self.plan_any(start, [goal])
+
+    def plan_any(self, start, goals):
+        """
+        Returns the path to the cheapest of several goals, repairing the previous search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are never reached.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        if not (0 <= start[0] < self.rows and 0 <= start[1] < self.cols):
+            return None
+        goals = tuple(goal for goal in goals if self.grid[goal[0]][goal[1]] != 1)
+        if not goals:
+            return None
+
+        search_start = start
+        if self.grid[start[0]][start[1]] == 1:
+            toward = min(goals, key=lambda goal: octile_cost(start, goal))
+            search_start = free_neighbour(self.grid, start, toward)
+            if search_start is None:
+                return None
+
+        if goals != self.goals:
+            self._reset(goals, search_start)
+        elif search_start != self._last_start:
+            self.km += octile_cost(self._last_start, search_start)
+            self._last_start = search_start
+
+        self._compute_shortest_path(search_start)
+        path = self._extract_path(search_start)
+        if path is None:
+            return None
+        if search_start != start:
+            path.insert(0, start)
+        self.stats["los_checks"] = max(len(path) - 2, 0)
+        return smooth_path(self.grid, path)
+
+    def update_cells(self, changes):
+        """
+        Changes cell states and repairs the search tree around them.
+
+        Args:
+            changes (dict): Maps (row, col) cells to their new value (0 or 1).
+        """
+        affected = set()
+        for (r, c), value in changes.items():
+            if self.grid[r][c] == value:
+                continue
+            self.grid[r][c] = value
+            idx = r * self.cols + c
+            affected.add(idx)
+            affected.update(self._neighbour_indices(idx))
+
+        if self.goals is None or not affected:
+            return
+        for idx in affected:
+            self._update_vertex(idx, self._last_start)
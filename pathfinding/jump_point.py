@@ -0,0 +1,244 @@
+"""
+Jump Point Search with an any-angle post-pass.
+
+JPS runs A* over an 8-connected grid but skips the symmetric cells of open
+areas: from each expanded node it scans straight and diagonal lines until it
+finds a "jump point" (the goal, or a cell with a forced neighbour next to an
+obstacle), and only those are pushed on the heap. The jump-point legs are
+expanded back into cells for core.smooth_path.
+"""
+import heapq
+import math
+from profiler import profile
+from .core import NEIGHBORS, free_neighbour, octile, smooth_path
+
+
+class JumpPointPlanner:
+    """Jump Point Search (no corner cutting) followed by line-of-sight smoothing."""
+
+    def __init__(self, grid, aisle_locs=None):
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        # Flat copy padded with a ring of obstacles, so scans need no bounds checks
+        self.width = self.cols + 2
+        cells = bytearray([1]) * (self.width * (self.rows + 2))
+        for r in range(self.rows):
+            row = grid[r]
+            base = (r + 1) * self.width + 1
+            for c in range(self.cols):
+                if row[c] != 1:
+                    cells[base + c] = 0
+        self.cells = cells
+        self.stats = {"expansions": 0}
+
+    def _index(self, cell):
+        return (cell[0] + 1) * self.width + cell[1] + 1
+
+    def _cell(self, idx):
+        r, c = divmod(idx, self.width)
+        return r - 1, c - 1
+
+    def _jump_straight(self, idx, step, side, targets):
+        """
+        Scans from idx by step (a row or column move); returns the first jump point or -1.
+
+        side is the offset to the cells beside the scan line; a free side cell
+        whose neighbour behind it is blocked is a forced neighbour.
+        """
+        cells = self.cells
+        while True:
+            idx += step
+            if cells[idx]:
+                return -1
+            if idx in targets:
+                return idx
+            if (not cells[idx - side] and cells[idx - side - step]) or (not cells[idx + side] and cells[idx + side - step]):
+                return idx
+
+    def _jump(self, idx, dr, dc, targets):
+        """Scans from idx in direction (dr, dc); returns the first jump point or -1."""
+        width = self.width
+        row_step = dr * width
+        if not dc:
+            return self._jump_straight(idx, row_step, 1, targets)
+        if not dr:
+            return self._jump_straight(idx, dc, width, targets)
+
+        cells = self.cells
+        step = row_step + dc
+        while True:
+            idx += step
+            if cells[idx]:
+                return -1
+            if idx in targets:
+                return idx
+            if self._jump_straight(idx, dc, width, targets) >= 0 or self._jump_straight(idx, row_step, 1, targets) >= 0:
+                return idx
+            # The next diagonal step must not cut a corner
+            if cells[idx + dc] or cells[idx + row_step]:
+                return -1
+
+    def _directions(self, idx, parent):
+        """Returns the pruned search directions from idx given the node it was reached from."""
+        cells = self.cells
+        width = self.width
+        if parent is None:
+            return [
+                (dr, dc) for dr, dc in NEIGHBORS
+                if not cells[idx + dr * width + dc]
+                and (not (dr and dc) or not (cells[idx + dr * width] or cells[idx + dc]))
+            ]
+
+        pr, pc = divmod(parent, width)
+        r, c = divmod(idx, width)
+        dr = (r > pr) - (r < pr)
+        dc = (c > pc) - (c < pc)
+        directions = []
+        if dr and dc:
+            vertical = not cells[idx + dr * width]
+            horizontal = not cells[idx + dc]
+            if vertical:
+                directions.append((dr, 0))
+            if horizontal:
+                directions.append((0, dc))
+            if vertical and horizontal:
+                directions.append((dr, dc))
+        elif dc:
+            ahead = not cells[idx + dc]
+            up = not cells[idx - width]
+            down = not cells[idx + width]
+            if ahead:
+                directions.append((0, dc))
+                if up:
+                    directions.append((-1, dc))
+                if down:
+                    directions.append((1, dc))
+            if up:
+                directions.append((-1, 0))
+            if down:
+                directions.append((1, 0))
+        else:
+            ahead = not cells[idx + dr * width]
+            left = not cells[idx - 1]
+            right = not cells[idx + 1]
+            if ahead:
+                directions.append((dr, 0))
+                if left:
+                    directions.append((dr, -1))
+                if right:
+                    directions.append((dr, 1))
+            if left:
+                directions.append((0, -1))
+            if right:
+                directions.append((0, 1))
+        return directions
+
+    def plan(self, start, goal):
+        """
+        Returns an any-angle path from start to goal.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        return self.plan_any(start, [goal])
+
+    @profile
+    def plan_any(self, start, goals):
+        """
+        Returns the path to the cheapest of several goals with a single search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are never reached.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        if not (0 <= start[0] < self.rows and 0 <= start[1] < self.cols):
+            return None
+        goals = [goal for goal in goals if not self.cells[self._index(goal)]]
+        if not goals:
+            return None
+
+        search_start = start
+        if self.cells[self._index(start)]:
+            toward = min(goals, key=lambda goal: octile(start, goal))
+            search_start = free_neighbour(self.grid, start, toward)
+            if search_start is None:
+                return None
+
+        jump_points = self._search(search_start, goals)
+        if jump_points is None:
+            return None
+
+        # Expand jump-point legs into cells so the smoothing pass can shortcut
+        # anywhere along them, not just at the jump points.
+        cells = [jump_points[0]]
+        for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+            dr = (r1 > r0) - (r1 < r0)
+            dc = (c1 > c0) - (c1 < c0)
+            for i in range(1, max(abs(r1 - r0), abs(c1 - c0)) + 1):
+                cells.append((r0 + dr * i, c0 + dc * i))
+        if search_start != start:
+            cells.insert(0, start)
+        self.stats["los_checks"] = max(len(cells) - 2, 0)
+        return smooth_path(self.grid, cells)
+
+    def _search(self, start, goals):
+        """A* over jump points; returns the jump points from start to the nearest goal as cells."""
+        source = self._index(start)
+        targets = {self._index(goal) for goal in goals}
+        width = self.width
+
+        if len(goals) == 1:
+            (gr, gc), = goals
+
+            def heuristic(idx):
+                r, c = divmod(idx, width)
+                return octile((r - 1, c - 1), (gr, gc))
+        else:
+            def heuristic(idx):
+                r, c = divmod(idx, width)
+                return min([octile((r - 1, c - 1), goal) for goal in goals])
+
+        g_score = {source: 0.0}
+        parent = {source: None}
+        open_set = [(heuristic(source), source)]
+        closed = set()
+        expansions = 0
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            expansions += 1
+
+            if current in targets:
+                self.stats["expansions"] = expansions
+                path = [self._cell(current)]
+                while parent[current] is not None:
+                    current = parent[current]
+                    path.append(self._cell(current))
+                return path[::-1]
+
+            base = g_score[current]
+            cr, cc = divmod(current, width)
+            for dr, dc in self._directions(current, parent[current]):
+                jump_point = self._jump(current, dr, dc, targets)
+                if jump_point < 0 or jump_point in closed:
+                    continue
+                jr, jc = divmod(jump_point, width)
+                tentative_g = base + octile((cr, cc), (jr, jc))
+                if tentative_g < g_score.get(jump_point, math.inf):
+                    g_score[jump_point] = tentative_g
+                    parent[jump_point] = current
+                    heapq.heappush(open_set, (tentative_g + heuristic(jump_point), jump_point))
+
+        self.stats["expansions"] = expansions
+        return None
@@ -0,0 +1,155 @@
+"""
+Lazy Theta*: any-angle search with one line-of-sight check per expansion.
+
+Theta* tests line of sight from the current parent to every neighbour it
+relaxes. Lazy Theta* assumes the neighbour can see its grandparent, and only
+checks that when the neighbour is expanded; if the assumption was wrong, the
+node's parent is repaired from its best already-expanded neighbour. Most
+relaxed nodes are never expanded, so most of those checks are never made.
+
+The search reuses FlatThetaStar's generation-stamped buffers.
+"""
+import heapq
+import math
+from array import array
+from profiler import profile
+from .flat import FlatThetaStar, flat_line_of_sight
+
+
+class LazyThetaStar(FlatThetaStar):
+    """Lazy Theta* over flat cell indices."""
+
+    def __init__(self, grid, aisle_locs=None):
+        super().__init__(grid, aisle_locs)
+        self.closed = array("I", bytes(4 * self.rows * self.cols))
+
+    def _next_generation(self):
+        generation = super()._next_generation()
+        if generation == 1:
+            self.closed = array("I", bytes(4 * self.rows * self.cols))
+        return generation
+
+    def _valid_moves(self, idx, r, c):
+        """Yields (neighbour, row, col, step) for moves that do not cut a corner."""
+        rows, cols = self.rows, self.cols
+        cells = self.cells
+        for dr, dc, offset, step in self.moves:
+            nr = r + dr
+            nc = c + dc
+            if nr < 0 or nr >= rows or nc < 0 or nc >= cols:
+                continue
+            n = idx + offset
+            if cells[n]:
+                continue
+            if dr and dc and (cells[idx + dr * cols] or cells[idx + dc]):
+                continue
+            yield n, nr, nc, step
+
+    def plan(self, start, goal):
+        """
+        Returns an any-angle path from start to goal.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        return self.plan_any(start, [goal])
+
+    @profile
+    def plan_any(self, start, goals):
+        """
+        Returns the path to the cheapest of several goals with a single search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are skipped.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        rows, cols = self.rows, self.cols
+        if not (0 <= start[0] < rows and 0 <= start[1] < cols):
+            return None
+        goals = [goal for goal in goals if not self.cells[goal[0] * cols + goal[1]]]
+        if not goals:
+            return None
+
+        # Bump the generation first: wrapping replaces the stamp and closed buffers
+        gen = self._next_generation()
+        cells = self.cells
+        g = self.g
+        parent = self.parent
+        stamp = self.stamp
+        hypot = math.hypot
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+        inf = math.inf
+        closed = self.closed
+
+        heuristic = self._heuristic(goals)
+        targets = {gr * cols + gc for gr, gc in goals}
+        source = start[0] * cols + start[1]
+        stamp[source] = gen
+        g[source] = 0.0
+        parent[source] = source
+        open_set = [(heuristic(start[0], start[1]), source)]
+        expansions = 0
+        los_checks = 0
+
+        while open_set:
+            _, current = heappop(open_set)
+            if closed[current] == gen:
+                continue
+            closed[current] = gen
+            expansions += 1
+
+            cr = current // cols
+            cc = current - cr * cols
+            p = parent[current]
+            pr = p // cols
+            pc = p - pr * cols
+
+            if p != current:
+                los_checks += 1
+                if not flat_line_of_sight(cells, cols, p, pr, pc, current, cr, cc):
+                    # The assumed shortcut is blocked; hang the node off its
+                    # best expanded neighbour instead.
+                    best = inf
+                    for n, nr, nc, step in self._valid_moves(current, cr, cc):
+                        if closed[n] == gen and n != current and g[n] + step < best:
+                            best = g[n] + step
+                            p = n
+                    parent[current] = p
+                    g[current] = best
+                    pr = p // cols
+                    pc = p - pr * cols
+
+            if current in targets:
+                self.stats["expansions"] = expansions
+                self.stats["los_checks"] = los_checks
+                path = [divmod(current, cols)]
+                while current != parent[current]:
+                    current = parent[current]
+                    path.append(divmod(current, cols))
+                return path[::-1]
+
+            g_parent = g[p]
+            for n, nr, nc, _ in self._valid_moves(current, cr, cc):
+                if closed[n] == gen:
+                    continue
+                if stamp[n] != gen:
+                    stamp[n] = gen
+                    g[n] = inf
+                # Assume line of sight to the parent; checked on expansion
+                tentative_g = g_parent + hypot(pr - nr, pc - nc)
+                if tentative_g < g[n]:
+                    parent[n] = p
+                    g[n] = tentative_g
+                    heappush(open_set, (tentative_g + heuristic(nr, nc), n))
+
+        self.stats["expansions"] = expansions
+        self.stats["los_checks"] = los_checks
+        return None
@@ -0,0 +1,133 @@
+"""
+Common planner interface and engine registry.
+
+Every planner exposes plan(start, goal), returning the same list of
+(row, col) cells as theta_star (or None), and a stats dict describing the
+work done by its most recent query. Planners that can search towards several
+goals at once also expose plan_any(start, goals); use core.plan_to_any to
+query any planner that way. Planners with expensive per-layout tables build
+them lazily and expose precompute() for callers that can afford to build
+everything up front (the planning service, or the map as a plan worker
+background job).
+"""
+from .bitset import BitsetGrid
+from .cache import CachedPlanner
+from .clearance import ClearanceThetaStar
+from .core import theta_star, theta_star_any
+from .distance_field import get_distance_fields
+from .flat import FlatThetaStar
+from .grid import OccupancyGrid
+from .hierarchical import HierarchicalPlanner
+from .incremental import IncrementalPlanner
+from .jump_point import JumpPointPlanner
+from .lazy_theta import LazyThetaStar
+from .sparse_graph import SparseGraphPlanner
+from .visibility_graph import VisibilityGraphPlanner
+
+
+class ThetaStarPlanner:
+    """Plans every query from scratch with theta_star."""
+
+    def __init__(self, grid, aisle_locs=None):
+        self.grid = grid
+        self.stats = {"expansions": 0}
+
+    def plan(self, start, goal):
+        return theta_star(self.grid, start, goal, stats=self.stats)
+
+    def plan_any(self, start, goals):
+        return theta_star_any(self.grid, start, goals, stats=self.stats)
+
+
+class NumpyThetaStarPlanner(ThetaStarPlanner):
+    """
+    theta_star over an OccupancyGrid, batching line-of-sight checks with NumPy.
+
+    Slower than ThetaStarPlanner on the stock store (p50 0.50 vs 0.33 ms);
+    only the 1000x1000 warehouse layout gains (about 2x).
+    """
+
+    def __init__(self, grid, aisle_locs=None):
+        super().__init__(OccupancyGrid(grid), aisle_locs)
+
+
+class BitsetThetaStarPlanner(ThetaStarPlanner):
+    """
+    theta_star over a BitsetGrid, memoizing line-of-sight across queries.
+
+    Slower than ThetaStarPlanner on the stock store (p50 0.37 vs 0.33 ms);
+    faster on larger layouts, where the cache is hit more often.
+    """
+
+    def __init__(self, grid, aisle_locs=None):
+        super().__init__(BitsetGrid(grid), aisle_locs)
+
+
+class DistanceFieldPlanner:
+    """
+    Answers queries from per-aisle distance fields.
+
+    Each field is built on its first query, so construction is cheap and
+    safe on the UI thread; a field takes about 140 ms at generate_map(100, 2).
+    """
+
+    def __init__(self, grid, aisle_locs):
+        self.fields = get_distance_fields(grid, aisle_locs)
+        self.stats = {"expansions": 0}
+
+    def precompute(self):
+        """Builds every aisle's field now instead of on first use."""
+        self.fields.build_all()
+
+    def plan(self, start, goal):
+        return self.fields.path(start, goal)
+
+    def plan_any(self, start, goals):
+        return self.fields.path_any(start, goals)
+
+    def cost(self, start, goal):
+        """Returns the path cost from start to goal with a single table lookup."""
+        return self.fields.field(goal).cost_from(start)
+
+    def cost_any(self, start, goals):
+        """Returns the path cost from start to the nearest of several goals with a single table lookup."""
+        return self.fields.field_any(goals).cost_from(start)
+
+
+PLANNERS = {
+    "theta_star": ThetaStarPlanner,
+    "theta_star_numpy": NumpyThetaStarPlanner,
+    "theta_star_bitset": BitsetThetaStarPlanner,
+    "theta_star_flat": FlatThetaStar,
+    "theta_star_clearance": ClearanceThetaStar,
+    "distance_field": DistanceFieldPlanner,
+    "incremental": IncrementalPlanner,
+    "visibility_graph": VisibilityGraphPlanner,
+    "hierarchical": HierarchicalPlanner,
+    "jps": JumpPointPlanner,
+    "lazy_theta_star": LazyThetaStar,
+    "csgraph": SparseGraphPlanner,
+}
+
+
+def make_planner(engine, grid, aisle_locs, cached=False):
+    """
+    Creates a planner for the given layout.
+
+    Args:
+        engine (str): One of the keys in PLANNERS.
+        grid (list): 2D list representing the map (0=walkable, 1=obstacle).
+        aisle_locs (dict): Aisle locations as returned by generate_map.
+        cached (bool): Serve repeated queries from the process-wide path cache.
+
+    Returns:
+        A planner object with a plan(start, goal) method.
+    """
+    try:
+        planner_cls = PLANNERS[engine]
+    except KeyError:
+        raise ValueError(f"Unknown path engine '{engine}', expected one of {sorted(PLANNERS)}")
+    planner = planner_cls(grid, aisle_locs)
+    if cached:
+        planner = CachedPlanner(planner, engine, grid)
+    return planner
@@ -0,0 +1,191 @@
+"""
+Visiting order for multi-stop shopping routes.
+
+Aisle-to-aisle travel costs are computed with the active planner only between
+the aisles a route visits, and kept for later routes. Like the legs the cart
+drives, they run between the aisles' goal cells: the cost from aisle A to
+aisle B is the cheapest trip from any goal cell of A to the nearest goal cell
+of B. Ordering a shopping list whose stops are already costed then only
+needs one cost per stop from the cart's position: short lists are solved
+exactly with Held-Karp, longer ones with nearest-neighbour construction
+improved by 2-opt.
+"""
+import math
+from .core import aisle_goals, path_cost, plan_to_any
+
+# Held-Karp is O(2^n * n^2); beyond this many stops 2-opt is used instead
+HELD_KARP_MAX_STOPS = 10
+
+
+def held_karp(costs):
+    """
+    Finds the cheapest open route from node 0 through every other node.
+
+    Args:
+        costs (list): Square matrix of travel costs; node 0 is the start.
+
+    Returns:
+        list: Visiting order of nodes 1..n-1.
+    """
+    n = len(costs) - 1
+    if n <= 0:
+        return []
+
+    full = (1 << n) - 1
+    # best[mask][j]: cheapest cost to visit the stops in mask, ending at stop j
+    best = [[math.inf] * n for _ in range(1 << n)]
+    back = [[-1] * n for _ in range(1 << n)]
+    for j in range(n):
+        best[1 << j][j] = costs[0][j + 1]
+
+    for mask in range(1, full + 1):
+        row = best[mask]
+        for j in range(n):
+            base = row[j]
+            if base == math.inf:
+                continue
+            leg = costs[j + 1]
+            for k in range(n):
+                bit = 1 << k
+                if mask & bit:
+                    continue
+                total = base + leg[k + 1]
+                nxt = mask | bit
+                if total < best[nxt][k]:
+                    best[nxt][k] = total
+                    back[nxt][k] = j
+
+    last = min(range(n), key=lambda j: best[full][j])
+    order = []
+    mask = full
+    while last != -1:
+        order.append(last + 1)
+        prev = back[mask][last]
+        mask &= ~(1 << last)
+        last = prev
+    return order[::-1]
+
+
+def nearest_neighbour_two_opt(costs):
+    """
+    Builds an open route greedily from node 0, then improves it with 2-opt.
+
+    Args:
+        costs (list): Square, symmetric matrix of travel costs; node 0 is the start.
+
+    Returns:
+        list: Visiting order of nodes 1..n-1.
+    """
+    n = len(costs)
+    unvisited = set(range(1, n))
+    route = [0]
+    while unvisited:
+        here = costs[route[-1]]
+        nxt = min(unvisited, key=lambda j: here[j])
+        route.append(nxt)
+        unvisited.remove(nxt)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, n - 1):
+            a = route[i - 1]
+            b = route[i]
+            for j in range(i + 1, n):
+                c = route[j]
+                # The route is open, so reversing up to the last stop has no
+                # closing edge to pay for.
+                if j + 1 < n:
+                    d = route[j + 1]
+                    delta = costs[a][c] + costs[b][d] - costs[a][b] - costs[c][d]
+                else:
+                    delta = costs[a][c] - costs[a][b]
+                if delta < -1e-9:
+                    route[i:j + 1] = route[i:j + 1][::-1]
+                    b = route[i]
+                    improved = True
+    return route[1:]
+
+
+def solve_order(costs):
+    """Returns the visiting order of nodes 1..n-1, exact for short lists."""
+    if len(costs) - 1 <= HELD_KARP_MAX_STOPS:
+        return held_karp(costs)
+    return nearest_neighbour_two_opt(costs)
+
+
+class RoutePlanner:
+    """Orders aisle stops using cached aisle-to-aisle costs."""
+
+    def __init__(self, planner, aisle_locs):
+        self.planner = planner
+        self.goals = {aisle: tuple(aisle_goals(locs)) for aisle, locs in aisle_locs.items()}
+        # {(a, b): cost} with a < b
+        self._pairs = {}
+
+    def _cost(self, start, goals):
+        """Returns the cost from start to the nearest of goals, as plan_to_any would route it."""
+        if start in goals:
+            return 0.0
+        cost_any = getattr(self.planner, "cost_any", None)
+        if cost_any is not None:
+            return cost_any(start, goals)
+        path = plan_to_any(self.planner, start, goals)
+        return path_cost(path) if path else math.inf
+
+    def _aisle_cost(self, a, b):
+        """Returns the cost between the goal cells of two aisles, computed once per pair."""
+        if a == b:
+            return 0.0
+        key = (a, b) if a < b else (b, a)
+        cost = self._pairs.get(key)
+        if cost is None:
+            # The cheapest goal-to-goal trip is the same both ways, so one set
+            # of queries serves both legs
+            cost = min(self._cost(cell, self.goals[key[1]]) for cell in self.goals[key[0]])
+            self._pairs[key] = cost
+        return cost
+
+    def _stops(self, aisles):
+        """Returns the known aisles in aisles as names, without duplicates."""
+        stops = []
+        for aisle in aisles:
+            aisle = str(aisle)
+            if aisle in self.goals and aisle not in stops:
+                stops.append(aisle)
+        return stops
+
+    def aisle_matrix(self, aisles=None):
+        """
+        Returns {aisle: {aisle: cost}} between the goal cells of the given aisles.
+
+        Args:
+            aisles (list): Aisle identifiers; every aisle of the layout if None.
+        """
+        stops = list(self.goals) if aisles is None else self._stops(aisles)
+        return {a: {b: self._aisle_cost(a, b) for b in stops} for a in stops}
+
+    def warm(self, aisles):
+        """Computes the costs between aisles ahead of ordering them (e.g. on a background worker)."""
+        self.aisle_matrix(aisles)
+
+    def order(self, start, aisles):
+        """
+        Returns the aisles in the order the cart should visit them.
+
+        Args:
+            start (tuple): (row, col) cell the cart starts from.
+            aisles (list): Aisle identifiers to visit; duplicates and unknown
+                aisles are dropped.
+
+        Returns:
+            list: The aisles in visiting order.
+        """
+        stops = self._stops(aisles)
+        if len(stops) < 2:
+            return stops
+
+        costs = [[0.0] + [self._cost(start, self.goals[a]) for a in stops]]
+        for i, a in enumerate(stops):
+            costs.append([costs[0][i + 1]] + [self._aisle_cost(a, b) for b in stops])
+        return [stops[i - 1] for i in solve_order(costs)]
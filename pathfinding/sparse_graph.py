@@ -0,0 +1,238 @@
+"""
+Grid shortest paths through scipy.sparse.csgraph.
+
+The layout is compiled once into a CSR adjacency matrix over flat cell
+indices (row * cols + col): straight moves cost 1 and diagonal moves
+sqrt(2). Every query is then a Dijkstra run in C.
+
+A single run settles the whole grid, so the planner is built for batches:
+one run from a start answers every aisle (plan_many), one run from a goal
+answers every start (plan_all_to) and is kept for later queries to that
+goal or goal set. The 8-connected paths go through core.smooth_path.
+"""
+import math
+from collections import OrderedDict
+import threading
+import numpy as np
+from scipy import sparse
+from scipy.sparse import csgraph
+from profiler import profile
+from .core import free_neighbour, smooth_path
+
+# Shortest-path trees kept per goal or goal set; each holds one int32 and
+# one float64 per grid cell
+TREE_CACHE_SIZE = 8
+
+SQRT2 = math.sqrt(2.0)
+
+
+def grid_graph(grid):
+    """
+    Builds the undirected 8-connected adjacency matrix of a grid.
+
+    Args:
+        grid (list): 2D list representing the map (0=walkable, 1=obstacle).
+
+    Returns:
+        scipy.sparse.csr_matrix: (cells x cells) matrix holding each edge once;
+        search it with directed=False.
+    """
+    free = np.asarray(grid) != 1
+    rows, cols = free.shape
+    index = np.arange(rows * cols).reshape(rows, cols)
+
+    sources = []
+    targets = []
+    weights = []
+    # Half of the neighbour offsets; the other half are the same edges reversed
+    for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+        c0, c1 = max(0, -dc), cols - max(0, dc)
+        here = (slice(0, rows - dr), slice(c0, c1))
+        there = (slice(dr, rows), slice(c0 + dc, c1 + dc))
+        linked = free[here] & free[there]
+        if dr and dc:
+            # Both orthogonal cells must be clear so a diagonal never cuts a corner
+            linked &= free[dr:rows, c0:c1] & free[0:rows - dr, c0 + dc:c1 + dc]
+        sources.append(index[here][linked])
+        targets.append(index[there][linked])
+        weights.append(np.full(int(linked.sum()), SQRT2 if dr and dc else 1.0))
+
+    size = rows * cols
+    return sparse.csr_matrix(
+        (np.concatenate(weights), (np.concatenate(sources), np.concatenate(targets))),
+        shape=(size, size),
+    )
+
+
+class SparseGraphPlanner:
+    """Dijkstra over a precompiled CSR grid graph, with batch queries."""
+
+    def __init__(self, grid, aisle_locs=None):
+        self.grid = grid
+        self.rows = len(grid)
+        self.cols = len(grid[0])
+        self.stats = {"expansions": 0}
+        self._trees = OrderedDict()
+        self._lock = threading.Lock()
+        self.build()
+
+    @profile
+    def build(self):
+        """Compiles the grid into its CSR adjacency matrix."""
+        self.graph = grid_graph(self.grid)
+
+    def _index(self, cell):
+        return cell[0] * self.cols + cell[1]
+
+    def _dijkstra(self, sources):
+        """Runs one Dijkstra from a set of cells; returns (costs, predecessors)."""
+        costs, predecessors, _ = csgraph.dijkstra(
+            self.graph, directed=False, indices=[self._index(cell) for cell in sources],
+            return_predecessors=True, min_only=True,
+        )
+        self.stats["expansions"] = int(np.count_nonzero(np.isfinite(costs)))
+        return costs, predecessors
+
+    def _tree(self, goals):
+        """Returns the cached shortest-path tree towards the nearest of goals, built on a miss."""
+        goals = tuple(goals)
+        with self._lock:
+            tree = self._trees.get(goals)
+            if tree is not None:
+                self._trees.move_to_end(goals)
+                self.stats["expansions"] = 0
+                return tree
+        tree = self._dijkstra(goals)
+        with self._lock:
+            self._trees[goals] = tree
+            while len(self._trees) > TREE_CACHE_SIZE:
+                self._trees.popitem(last=False)
+        return tree
+
+    def _walk(self, predecessors, cell):
+        """Follows predecessors from cell to the root of its tree."""
+        cols = self.cols
+        idx = self._index(cell)
+        path = [cell]
+        while True:
+            idx = predecessors[idx]
+            if idx < 0:
+                return path
+            path.append(divmod(int(idx), cols))
+
+    def _entry(self, start, toward):
+        """Returns the free cell a path from start begins its search at, or None."""
+        r, c = start
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            return None
+        if self.grid[r][c] == 1:
+            return free_neighbour(self.grid, start, toward)
+        return start
+
+    def _finish(self, start, entry, cells):
+        """Prepends a blocked start and shortens an 8-connected path."""
+        if entry != start:
+            cells.insert(0, start)
+        self.stats["los_checks"] = max(len(cells) - 2, 0)
+        return smooth_path(self.grid, cells)
+
+    def _path_to_root(self, start, tree, toward):
+        """Returns the smoothed path from start to the root of a goal tree, or None."""
+        entry = self._entry(start, toward)
+        if entry is None:
+            return None
+        costs, predecessors = tree
+        if not np.isfinite(costs[self._index(entry)]):
+            return None
+        return self._finish(start, entry, self._walk(predecessors, entry))
+
+    def plan(self, start, goal):
+        """
+        Returns an any-angle path from start to goal.
+
+        The shortest-path tree towards goal is kept, so later queries to the
+        same goal only walk it.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        if self.grid[goal[0]][goal[1]] == 1:
+            return None
+        return self._path_to_root(start, self._tree((goal,)), goal)
+
+    def plan_any(self, start, goals):
+        """
+        Returns the path to the cheapest of several goals with one multi-source run.
+
+        The tree is kept like plan's, so later queries to the same goal set
+        only walk it.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are skipped.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        goals = [goal for goal in goals if self.grid[goal[0]][goal[1]] != 1]
+        if not goals:
+            return None
+        return self._path_to_root(start, self._tree(goals), goals[0])
+
+    def plan_all_to(self, starts, goal):
+        """
+        Returns the paths from many starts to one goal with a single run.
+
+        Args:
+            starts (list): (row, col) starting cells.
+            goal (tuple): (row, col) goal cell.
+
+        Returns:
+            dict: {start: path or None}.
+        """
+        if self.grid[goal[0]][goal[1]] == 1:
+            return {start: None for start in starts}
+        tree = self._tree((goal,))
+        return {start: self._path_to_root(start, tree, goal) for start in starts}
+
+    def plan_many(self, start, goals):
+        """
+        Returns the paths from one start to many goals with a single run.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells, e.g. every aisle goal.
+
+        Returns:
+            dict: {goal: path or None}.
+        """
+        entry = self._entry(start, goals[0]) if goals else None
+        if entry is None:
+            return {goal: None for goal in goals}
+        costs, predecessors = self._dijkstra([entry])
+        paths = {}
+        for goal in goals:
+            if self.grid[goal[0]][goal[1]] == 1 or not np.isfinite(costs[self._index(goal)]):
+                paths[goal] = None
+                continue
+            cells = self._walk(predecessors, goal)
+            cells.reverse()
+            paths[goal] = self._finish(start, entry, cells)
+        return paths
+
+    def distance_fields(self, goals):
+        """
+        Returns the 8-connected travel cost from every cell to each goal.
+
+        Args:
+            goals (list): (row, col) goal cells.
+
+        Returns:
+            numpy.ndarray: (len(goals), rows, cols) costs; inf where unreachable.
+        """
+        costs = csgraph.dijkstra(self.graph, directed=False, indices=[self._index(goal) for goal in goals])
+        return costs.reshape(len(goals), self.rows, self.cols)
@@ -0,0 +1,234 @@
+"""
+Visibility-graph planner over the convex corners of the shelves.
+
+Shelves are axis-aligned blocks of cells, so a shortest any-angle path only
+bends next to their convex corners. The graph of mutually visible corner cells
+is built once per layout; a query connects the start and goal to it and runs
+A* over a few dozen nodes instead of searching the grid.
+"""
+import heapq
+import math
+from profiler import profile
+from .core import free_neighbour, theta_star_any
+from .grid import OccupancyGrid
+
+DIAGONALS = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def corner_cells(grid):
+    """
+    Returns the free cells wrapped around every convex obstacle corner.
+
+    An occupied cell is a convex corner in direction (dr, dc) when the two
+    orthogonal cells and the diagonal cell on that side are free. Because
+    line_of_sight refuses to cut corners, a tight path turns on any of those
+    three cells, so all of them become graph nodes.
+    """
+    rows, cols = len(grid), len(grid[0])
+    corners = set()
+    for r in range(rows):
+        row = grid[r]
+        for c in range(cols):
+            if row[c] == 0:
+                continue
+            for dr, dc in DIAGONALS:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+                if grid[nr][c] == 0 and row[nc] == 0 and grid[nr][nc] == 0:
+                    corners.update(((nr, c), (r, nc), (nr, nc)))
+    return sorted(corners)
+
+
+class VisibilityGraphPlanner:
+    """Plans by A* over a precomputed visibility graph of shelf corners."""
+
+    def __init__(self, grid, aisle_locs=None):
+        self.grid = grid
+        self.occupancy = grid if isinstance(grid, OccupancyGrid) else OccupancyGrid(grid)
+        self.stats = {"expansions": 0}
+        self.build()
+
+    @profile
+    def build(self):
+        """
+        Finds the corner nodes and links every pair with line-of-sight.
+
+        Pairs are tested one row (node i against every node j > i) at a time,
+        so peak memory stays proportional to the node count rather than to
+        the number of pairs. line_of_sight is not symmetric on a few corner
+        pairs, so each row checks both directions in the same batch and adds
+        each direction's edge on its own result.
+        """
+        self.nodes = nodes = corner_cells(self.grid)
+        count = len(nodes)
+        edges = self.edges = [[] for _ in range(count)]
+        occupancy = self.occupancy
+
+        for i in range(count - 1):
+            a = nodes[i]
+            later = nodes[i + 1:]
+            width = len(later)
+            visible = occupancy.batch_line_of_sight_pairs(
+                [a] * width + later, later + [a] * width
+            ).tolist()
+            for k, b in enumerate(later):
+                forward = visible[k]
+                backward = visible[width + k]
+                if not (forward or backward):
+                    continue
+                j = i + 1 + k
+                cost = math.hypot(a[0] - b[0], a[1] - b[1])
+                if forward:
+                    edges[i].append((j, cost))
+                if backward:
+                    edges[j].append((i, cost))
+
+    def plan(self, start, goal):
+        """
+        Returns an any-angle path from start to goal through the corner graph.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goal (tuple): (row, col) goal coordinates.
+
+        Returns:
+            list: A list of (row, col) tuples representing the path, or None if no path found.
+        """
+        return self.plan_any(start, [goal])
+
+    def plan_any(self, start, goals):
+        """
+        Returns the path to the cheapest of several goals with a single search.
+
+        Args:
+            start (tuple): (row, col) starting coordinates.
+            goals (list): (row, col) goal cells; blocked goals are never reached.
+
+        Returns:
+            list: The path to the cheapest goal (its last cell), or None if none is reachable.
+        """
+        grid = self.grid
+        rows, cols = len(grid), len(grid[0])
+        if not (0 <= start[0] < rows and 0 <= start[1] < cols):
+            return None
+        goals = [goal for goal in goals if grid[goal[0]][goal[1]] != 1]
+        if not goals:
+            return None
+
+        search_start = start
+        if grid[start[0]][start[1]] == 1:
+            toward = min(goals, key=lambda goal: math.hypot(start[0] - goal[0], start[1] - goal[1]))
+            search_start = free_neighbour(grid, start, toward)
+            if search_start is None:
+                return None
+
+        path = self._search(search_start, goals)
+        if path is None:
+            # Corner visibility is not complete on every grid; fall back to
+            # a full search rather than report a false "no path".
+            path = theta_star_any(grid, search_start, goals, stats=self.stats)
+            if path is None:
+                return None
+        if search_start != start:
+            path.insert(0, start)
+        return path
+
+    def _search(self, start, goals):
+        """A* from start to the nearest goal over the corner nodes."""
+        occupancy = self.occupancy
+        self.stats["los_checks"] = len(goals)
+        if len(goals) == 1 and occupancy.line_of_sight(start, goals[0]):
+            self.stats["expansions"] = 0
+            return [start, goals[0]]
+
+        nodes = self.nodes
+        count = len(nodes)
+        start_id = count
+        # Goal k is node count + 1 + k
+        goal_base = count + 1
+        if count == 0 and len(goals) == 1:
+            return None
+
+        from_start = occupancy.batch_line_of_sight(start, nodes).tolist()
+        if len(goals) == 1:
+            # Already tested above
+            start_to_goal = [False]
+        else:
+            start_to_goal = occupancy.batch_line_of_sight(start, goals).tolist()
+        # to_goals[i]: (goal id, cost) of every goal visible from corner node i
+        to_goals = [[] for _ in range(count)]
+        for k, goal in enumerate(goals):
+            visible = occupancy.batch_line_of_sight_pairs(nodes, [goal] * count).tolist() if count else []
+            for i in range(count):
+                if visible[i]:
+                    p = nodes[i]
+                    to_goals[i].append((goal_base + k, math.hypot(p[0] - goal[0], p[1] - goal[1])))
+        self.stats["los_checks"] += count + len(goals) * count
+
+        def point(node_id):
+            if node_id == start_id:
+                return start
+            if node_id >= goal_base:
+                return goals[node_id - goal_base]
+            return nodes[node_id]
+
+        if len(goals) == 1:
+            (gr, gc), = goals
+
+            def heuristic(node_id):
+                p = point(node_id)
+                return math.hypot(p[0] - gr, p[1] - gc)
+        else:
+            def heuristic(node_id):
+                p = point(node_id)
+                return min([math.hypot(p[0] - gr, p[1] - gc) for gr, gc in goals])
+
+        g_score = {start_id: 0.0}
+        parent = {start_id: start_id}
+        open_set = [(heuristic(start_id), start_id)]
+        closed = set()
+        expansions = 0
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+            if current in closed:
+                continue
+            closed.add(current)
+            expansions += 1
+
+            if current >= goal_base:
+                self.stats["expansions"] = expansions
+                path = [point(current)]
+                while current != start_id:
+                    current = parent[current]
+                    cell = point(current)
+                    # Start or goal may coincide with a corner node
+                    if cell != path[-1]:
+                        path.append(cell)
+                return path[::-1]
+
+            if current == start_id:
+                successors = [
+                    (j, math.hypot(nodes[j][0] - start[0], nodes[j][1] - start[1]))
+                    for j in range(count) if from_start[j]
+                ]
+                successors += [
+                    (goal_base + k, math.hypot(goal[0] - start[0], goal[1] - start[1]))
+                    for k, goal in enumerate(goals) if start_to_goal[k]
+                ]
+            else:
+                successors = self.edges[current]
+                if to_goals[current]:
+                    successors = successors + to_goals[current]
+
+            base = g_score[current]
+            for nxt, cost in successors:
+                tentative_g = base + cost
+                if tentative_g < g_score.get(nxt, math.inf):
+                    g_score[nxt] = tentative_g
+                    parent[nxt] = current
+                    heapq.heappush(open_set, (tentative_g + heuristic(nxt), nxt))
+
+        self.stats["expansions"] = expansions
+        return None
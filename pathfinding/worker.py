@@ -0,0 +1,133 @@
+"""
+Background planning worker.
+
+Planning jobs run on a single daemon thread so a slow search never blocks the
+Tk main loop. Only the newest job matters: submitting a job supersedes any job
+still waiting, and results of superseded or cancelled jobs are dropped instead
+of being delivered. The UI collects finished results by calling deliver() from
+its own thread (e.g. in an after() loop), so callbacks always run on the
+thread that owns the widgets.
+
+Warm-up work (e.g. building distance fields) goes through submit_background():
+those jobs run in submission order ahead of any waiting plan job, and neither
+submit() nor cancel() drops them.
+"""
+import threading
+import traceback
+from collections import deque
+from profiler import count
+
+
+class PlanWorker:
+    """Runs planning jobs on a background thread, keeping only the newest plus every background job."""
+
+    def __init__(self, name="path-planner"):
+        self._cond = threading.Condition()
+        self._ticket = 0
+        self._pending = None
+        self._running = None
+        self._background = deque()
+        self._done = deque()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, job, on_result):
+        """
+        Queues a job, superseding any job that has not finished yet.
+
+        Args:
+            job (callable): Called with no arguments on the worker thread.
+            on_result (callable): Called with the job's return value from deliver().
+
+        Returns:
+            int: Ticket identifying the job.
+        """
+        with self._cond:
+            if self._pending is not None or self._running is not None:
+                count("plan_jobs_superseded")
+            self._ticket += 1
+            self._pending = (self._ticket, job, on_result)
+            self._cond.notify()
+            return self._ticket
+
+    def submit_background(self, job):
+        """
+        Queues a job that later submits and cancels cannot drop.
+
+        Args:
+            job (callable): Called with no arguments on the worker thread; its
+                return value is discarded.
+        """
+        with self._cond:
+            self._background.append(job)
+            self._cond.notify()
+
+    def cancel(self):
+        """Drops the waiting job and discards the result of the running one."""
+        with self._cond:
+            if self._pending is not None or self._running is not None:
+                count("plan_jobs_cancelled")
+            self._ticket += 1
+            self._pending = None
+            self._done.clear()
+
+    def outstanding(self):
+        """Returns True while a plan job is waiting, running or awaiting delivery."""
+        with self._cond:
+            return self._pending is not None or self._running is not None or bool(self._done)
+
+    def deliver(self):
+        """
+        Runs the callbacks of finished, non-superseded jobs on the calling thread.
+
+        Returns:
+            int: Number of results delivered.
+        """
+        with self._cond:
+            finished = list(self._done)
+            self._done.clear()
+            current = self._ticket
+
+        delivered = 0
+        for ticket, on_result, result in finished:
+            if ticket == current:
+                on_result(result)
+                delivered += 1
+        return delivered
+
+    def stop(self):
+        """Stops the worker thread once its current job (if any) returns."""
+        with self._cond:
+            self._stopped = True
+            self._pending = None
+            self._background.clear()
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._background and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                if self._background:
+                    # Background jobs have no ticket and deliver nothing
+                    ticket, job, on_result = None, self._background.popleft(), None
+                else:
+                    ticket, job, on_result = self._pending
+                    self._pending = None
+                    self._running = ticket
+
+            try:
+                result = job()
+            except Exception:
+                traceback.print_exc()
+                result = None
+            if ticket is None:
+                continue
+
+            with self._cond:
+                self._running = None
+                if ticket == self._ticket:
+                    self._done.append((ticket, on_result, result))
@@ -0,0 +1,199 @@
+"""
+Standalone route-planning service for a fleet of carts.
+
+The store layout is generated once and the planner's precomputation (e.g.
+the per-aisle distance fields and the aisle-to-aisle cost matrix) is built
+before the worker pool starts, so forked workers share it copy-on-write
+instead of rebuilding it. On platforms that spawn workers, each worker
+builds it once in its initializer.
+
+Clients connect over TCP and send one JSON object per line:
+
+    {"id": 1, "routes": [{"start": [2, 2], "aisles": ["3", "7"]},
+                         {"start": [20, 5], "goal": [6, 11]}]}
+
+Each route is either a shopping list (aisles visited in an optimized order,
+each leg ending at the aisle's cheapest goal cell) or a single goal cell.
+The routes of a batch are planned in parallel and answered on one line:
+
+    {"id": 1, "routes": [{"order": ["7", "3"], "legs": [[[2, 2], ...], ...]},
+                         {"order": [], "legs": [[[20, 5], ...]]}]}
+
+A leg is null when no path exists; a malformed route gets {"error": "..."}.
+
+Usage:
+    python planning_service.py --port 5006 --workers 4
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socketserver
+import time
+from map import generate_map, aisle_goals, AISLE_ROWS, PATH_ENGINE
+from pathfinding import make_planner, plan_to_any, RoutePlanner
+from profiler import count
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 5006
+SERVICE_AISLES = 16
+# Routes handed to a worker at a time; larger chunks cut IPC overhead
+ROUTE_CHUNK_SIZE = 4
+MAX_REQUEST_BYTES = 1 << 20
+
+# Per-process planning state, set by load_layout
+_layout = None
+
+
+def load_layout(num_aisles, num_rows, engine):
+    """
+    Generates the layout and builds the planners for this process (once).
+
+    Args:
+        num_aisles (int): Number of aisles, as for generate_map.
+        num_rows (int): Number of shelf rows, as for generate_map.
+        engine (str): Path engine name (see pathfinding.PLANNERS).
+    """
+    global _layout
+    if _layout is not None:
+        return
+    grid, aisle_locs, width, height = generate_map(num_aisles, num_rows)
+    planner = make_planner(engine, grid, aisle_locs)
+    precompute = getattr(planner, "precompute", None)
+    if precompute is not None:
+        precompute()
+    # Aisle-to-aisle costs are filled in by the routes that need them
+    route_planner = RoutePlanner(planner, aisle_locs)
+    _layout = {
+        "grid": grid,
+        "aisle_locs": aisle_locs,
+        "width": width,
+        "height": height,
+        "planner": planner,
+        "route_planner": route_planner,
+    }
+
+
+def plan_route(route):
+    """
+    Plans one route request in the current process.
+
+    Args:
+        route (dict): {"start": [row, col]} plus either "aisles" (list of
+            known aisle names) or "goal" ([row, col]).
+
+    Returns:
+        dict: {"order": [...], "legs": [path, ...]} or {"error": message}.
+    """
+    try:
+        start = tuple(int(v) for v in route["start"])
+        if len(start) != 2:
+            raise ValueError("start must be [row, col]")
+        grid = _layout["grid"]
+        if not (0 <= start[0] < len(grid) and 0 <= start[1] < len(grid[0])):
+            raise ValueError(f"start {list(start)} is outside the layout")
+        planner = _layout["planner"]
+
+        if "goal" in route:
+            goal = tuple(int(v) for v in route["goal"])
+            if len(goal) != 2 or not (0 <= goal[0] < len(grid) and 0 <= goal[1] < len(grid[0])):
+                raise ValueError(f"goal {route['goal']} is outside the layout")
+            path = planner.plan(start, goal)
+            return {"order": [], "legs": [path]}
+
+        aisle_locs = _layout["aisle_locs"]
+        aisles = route["aisles"]
+        if not isinstance(aisles, list):
+            raise TypeError("aisles must be a list of aisle names")
+        for aisle in aisles:
+            if isinstance(aisle, bool) or not isinstance(aisle, (str, int)):
+                raise TypeError(f"aisle {aisle!r} is not an aisle name")
+            if str(aisle) not in aisle_locs:
+                raise ValueError(f"unknown aisle {aisle!r}")
+        order = _layout["route_planner"].order(start, aisles)
+        legs = []
+        for aisle in order:
+            path = plan_to_any(planner, start, aisle_goals(aisle_locs.get(aisle)))
+            legs.append(path)
+            if path:
+                start = path[-1]
+        return {"order": order, "legs": legs}
+    except (KeyError, TypeError, ValueError) as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+class RouteRequestHandler(socketserver.StreamRequestHandler):
+    """Answers newline-delimited JSON batches on one client connection."""
+
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            if not line:
+                return
+            request = None
+            try:
+                request = json.loads(line)
+                routes = request["routes"]
+                if not isinstance(routes, list):
+                    raise TypeError("routes must be a list")
+            except (ValueError, KeyError, TypeError) as e:
+                request_id = request.get("id") if isinstance(request, dict) else None
+                self._send({"id": request_id, "error": f"bad request: {e}"})
+                continue
+
+            started = time.perf_counter()
+            results = self.server.pool.map(plan_route, routes, ROUTE_CHUNK_SIZE) if routes else []
+            count("service_batches")
+            count("service_routes", len(routes))
+            self._send({
+                "id": request.get("id"),
+                "routes": results,
+                "ms": round((time.perf_counter() - started) * 1000, 3),
+            })
+
+    def _send(self, reply):
+        self.wfile.write(json.dumps(reply, separators=(",", ":")).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class PlanningService(socketserver.ThreadingTCPServer):
+    """TCP server that fans route batches out to a process pool."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, workers, num_aisles=SERVICE_AISLES, num_rows=AISLE_ROWS, engine=PATH_ENGINE):
+        # Build in the parent first so forked workers inherit the precomputation
+        load_layout(num_aisles, num_rows, engine)
+        self.pool = multiprocessing.Pool(workers, initializer=load_layout,
+                                         initargs=(num_aisles, num_rows, engine))
+        super().__init__(address, RouteRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.close()
+        self.pool.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve batched route requests over a local socket.")
+    parser.add_argument("--host", default=SERVICE_HOST, help="address to listen on")
+    parser.add_argument("--port", type=int, default=SERVICE_PORT, help="TCP port")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="planning processes")
+    parser.add_argument("--aisles", type=int, default=SERVICE_AISLES, help="aisles in the layout")
+    parser.add_argument("--rows", type=int, default=AISLE_ROWS, help="shelf rows in the layout")
+    parser.add_argument("--engine", default=PATH_ENGINE, help="path engine")
+    args = parser.parse_args()
+
+    with PlanningService((args.host, args.port), args.workers, args.aisles, args.rows, args.engine) as server:
+        print(f"Planning service on {args.host}:{args.port} "
+              f"({args.workers} workers, {args.engine}, "
+              f"{_layout['width']}x{_layout['height']} layout with {len(_layout['aisle_locs'])} aisles)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Constant-velocity pose filter for the cart's drawn position.
+
+Pose messages arrive at the sensor's send rate, late or not at all, while
+the map redraws every DRAW_INTERVAL_MS. A Kalman filter per axis (x, y and
+theta) tracks position and velocity under a constant-velocity model with
+random acceleration: each measurement corrects both, weighted by how long
+it has been since the last one, and between measurements the pose is
+extrapolated along the velocity to the render time. Unlike fixed
+alpha-beta gains this stays stable whether poses arrive at 2 Hz or 20 Hz.
+Prediction stops MAX_PREDICTION_S after the last measurement so the cart
+does not drift off when packets stop.
+"""
+import math
+
+# Random acceleration (spectral density, units^2 / s^3) the model allows for
+POSITION_ACCEL_NOISE = 4.0
+THETA_ACCEL_NOISE = 2.0
+# Measurement noise (standard deviation); includes the error from arrival jitter
+POSITION_NOISE = 0.08
+THETA_NOISE = 0.05
+# Fastest turn the cart makes (rad/s). Wrapped headings alias: a spin of 2*pi per
+# packet fits the measurements as well as standing still, so the rate is capped.
+MAX_TURN_RATE = math.pi
+# Longest extrapolation past the last measurement
+MAX_PREDICTION_S = 0.5
+# Gaps longer than this (e.g. the cart was off) restart the filter at the measurement
+MAX_GAP_S = 2.0
+
+
+class _Axis:
+    """Position and velocity estimate of one axis with its 2x2 covariance."""
+
+    __slots__ = ("value", "rate", "p00", "p01", "p11", "accel_noise", "variance", "wrap", "max_rate")
+
+    def __init__(self, value, accel_noise, noise, wrap=False, max_rate=math.inf):
+        self.value = value
+        self.rate = 0.0
+        self.accel_noise = accel_noise
+        self.variance = noise * noise
+        self.wrap = wrap
+        self.max_rate = max_rate
+        # Unknown velocity at the start; the first measurements settle it
+        self.p00 = self.variance
+        self.p01 = 0.0
+        self.p11 = 1.0
+
+    def update(self, measured, dt):
+        """Predicts dt ahead, then corrects with a measurement."""
+        q = self.accel_noise
+        # P = F P F' + Q for F = [[1, dt], [0, 1]]
+        p00 = self.p00 + dt * (2 * self.p01 + dt * self.p11) + q * dt ** 3 / 3
+        p01 = self.p01 + dt * self.p11 + q * dt ** 2 / 2
+        p11 = self.p11 + q * dt
+        value = self.value + self.rate * dt
+
+        residual = measured - value
+        if self.wrap:
+            residual = (residual + math.pi) % (2 * math.pi) - math.pi
+        s = p00 + self.variance
+        k0 = p00 / s
+        k1 = p01 / s
+        self.value = value + k0 * residual
+        self.rate = max(-self.max_rate, min(self.rate + k1 * residual, self.max_rate))
+        self.p00 = (1 - k0) * p00
+        self.p01 = (1 - k0) * p01
+        self.p11 = p11 - k1 * p01
+
+
+class PoseFilter:
+    """Timestamped constant-velocity Kalman filter over (x, y, theta); theta residuals wrap at pi."""
+
+    def __init__(self, max_prediction_s=MAX_PREDICTION_S):
+        self.max_prediction_s = max_prediction_s
+        self.axes = None
+        self.stamp = None
+        self.stats = {"updates": 0, "resets": 0}
+
+    def reset(self, x, y, theta, t):
+        """Restarts the filter at a pose with unknown velocity."""
+        self.axes = (
+            _Axis(x, POSITION_ACCEL_NOISE, POSITION_NOISE),
+            _Axis(y, POSITION_ACCEL_NOISE, POSITION_NOISE),
+            _Axis(theta, THETA_ACCEL_NOISE, THETA_NOISE, wrap=True, max_rate=MAX_TURN_RATE),
+        )
+        self.stamp = t
+        self.stats["resets"] += 1
+
+    def update(self, x, y, theta, t):
+        """
+        Corrects the estimate with a pose measured at time t (seconds, monotonic).
+
+        Measurements not newer than the last one are ignored.
+        """
+        if self.axes is None or t - self.stamp > MAX_GAP_S:
+            self.reset(x, y, theta, t)
+            return
+        dt = t - self.stamp
+        if dt <= 0:
+            return
+        for axis, measured in zip(self.axes, (x, y, theta)):
+            axis.update(measured, dt)
+        self.stamp = t
+        self.stats["updates"] += 1
+
+    def predict(self, t):
+        """
+        Returns the (x, y, theta) expected at time t, or None before the first measurement.
+
+        Extrapolates at most max_prediction_s past the last measurement.
+        """
+        if self.axes is None:
+            return None
+        dt = min(max(t - self.stamp, 0.0), self.max_prediction_s)
+        return tuple(axis.value + axis.rate * dt for axis in self.axes)
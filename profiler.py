@@ -15,7 +15,10 @@ class Profiler:
     def __init__(self, log_file="profiling_results.txt"):
         self.log_file = Path(log_file)
         self.stats = defaultdict(lambda: {"count": 0, "total": 0.0, "min": float('inf'), "max": 0.0})
+        self.counters = defaultdict(int)
         self.lock = threading.Lock()
+        # Benchmarks switch this off so timed code skips the per-call log write
+        self.enabled = True
         # Write header
         with open(self.log_file, 'w') as f:
             f.write("=" * 80 + "\n")
@@ -26,6 +29,8 @@ class Profiler:
         """Decorator to profile a function's execution time."""
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
+            if not self.enabled:
+                return func(*args, **kwargs)
             start = time.perf_counter()
             result = func(*args, **kwargs)
             elapsed = (time.perf_counter() - start) * 1000  # Convert to milliseconds
@@ -44,6 +49,11 @@ class Profiler:
             return result
         return wrapper
     
+    def increment(self, name, amount=1):
+        """Adds to a named event counter (e.g. cache hits)."""
+        with self.lock:
+            self.counters[name] += amount
+
     def profile_context(self, name):
         """Context manager to profile a code block."""
         return _ProfileContext(self, name)
@@ -72,6 +82,12 @@ class Profiler:
             avg = stats["total"] / stats["count"]
             summary += (f"{func_name:<30} {stats['count']:<8} {stats['total']:<12.3f} "
                        f"{avg:<12.3f} {stats['min']:<12.3f} {stats['max']:<12.3f}\n")
+
+        if self.counters:
+            summary += "\n" + f"{'Counter':<30} {'Value':<12}\n"
+            summary += "-" * 80 + "\n"
+            for name, value in sorted(self.counters.items()):
+                summary += f"{name:<30} {value:<12}\n"
         
         print(summary)
         with open(self.log_file, 'a') as f:
@@ -81,6 +97,7 @@ class Profiler:
         """Clear all profiling data."""
         with self.lock:
             self.stats.clear()
+            self.counters.clear()
 
 
 class _ProfileContext:
@@ -115,6 +132,14 @@ def profile(func):
     """Convenience decorator using global profiler."""
     return _profiler.profile_function(func)
 
+def set_enabled(enabled):
+    """Turns per-call timing on or off for every @profile function (counters keep counting)."""
+    _profiler.enabled = enabled
+
+def count(name, amount=1):
+    """Convenience counter using global profiler."""
+    _profiler.increment(name, amount)
+
 @functools.lru_cache(maxsize=1)
 def get_profiler():
     """Get the global profiler instance."""
@@ -29,13 +29,17 @@ def main():
     print("\nStarting GUI with profiling enabled...")
     print("Profiling data will be logged to: profiling_results.txt")
     print("\nKey functions being monitored:")
-    print("  - theta_star() : Pathfinding algorithm")
+    print("  - build() : Distance field precomputation (default distance_field engine)")
+    print("  - theta_star_any() : Theta* search (theta_star engines)")
+    print("  - plan_any() / plan() : Flat, lazy and JPS engine searches")
+    print("  - draw_static_layer() / sync() : Shelf tile drawing")
     print("  - draw_robot() : Robot rendering")
-    print("  - draw_path() : Path rendering")
+    print("  - draw_path() / draw_path_head() : Path rendering")
     print("  - update_visuals() : Visual update loop")
     print("  - poll_position_update() : Position polling loop")
-    print("  - draw_grid_shelves : Initial grid drawing")
-    print("  - draw_aisle_labels : Aisle label rendering")
+    print("\nCounters: path_cache_hit / path_cache_miss (shared path cache),")
+    print("  plan_jobs_superseded / plan_jobs_cancelled (planner worker),")
+    print("  distance_field_evicted, render_frames / render_sleeps")
     print("\nClose the window when done to see the profiling summary.\n")
 
     root = tk.Tk()
@@ -0,0 +1,297 @@
+"""
+Drawing backends for the store map.
+
+MapView draws through a small canvas-like interface, so the same drawing and
+change-detection code can target:
+
+- CanvasRenderer: a tk.Canvas, as shown on the cart.
+- RecordingRenderer: no drawing at all; keeps the item list and counts
+  every call, for benchmarks and tests without a display.
+- RasterRenderer: a RecordingRenderer that can also rasterize the current
+  view into a NumPy RGB frame.
+
+A renderer provides, with coordinates in map pixels:
+
+- create_rectangle / create_oval (x0, y0, x1, y1), create_polygon /
+  create_line (*points) and create_text (x, y), each returning an item id;
+- coords(item, *points) to move an item and itemconfigure(item, **options)
+  to change its options (e.g. state="hidden");
+- delete(item), and tag_lower(tag_or_id) to move matching items to the
+  bottom of the stacking order (a no-op if none match);
+- set_extent(width, height) for the size of the whole map and set_view(x, y)
+  to scroll the view's top-left corner to map pixel (x, y).
+
+Item ids are ints and options follow tk.Canvas (fill, outline, width,
+state, tags, text, font).
+"""
+import numpy as np
+
+# Colours the map uses by name; anything else is given as #rrggbb
+NAMED_COLOURS = {
+    "white": (255, 255, 255),
+    "black": (0, 0, 0),
+}
+BACKGROUND = (255, 255, 255)
+
+
+class CanvasRenderer:
+    """Draws on a tk.Canvas whose scrollregion covers the whole map."""
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.width = 0
+        self.height = 0
+
+    def create_rectangle(self, x0, y0, x1, y1, **options):
+        return self.canvas.create_rectangle(x0, y0, x1, y1, **options)
+
+    def create_oval(self, x0, y0, x1, y1, **options):
+        return self.canvas.create_oval(x0, y0, x1, y1, **options)
+
+    def create_polygon(self, *points, **options):
+        return self.canvas.create_polygon(*points, **options)
+
+    def create_line(self, *points, **options):
+        return self.canvas.create_line(*points, **options)
+
+    def create_text(self, x, y, **options):
+        return self.canvas.create_text(x, y, **options)
+
+    def coords(self, item, *points):
+        self.canvas.coords(item, *points)
+
+    def itemconfigure(self, item, **options):
+        self.canvas.itemconfigure(item, **options)
+
+    def delete(self, item):
+        self.canvas.delete(item)
+
+    def tag_lower(self, tag_or_id):
+        self.canvas.tag_lower(tag_or_id)
+
+    def set_extent(self, width, height):
+        self.width = width
+        self.height = height
+        self.canvas.configure(scrollregion=(0, 0, width, height))
+
+    def set_view(self, x, y):
+        if self.width > 0 and self.height > 0:
+            self.canvas.xview_moveto(x / self.width)
+            self.canvas.yview_moveto(y / self.height)
+
+
+class RecordingRenderer:
+    """
+    Keeps the item list a canvas would hold and counts calls, without drawing.
+
+    items maps id -> {"kind", "coords", "options", "tags"} in stacking order
+    (first is bottom); stats counts each kind of call.
+    """
+
+    def __init__(self):
+        self.items = {}
+        self.width = 0
+        self.height = 0
+        self.view = (0.0, 0.0)
+        self.stats = {"created": 0, "coords": 0, "configured": 0, "deleted": 0, "lowered": 0, "views": 0}
+        self._next_id = 1
+
+    def _create(self, kind, coords, options):
+        tags = options.pop("tags", ())
+        if isinstance(tags, str):
+            tags = (tags,)
+        item = self._next_id
+        self._next_id += 1
+        self.items[item] = {"kind": kind, "coords": list(coords), "options": options, "tags": tuple(tags)}
+        self.stats["created"] += 1
+        return item
+
+    def create_rectangle(self, x0, y0, x1, y1, **options):
+        return self._create("rectangle", (x0, y0, x1, y1), options)
+
+    def create_oval(self, x0, y0, x1, y1, **options):
+        return self._create("oval", (x0, y0, x1, y1), options)
+
+    def create_polygon(self, *points, **options):
+        return self._create("polygon", points, options)
+
+    def create_line(self, *points, **options):
+        return self._create("line", points, options)
+
+    def create_text(self, x, y, **options):
+        return self._create("text", (x, y), options)
+
+    def coords(self, item, *points):
+        self.items[item]["coords"] = list(points)
+        self.stats["coords"] += 1
+
+    def itemconfigure(self, item, **options):
+        self.items[item]["options"].update(options)
+        self.stats["configured"] += 1
+
+    def delete(self, item):
+        if self.items.pop(item, None) is not None:
+            self.stats["deleted"] += 1
+
+    def tag_lower(self, tag_or_id):
+        if isinstance(tag_or_id, int):
+            lowered = [tag_or_id] if tag_or_id in self.items else []
+        else:
+            lowered = [item for item, entry in self.items.items() if tag_or_id in entry["tags"]]
+        if not lowered:
+            return
+        rest = {item: entry for item, entry in self.items.items() if item not in set(lowered)}
+        self.items = {**{item: self.items[item] for item in lowered}, **rest}
+        self.stats["lowered"] += 1
+
+    def set_extent(self, width, height):
+        self.width = width
+        self.height = height
+
+    def set_view(self, x, y):
+        self.view = (x, y)
+        self.stats["views"] += 1
+
+    def shown(self):
+        """Returns the ids of items that are not hidden, bottom first."""
+        return [item for item, entry in self.items.items() if entry["options"].get("state") != "hidden"]
+
+
+def parse_colour(colour):
+    """Returns an (r, g, b) tuple for "#rrggbb" or a NAMED_COLOURS name, or None for "" (no colour)."""
+    if not colour:
+        return None
+    if colour.startswith("#") and len(colour) == 7:
+        return tuple(int(colour[i:i + 2], 16) for i in (1, 3, 5))
+    return NAMED_COLOURS.get(colour, (128, 128, 128))
+
+
+class RasterRenderer(RecordingRenderer):
+    """
+    RecordingRenderer that rasterizes the current view into a NumPy frame.
+
+    Rectangles, ovals, polygons and lines are filled per pixel centre;
+    outlines are drawn for rectangles and ovals. Text has no glyphs here and
+    is skipped. Only items whose bounding box meets the view are touched.
+    """
+
+    def __init__(self, view_width, view_height):
+        super().__init__()
+        self.view_width = view_width
+        self.view_height = view_height
+        self.frame = np.empty((view_height, view_width, 3), dtype=np.uint8)
+
+    def render(self):
+        """
+        Draws every shown item that meets the view, bottom first.
+
+        Returns:
+            numpy.ndarray: (view_height, view_width, 3) uint8 RGB frame.
+        """
+        frame = self.frame
+        frame[:] = BACKGROUND
+        vx, vy = self.view
+        drawn = 0
+        for item in self.shown():
+            entry = self.items[item]
+            kind = entry["kind"]
+            if kind == "text":
+                continue
+            coords = np.asarray(entry["coords"], dtype=float).reshape(-1, 2) - (vx, vy)
+            options = entry["options"]
+            fill = parse_colour(options.get("fill", "" if kind != "line" else "black"))
+            if kind == "line":
+                # Each segment only touches its own bounding box
+                half = float(options.get("width", 1)) / 2
+                hit = False
+                for a, b in zip(coords[:-1], coords[1:]):
+                    box = self._box(np.array([a, b]), half + 1)
+                    if box is None:
+                        continue
+                    ys, xs, region = box
+                    self._paint(region, segment_distance(a[0], a[1], b[0], b[1], xs, ys) <= half, fill)
+                    hit = True
+                drawn += hit
+                continue
+            box = self._box(coords, float(options.get("width", 1)) / 2 + 1)
+            if box is None:
+                continue
+            ys, xs, region = box
+            outline = parse_colour(options.get("outline", "black" if kind != "polygon" else ""))
+            if kind == "rectangle":
+                # Pixel centres inside [min, max) on both axes, filled by slicing
+                (ax, ay), (bx, by) = coords
+                c0, c1 = self._span(min(ax, bx), max(ax, bx), self.view_width)
+                r0, r1 = self._span(min(ay, by), max(ay, by), self.view_height)
+                if c0 >= c1 or r0 >= r1:
+                    continue
+                if fill is not None:
+                    frame[r0:r1, c0:c1] = fill
+                if outline is not None:
+                    inside = (xs >= min(ax, bx)) & (xs < max(ax, bx)) & (ys >= min(ay, by)) & (ys < max(ay, by))
+                    edge = inside & ((xs < min(ax, bx) + 1) | (xs >= max(ax, bx) - 1)
+                                     | (ys < min(ay, by) + 1) | (ys >= max(ay, by) - 1))
+                    self._paint(region, edge, outline)
+            elif kind == "oval":
+                (ax, ay), (bx, by) = coords
+                cx, cy = (ax + bx) / 2, (ay + by) / 2
+                rx, ry = max(abs(bx - ax) / 2, 1e-9), max(abs(by - ay) / 2, 1e-9)
+                d = ((xs - cx) / rx) ** 2 + ((ys - cy) / ry) ** 2
+                self._paint(region, d <= 1, fill)
+                if outline is not None:
+                    ring = float(options.get("width", 1)) / max(min(rx, ry), 1e-9)
+                    self._paint(region, (d <= 1) & (d >= (1 - ring) ** 2), outline)
+            elif kind == "polygon":
+                self._paint(region, polygon_mask(coords, xs, ys), fill)
+            drawn += 1
+        self.stats["rasterized"] = drawn
+        return frame
+
+    def _box(self, points, pad):
+        """
+        Returns (ys, xs, region) for the pixels around points, clipped to the view.
+
+        ys and xs hold pixel-centre coordinates; region is the matching view
+        of the frame. None if the box misses the view.
+        """
+        x0 = max(int(points[:, 0].min() - pad), 0)
+        x1 = min(int(np.ceil(points[:, 0].max() + pad)), self.view_width)
+        y0 = max(int(points[:, 1].min() - pad), 0)
+        y1 = min(int(np.ceil(points[:, 1].max() + pad)), self.view_height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        ys, xs = np.ogrid[y0:y1, x0:x1]
+        return ys + 0.5, xs + 0.5, self.frame[y0:y1, x0:x1]
+
+    @staticmethod
+    def _span(lo, hi, limit):
+        """Returns the pixel range whose centres lie in [lo, hi), clipped to [0, limit)."""
+        return max(int(np.ceil(lo - 0.5)), 0), min(int(np.ceil(hi - 0.5)), limit)
+
+    @staticmethod
+    def _paint(region, mask, colour):
+        if colour is not None:
+            region[mask] = colour
+
+
+def segment_distance(ax, ay, bx, by, xs, ys):
+    """Returns the distance from each point (xs, ys) to the segment a-b."""
+    dx = bx - ax
+    dy = by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return np.hypot(xs - ax, ys - ay)
+    t = np.clip(((xs - ax) * dx + (ys - ay) * dy) / length_sq, 0.0, 1.0)
+    return np.hypot(xs - (ax + t * dx), ys - (ay + t * dy))
+
+
+def polygon_mask(points, xs, ys):
+    """Returns the even-odd fill of a polygon ((n, 2) vertices) at points (xs, ys)."""
+    inside = np.zeros(np.broadcast(xs, ys).shape, dtype=bool)
+    for (ax, ay), (bx, by) in zip(points, np.roll(points, -1, axis=0)):
+        if ay == by:
+            continue
+        crosses = (ys >= min(ay, by)) & (ys < max(ay, by))
+        x_cross = ax + (ys - ay) * (bx - ax) / (by - ay)
+        inside ^= crosses & (xs < x_cross)
+    return inside
@@ -0,0 +1,220 @@
+"""
+Repeatable pathfinding benchmark over scalable store layouts.
+
+Layouts come from generate_map, from the stock 39x28 store up to a
+warehouse-scale grid of about 1000x1000 cells. Each engine plans from random
+free starts to the goal cells of random aisles with plan_to_any, as navigation
+does, and the suite reports p50/p95 latency, node expansions, line-of-sight checks, peak memory and the memory allocated by a
+single search. Results are compared against tests/benchmark_baselines.json
+and the script exits non-zero when an engine regresses past the allowed
+tolerance.
+
+Usage:
+    python tests/benchmark_suite.py                     # check against baselines
+    python tests/benchmark_suite.py --update-baselines  # record new baselines
+    python tests/benchmark_suite.py --max-size 200      # skip the largest layouts
+"""
+import sys
+import os
+import argparse
+import json
+import random
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import aisle_goals, clear_cluster_graphs, clear_distance_fields, make_planner, plan_to_any
+from profiler import set_enabled
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "benchmark_baselines.json")
+SEED = 42
+
+# (name, aisles, shelf rows, queries per engine)
+LAYOUTS = [
+    ("store", 16, AISLE_ROWS, 60),
+    ("large", 600, 15, 20),
+    ("warehouse", 15400, 77, 4),
+]
+
+# Engines with a per-layout build step are skipped above this many cells,
+# where building them would dominate the run.
+ENGINES = {
+    "theta_star": None,
+    "theta_star_numpy": None,
+    "theta_star_bitset": None,
+    "theta_star_flat": None,
+    "theta_star_clearance": None,
+    "incremental": None,
+    "visibility_graph": 5_000,
+    "distance_field": 5_000,
+    "hierarchical": None,
+    "jps": None,
+    "lazy_theta_star": None,
+    "csgraph": None,
+}
+
+# A result regresses when it exceeds its baseline by more than this fraction.
+# Timing is noisy across runs and machines, so it only catches large
+# slowdowns; counts are deterministic for a fixed seed and are held tightly.
+TOLERANCE = {
+    "p50_ms": 1.0,
+    "p95_ms": 1.0,
+    "expansions": 0.05,
+    "los_checks": 0.05,
+    "peak_kb": 0.25,
+    "search_kb": 0.25,
+}
+
+
+def random_queries(grid, aisle_locs, count, rng):
+    """Picks count (start, goals) pairs with free random starts and random aisles' goal cells."""
+    rows, cols = len(grid), len(grid[0])
+    goals = [aisle_goals(locs) for locs in aisle_locs.values()]
+    queries = []
+    while len(queries) < count:
+        start = (rng.randrange(1, rows - 1), rng.randrange(1, cols - 1))
+        if grid[start[0]][start[1]] == 0:
+            queries.append((start, rng.choice(goals)))
+    return queries
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def run_engine(engine, grid, aisle_locs, queries):
+    """
+    Plans every query with one engine and collects its metrics.
+
+    Latency is measured without tracing. search_kb is the tracemalloc peak of
+    one more query on the warmed-up planner, i.e. what a single search
+    allocates. peak_kb is measured in a second pass covering the planner
+    build and the first query, with the shared distance fields and cluster
+    graphs dropped so they are built afresh.
+    """
+    build_start = time.perf_counter()
+    planner = make_planner(engine, grid, aisle_locs)
+    precompute = getattr(planner, "precompute", None)
+    if precompute is not None:
+        precompute()
+    build_ms = (time.perf_counter() - build_start) * 1000
+
+    times = []
+    expansions = []
+    los_checks = []
+    for start, goals in queries:
+        planner.stats.pop("los_checks", None)
+        t0 = time.perf_counter()
+        plan_to_any(planner, start, goals)
+        times.append((time.perf_counter() - t0) * 1000)
+        expansions.append(planner.stats["expansions"])
+        los_checks.append(planner.stats.get("los_checks", 0))
+
+    tracemalloc.start()
+    plan_to_any(planner, *queries[0])
+    _, search_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    clear_distance_fields()
+    clear_cluster_graphs()
+    tracemalloc.start()
+    traced = make_planner(engine, grid, aisle_locs)
+    plan_to_any(traced, *queries[0])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "build_ms": round(build_ms, 3),
+        "p50_ms": round(percentile(times, 50), 3),
+        "p95_ms": round(percentile(times, 95), 3),
+        "expansions": round(sum(expansions) / len(expansions), 1),
+        "los_checks": round(sum(los_checks) / len(los_checks), 1),
+        "peak_kb": round(peak / 1024, 1),
+        "search_kb": round(search_peak / 1024, 1),
+    }
+
+
+def check(results, baselines):
+    """Returns a list of regression messages for results exceeding their baselines."""
+    failures = []
+    for key, metrics in results.items():
+        base = baselines.get(key)
+        if base is None:
+            continue
+        for metric, tolerance in TOLERANCE.items():
+            if metric not in base:
+                continue
+            limit = base[metric] * (1 + tolerance)
+            # Tiny absolute values (e.g. sub-millisecond timings) get some slack
+            if metric.endswith("_ms"):
+                limit = max(limit, base[metric] + 0.5)
+            if metrics[metric] > limit:
+                failures.append(f"{key} {metric}: {metrics[metric]} > {limit:.3f} (baseline {base[metric]})")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CaddyMate pathfinding benchmark suite")
+    parser.add_argument("--update-baselines", action="store_true", help="write results as the new baselines")
+    parser.add_argument("--max-size", type=int, default=None, help="skip layouts wider or taller than this")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), help="engines to run")
+    args = parser.parse_args()
+    # Only some engines' entry points are decorated with @profile; its per-call
+    # log write would skew the comparison
+    set_enabled(False)
+
+    results = {}
+    for name, num_aisles, num_rows, query_count in LAYOUTS:
+        grid, aisle_locs, width, height = generate_map(num_aisles, num_rows)
+        if args.max_size and max(width, height) > args.max_size:
+            continue
+        queries = random_queries(grid, aisle_locs, query_count, random.Random(SEED))
+        print(f"\n{name.upper()} ({width}x{height}, {len(aisle_locs)} aisles, {query_count} queries)")
+        print(f"  {'engine':<22}{'build ms':>10}{'p50 ms':>10}{'p95 ms':>10}"
+              f"{'expansions':>12}{'los checks':>12}{'peak KB':>11}{'search KB':>11}")
+
+        for engine in args.engines:
+            max_cells = ENGINES.get(engine)
+            if max_cells is not None and width * height > max_cells:
+                continue
+            metrics = run_engine(engine, grid, aisle_locs, queries)
+            results[f"{name}/{engine}"] = metrics
+            print(f"  {engine:<22}{metrics['build_ms']:>10.1f}{metrics['p50_ms']:>10.3f}"
+                  f"{metrics['p95_ms']:>10.3f}{metrics['expansions']:>12.1f}"
+                  f"{metrics['los_checks']:>12.1f}{metrics['peak_kb']:>11.1f}"
+                  f"{metrics['search_kb']:>11.1f}")
+
+    if args.update_baselines:
+        baselines = {}
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE) as f:
+                baselines = json.load(f)
+        baselines.update(results)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaselines written to {BASELINE_FILE}")
+        return 0
+
+    if not os.path.exists(BASELINE_FILE):
+        print("\nNo baselines recorded; run with --update-baselines first.")
+        return 0
+    with open(BASELINE_FILE) as f:
+        baselines = json.load(f)
+    failures = check(results, baselines)
+    if failures:
+        print("\nREGRESSIONS")
+        for failure in failures:
+            print(f"  {failure}")
+        return 1
+    print("\nNo regressions against baselines.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
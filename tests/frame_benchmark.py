@@ -0,0 +1,112 @@
+"""
+Headless benchmark for the map's frame loop.
+
+Drives a MapView along a planned route without a display: the simulated
+cart reports a pose every POSE_EVERY frames (as the UDP sensor would at
+DRAW_INTERVAL_MS frames), and frames are only drawn while the view has not
+settled, the way StoreMap's demand-driven loop runs. Reports simulated
+frames per second, renderer calls per frame and the share of frames that
+settled, for the recording (no-op) backend and the NumPy raster backend
+(which also rasterizes every drawn frame).
+
+Usage:
+    python tests/frame_benchmark.py
+    python tests/frame_benchmark.py --frames 5000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, aisle_goals, MapView, AISLE_ROWS, VIEW_WIDTH, VIEW_HEIGHT
+from pathfinding import make_planner, plan_to_any
+from renderers import RecordingRenderer, RasterRenderer
+
+LAYOUTS = [
+    ("store", 16, AISLE_ROWS),
+    ("large", 600, 15),
+]
+START = (2, 2)
+POSE_EVERY = 5  # Sensor updates per frame tick, as 10 Hz poses against 50 Hz frames
+SPEED_CELLS = 0.15  # Cart travel per pose update
+
+
+def route(grid, aisle_locs):
+    """Returns the path from START to the farthest aisle's cheapest goal cell."""
+    planner = make_planner("distance_field", grid, aisle_locs)
+    aisle = max(aisle_locs, key=lambda a: sum(aisle_locs[a]["goal"]))
+    return plan_to_any(planner, START, aisle_goals(aisle_locs[aisle]))
+
+
+def poses(path, count):
+    """Yields (x, y, theta) poses moving along path at SPEED_CELLS, then holding at the end."""
+    emitted = 0
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        length = math.hypot(r1 - r0, c1 - c0)
+        theta = math.atan2(r1 - r0, c1 - c0)
+        steps = max(1, int(length / SPEED_CELLS))
+        for i in range(steps):
+            t = i / steps
+            yield c0 + (c1 - c0) * t, r0 + (r1 - r0) * t, theta
+            emitted += 1
+            if emitted >= count:
+                return
+    r, c = path[-1]
+    while emitted < count:
+        yield float(c), float(r), 0.0
+        emitted += 1
+
+
+def run(view, renderer, path, ticks, rasterize):
+    """Runs the demand-driven loop for ticks frame intervals; returns (seconds, frames drawn)."""
+    remaining = path[1:]
+    version = 0
+    pose_stream = poses(path, ticks // POSE_EVERY + 1)
+    pose = next(pose_stream)
+    awake = True
+    drawn = 0
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if tick % POSE_EVERY == 0:
+            pose = next(pose_stream, pose)
+            # Trim waypoints the cart has reached, as the position poll does
+            while remaining and math.hypot(remaining[0][1] - pose[0], remaining[0][0] - pose[1]) < 0.5:
+                remaining = remaining[1:]
+                version += 1
+            awake = True
+        if not awake:
+            continue
+        awake = not view.frame(pose, remaining, path[-1], version)
+        drawn += 1
+        if rasterize:
+            renderer.render()
+    return time.perf_counter() - start, drawn
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the map frame loop without a display.")
+    parser.add_argument("--frames", type=int, default=3000, help="frame intervals to simulate")
+    args = parser.parse_args()
+
+    for name, num_aisles, num_rows in LAYOUTS:
+        grid, aisle_locs, width, height = generate_map(num_aisles, num_rows)
+        path = route(grid, aisle_locs)
+        print(f"{name.upper()} ({width}x{height}), route of {len(path)} waypoints, {args.frames} frame intervals")
+        for label, renderer, rasterize in (
+            ("recording", RecordingRenderer(), False),
+            ("raster", RasterRenderer(VIEW_WIDTH, VIEW_HEIGHT), True),
+        ):
+            view = MapView(renderer, grid, aisle_locs, pose=(float(START[1]), float(START[0]), 0.0))
+            base = dict(renderer.stats)
+            elapsed, drawn = run(view, renderer, path, args.frames, rasterize)
+            calls = sum(renderer.stats[k] - base[k] for k in ("created", "coords", "configured", "deleted", "views"))
+            print(f"  {label:<10} frames: {drawn:6d}  frames/s: {drawn / elapsed:9.0f}  "
+                  f"calls/frame: {calls / max(drawn, 1):5.2f}  idle: {1 - drawn / args.frames:5.1%}  "
+                  f"items: {len(renderer.items):4d}")
+
+
+if __name__ == "__main__":
+    main()
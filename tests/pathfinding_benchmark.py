@@ -0,0 +1,284 @@
+import sys
+import os
+import math
+import random
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import make_planner, plan_to_any, theta_star, BitsetGrid, PathFollower, RoutePlanner
+from pathfinding.core import path_cost
+from profiler import set_enabled
+
+START_CELL = (2, 2)
+REPLAN_ENGINES = ["theta_star", "theta_star_numpy", "incremental"]
+QUERY_ENGINES = ["theta_star", "visibility_graph", "csgraph"]
+QUERY_STARTS = 100
+SEED = 42
+ROUTE_ENGINES = ["distance_field", "visibility_graph"]
+MULTI_GOAL_ENGINES = ["theta_star", "theta_star_flat", "lazy_theta_star", "distance_field"]
+ROUTE_LENGTHS = [5, 10, 16]
+# Simulated walk: 100 ms polls, 1 cell/s, replans at most once per second
+POLL_S = 0.1
+WALK_SPEED = 1.0
+REPLAN_INTERVAL_S = 1.0
+POSE_NOISE = 0.25
+
+
+def walk_cells(path):
+    """Expands a waypoint path into the sequence of cells a cart passes through."""
+    cells = [path[0]]
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        steps = max(abs(r1 - r0), abs(c1 - c0))
+        for i in range(1, steps + 1):
+            cell = (round(r0 + (r1 - r0) * i / steps), round(c0 + (c1 - c0) * i / steps))
+            if cell != cells[-1]:
+                cells.append(cell)
+    return cells
+
+
+def run_walk(engine, grid, aisle_locs, cells, goal, blocked=None):
+    """Replans at every cell of a walk and returns (expansions, seconds) per replan."""
+    planner = make_planner(engine, grid, aisle_locs)
+    samples = []
+    for i, cell in enumerate(cells[:-1]):
+        if blocked and i == len(cells) // 2:
+            if hasattr(planner, "update_cells"):
+                planner.update_cells({c: 1 for c in blocked})
+            else:
+                changed = [row[:] for row in grid]
+                for r, c in blocked:
+                    changed[r][c] = 1
+                planner = make_planner(engine, changed, aisle_locs)
+        start = time.perf_counter()
+        planner.plan(cell, goal)
+        elapsed = time.perf_counter() - start
+        samples.append((planner.stats["expansions"], elapsed))
+    return samples
+
+
+def simulate_following(path, rng):
+    """
+    Walks a noisy pose along path and counts replans under both replan policies.
+
+    Returns:
+        tuple: (polls, replans on every new cell, replans when off the corridor)
+    """
+    follower = PathFollower()
+    follower.set_path(path)
+    polls = 0
+    replans = {"cell": 0, "corridor": 0}
+    last = {"cell": (-1.0, None), "corridor": (-1.0, None)}
+    for (r0, c0), (r1, c1) in zip(path, path[1:]):
+        heading = math.atan2(r1 - r0, c1 - c0)
+        steps = max(1, int(math.hypot(r1 - r0, c1 - c0) / (WALK_SPEED * POLL_S)))
+        for i in range(steps):
+            t = polls * POLL_S
+            row = r0 + (r1 - r0) * i / steps + rng.gauss(0, POSE_NOISE)
+            col = c0 + (c1 - c0) * i / steps + rng.gauss(0, POSE_NOISE)
+            cell = (int(row), int(col))
+            off_route = follower.update(row, col, heading + rng.gauss(0, 0.2))
+            for policy, wanted in (("cell", True), ("corridor", off_route)):
+                last_time, last_cell = last[policy]
+                if wanted and t - last_time >= REPLAN_INTERVAL_S and cell != last_cell:
+                    replans[policy] += 1
+                    last[policy] = (t, cell)
+            polls += 1
+    return polls, replans["cell"], replans["corridor"]
+
+
+def summarise(name, samples):
+    expansions = [e for e, _ in samples]
+    times = [t for _, t in samples]
+    return (f"  {name:<18} replans: {len(samples):<5} "
+            f"expansions/replan: {sum(expansions) / len(expansions):8.1f}  "
+            f"ms/replan: {sum(times) / len(times) * 1000:7.3f}")
+
+
+def run_queries(engine, grid, aisle_locs, starts):
+    """Plans from every start to every aisle and returns (build seconds, costs, seconds)."""
+    build_start = time.perf_counter()
+    planner = make_planner(engine, grid, aisle_locs)
+    build_time = time.perf_counter() - build_start
+
+    costs = []
+    times = []
+    for start in starts:
+        for locs in aisle_locs.values():
+            t0 = time.perf_counter()
+            path = planner.plan(start, locs["goal"])
+            times.append(time.perf_counter() - t0)
+            if path:
+                costs.append(path_cost(path))
+    return build_time, costs, times
+
+
+def run_multi_goal(engine, grid, aisle_locs, starts):
+    """
+    Plans from every start to every aisle's goal cells, once with a single
+    multi-target search and once with a search per goal cell.
+
+    Returns:
+        dict: Mean path cost, expansions and milliseconds per query for the
+        "midpoint", "per goal" and "multi" strategies.
+    """
+    planner = make_planner(engine, grid, aisle_locs)
+    totals = {name: [0.0, 0, 0.0] for name in ("midpoint", "per goal", "multi")}
+    queries = 0
+    for start in starts:
+        for locs in aisle_locs.values():
+            queries += 1
+            for name in totals:
+                t0 = time.perf_counter()
+                if name == "midpoint":
+                    path = planner.plan(start, locs["goal"])
+                    expansions = planner.stats["expansions"]
+                elif name == "per goal":
+                    path, expansions = None, 0
+                    for goal in locs["goals"]:
+                        candidate = planner.plan(start, goal)
+                        expansions += planner.stats["expansions"]
+                        if candidate and (path is None or path_cost(candidate) < path_cost(path)):
+                            path = candidate
+                else:
+                    path = plan_to_any(planner, start, locs["goals"])
+                    expansions = planner.stats["expansions"]
+                elapsed = time.perf_counter() - t0
+                total = totals[name]
+                total[0] += path_cost(path) if path else 0.0
+                total[1] += expansions
+                total[2] += elapsed * 1000
+    return {name: [v / queries for v in total] for name, total in totals.items()}
+
+
+def run_los_cache(grid, starts, goals):
+    """Runs theta_star for every (start, goal) on a list grid and on BitsetGrids."""
+    results = []
+    bitset = BitsetGrid(grid)
+    for name, search_grid in (("list grid", grid),
+                              ("bitmasks", BitsetGrid(grid, cached=False)),
+                              ("bitmasks + cache", bitset),
+                              ("warm cache", bitset)):
+        hits, misses = bitset.hits, bitset.misses
+        t0 = time.perf_counter()
+        paths = [theta_star(search_grid, start, goal) for start in starts for goal in goals]
+        elapsed = time.perf_counter() - t0
+        lookups = bitset.hits - hits + bitset.misses - misses
+        hit_rate = (bitset.hits - hits) / lookups if search_grid is bitset and lookups else None
+        results.append((name, elapsed, hit_rate, paths))
+    return results
+
+
+def main():
+    # Keep @profile's per-call log write out of the timings
+    set_enabled(False)
+    grid, aisle_locs, _, _ = generate_map(16, AISLE_ROWS)
+
+    free_cells = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v == 0]
+    starts = random.Random(SEED).sample(free_cells, QUERY_STARTS)
+    print(f"ONE-SHOT QUERIES ({QUERY_STARTS} random starts x {len(aisle_locs)} aisles)")
+    for engine in QUERY_ENGINES:
+        build_time, costs, times = run_queries(engine, grid, aisle_locs, starts)
+        times.sort()
+        print(f"  {engine:<18} build ms: {build_time * 1000:7.2f}  "
+              f"mean cost: {sum(costs) / len(costs):7.3f}  "
+              f"mean ms: {sum(times) / len(times) * 1000:6.3f}  "
+              f"p95 ms: {times[int(len(times) * 0.95)] * 1000:6.3f}")
+    print("  (theta_star's single-cell fallback steps may cut shelf corners, which"
+          " the visibility graph never does, so its costs can read slightly lower)")
+
+    print(f"\nLINE-OF-SIGHT CACHE (theta_star, {QUERY_STARTS} random starts x {len(aisle_locs)} aisles)")
+    results = run_los_cache(grid, starts, [locs["goal"] for locs in aisle_locs.values()])
+    baseline = results[0][1]
+    for name, elapsed, hit_rate, paths in results:
+        rate = f"hit rate: {hit_rate:6.1%}" if hit_rate is not None else " " * 16
+        print(f"  {name:<18} total ms: {elapsed * 1000:8.1f}  speedup: {baseline / elapsed:5.2f}x  {rate}"
+              f"  same paths: {paths == results[0][3]}")
+
+    goals_per_aisle = len(next(iter(aisle_locs.values()))["goals"])
+    print(f"\nMULTI-GOAL ({QUERY_STARTS} random starts x {len(aisle_locs)} aisles, "
+          f"{goals_per_aisle} goal cells per aisle)")
+    for engine in MULTI_GOAL_ENGINES:
+        results = run_multi_goal(engine, grid, aisle_locs, starts)
+        print(f"  {engine:<18}" + "  ".join(
+            f"{name}: cost {cost:6.2f} exp {expansions:6.1f} ms {ms:6.3f}"
+            for name, (cost, expansions, ms) in results.items()))
+    print("  (distance_field builds each aisle's multi-goal field on its first query)")
+
+    print(f"\nBATCH QUERIES ({QUERY_STARTS} random starts x {len(aisle_locs)} aisles)")
+    aisle_goals = [locs["goal"] for locs in aisle_locs.values()]
+    planner = make_planner("theta_star", grid, aisle_locs)
+    t0 = time.perf_counter()
+    for start in starts:
+        for goal in aisle_goals:
+            planner.plan(start, goal)
+    print(f"  {'theta_star':<18} one search per pair:       {(time.perf_counter() - t0) * 1000:8.1f} ms")
+    planner = make_planner("csgraph", grid, aisle_locs)
+    t0 = time.perf_counter()
+    for start in starts:
+        planner.plan_many(start, aisle_goals)
+    print(f"  {'csgraph':<18} one run per start:         {(time.perf_counter() - t0) * 1000:8.1f} ms")
+    planner = make_planner("csgraph", grid, aisle_locs)
+    t0 = time.perf_counter()
+    for goal in aisle_goals:
+        planner.plan_all_to(starts, goal)
+    print(f"  {'csgraph':<18} one run per aisle:         {(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+    print(f"\nROUTE ORDERING (start {START_CELL})")
+    rng = random.Random(SEED)
+    for engine in ROUTE_ENGINES:
+        planner = make_planner(engine, grid, aisle_locs)
+        precompute = getattr(planner, "precompute", None)
+        t0 = time.perf_counter()
+        if precompute is not None:
+            precompute()
+        build_ms = (time.perf_counter() - t0) * 1000
+        # Each order costs the aisle pairs it has not seen yet
+        route_planner = RoutePlanner(planner, aisle_locs)
+        timings = []
+        for stops in ROUTE_LENGTHS:
+            aisles = rng.sample(list(aisle_locs), stops)
+            t0 = time.perf_counter()
+            route_planner.order(START_CELL, aisles)
+            timings.append(f"{stops} stops: {(time.perf_counter() - t0) * 1000:6.2f} ms")
+        print(f"  {engine:<18} build ms: {build_ms:7.2f}  " + "  ".join(timings))
+
+    for scenario in ("walk", "walk + blocked cell"):
+        samples = {engine: [] for engine in REPLAN_ENGINES}
+        for aisle, locs in aisle_locs.items():
+            goal = locs["goal"]
+            reference = make_planner("theta_star", grid, aisle_locs).plan(START_CELL, goal)
+            if not reference:
+                continue
+            cells = walk_cells(reference)
+            blocked = None
+            if scenario != "walk" and len(cells) > 4:
+                # Drop an obstacle a few cells ahead of the halfway point
+                blocked = [cells[len(cells) // 2 + 2]]
+                if blocked[0] == goal:
+                    blocked = None
+
+            for engine in REPLAN_ENGINES:
+                samples[engine] += run_walk(engine, grid, aisle_locs, cells, goal, blocked)
+
+        print(f"\n{scenario.upper()} (start {START_CELL}, all {len(aisle_locs)} aisles)")
+        for engine in REPLAN_ENGINES:
+            print(summarise(engine, samples[engine]))
+
+    print(f"\nFOLLOWING (start {START_CELL}, pose noise {POSE_NOISE} cells, all {len(aisle_locs)} aisles)")
+    rng = random.Random(SEED)
+    totals = [0, 0, 0]
+    planner = make_planner("theta_star", grid, aisle_locs)
+    for locs in aisle_locs.values():
+        path = planner.plan(START_CELL, locs["goal"])
+        if path:
+            for i, value in enumerate(simulate_following(path, rng)):
+                totals[i] += value
+    polls, cell_replans, corridor_replans = totals
+    print(f"  polls: {polls}  replans on new cell: {cell_replans}  "
+          f"replans off corridor: {corridor_replans}")
+
+
+if __name__ == "__main__":
+    main()
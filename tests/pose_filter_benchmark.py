@@ -0,0 +1,167 @@
+"""
+Replay benchmark for the drawn cart pose.
+
+Replays a high-rate pose trace (a synthetic drive along planned routes
+through the store, or a recorded CSV log) as the sensor would send it at
+several rates, with measurement noise, network delay and jitter and
+dropped packets, and draws it with a headless MapView at the map's frame
+rate. The drawn pose is compared with the true pose at every frame:
+
+- err: mean and p95 position error, in cells;
+- heading: mean heading error, in degrees;
+- lag: the delay (ms) at which the true trace best matches the drawn one.
+
+"blend" is the per-frame POSE_SMOOTHING blend towards the latest packet;
+"filter" draws the PoseFilter prediction for each frame.
+
+Usage:
+    python tests/pose_filter_benchmark.py
+    python tests/pose_filter_benchmark.py --log poses.csv   # lines of t,x,y,theta (seconds, cells, radians)
+"""
+import argparse
+import math
+import os
+import random
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, aisle_goals, MapView, AISLE_ROWS, DRAW_INTERVAL_MS, POSE_SMOOTHING
+from pathfinding import make_planner, plan_to_any
+from pose_filter import PoseFilter
+from renderers import RecordingRenderer
+
+SEED = 7
+SEND_RATES_HZ = (20, 10, 5, 2)
+TRACE_HZ = 200
+SPEED_CELLS_S = 1.5
+PAUSE_S = 1.0  # Stop at each aisle
+STOPS = ("12", "3", "9", "15")
+NOISE_CELLS = 0.03
+NOISE_RAD = 0.02
+DELAY_S = 0.02
+JITTER_S = 0.03  # Mean of the exponential extra delay
+DROP_RATE = 0.03
+MAX_LAG_S = 1.0
+
+
+def synthetic_trace():
+    """Returns (t, x, y, theta) arrays of a drive from aisle to aisle at SPEED_CELLS_S."""
+    grid, aisle_locs, _, _ = generate_map(16, AISLE_ROWS)
+    planner = make_planner("distance_field", grid, aisle_locs)
+    waypoints = []
+    start = (2, 2)
+    for aisle in STOPS:
+        path = plan_to_any(planner, start, aisle_goals(aisle_locs[aisle]))
+        waypoints.append(path)
+        start = path[-1]
+
+    ts, xs, ys, thetas = [], [], [], []
+    t = 0.0
+    theta = 0.0
+    for path in waypoints:
+        for (r0, c0), (r1, c1) in zip(path, path[1:]):
+            length = math.hypot(r1 - r0, c1 - c0)
+            theta = math.atan2(r1 - r0, c1 - c0)
+            steps = max(1, int(length / SPEED_CELLS_S * TRACE_HZ))
+            for i in range(steps):
+                f = i / steps
+                ts.append(t)
+                xs.append(c0 + (c1 - c0) * f)
+                ys.append(r0 + (r1 - r0) * f)
+                thetas.append(theta)
+                t += 1.0 / TRACE_HZ
+        r, c = path[-1]
+        for _ in range(int(PAUSE_S * TRACE_HZ)):
+            ts.append(t)
+            xs.append(float(c))
+            ys.append(float(r))
+            thetas.append(theta)
+            t += 1.0 / TRACE_HZ
+    return np.array(ts), np.array(xs), np.array(ys), np.unwrap(np.array(thetas))
+
+
+def load_trace(path):
+    """Loads a t,x,y,theta CSV log (one pose per line) recorded at a high rate."""
+    data = np.loadtxt(path, delimiter=",", ndmin=2)
+    t = data[:, 0] - data[0, 0]
+    return t, data[:, 1], data[:, 2], np.unwrap(data[:, 3])
+
+
+def packets(trace, rate, rng):
+    """Returns (arrival time, x, y, theta) packets sent at rate Hz, sorted by arrival."""
+    t, x, y, theta = trace
+    sent = np.arange(0.0, t[-1], 1.0 / rate)
+    result = []
+    for s in sent:
+        if rng.random() < DROP_RATE:
+            continue
+        arrival = s + DELAY_S + rng.expovariate(1.0 / JITTER_S)
+        result.append((
+            arrival,
+            np.interp(s, t, x) + rng.gauss(0.0, NOISE_CELLS),
+            np.interp(s, t, y) + rng.gauss(0.0, NOISE_CELLS),
+            np.interp(s, t, theta) + rng.gauss(0.0, NOISE_RAD),
+        ))
+    result.sort()
+    return result
+
+
+def replay(trace, incoming, filtered):
+    """Draws the packets with a headless MapView; returns frame times and drawn (x, y, theta)."""
+    grid = [[0] * 40 for _ in range(30)]
+    t_end = trace[0][-1]
+    first = incoming[0]
+    view = MapView(RecordingRenderer(), grid, {}, pose=first[1:],
+                   smoothing=1.0 if filtered else POSE_SMOOTHING)
+    pose_filter = PoseFilter()
+    latest = first[1:]
+    times = np.arange(first[0], t_end, DRAW_INTERVAL_MS / 1000.0)
+    drawn = np.empty((len(times), 3))
+    i = 0
+    for k, now in enumerate(times):
+        while i < len(incoming) and incoming[i][0] <= now:
+            arrival, x, y, theta = incoming[i]
+            latest = (x, y, theta)
+            pose_filter.update(x, y, theta, arrival)
+            i += 1
+        target = pose_filter.predict(now) if filtered else latest
+        view.frame(target, [], None, 0)
+        drawn[k] = (view.robot_x, view.robot_y, view.robot_theta)
+    return times, drawn
+
+
+def score(trace, times, drawn):
+    """Returns (mean error, p95 error, mean heading error in degrees, lag in ms)."""
+    t, x, y, theta = trace
+    err = np.hypot(drawn[:, 0] - np.interp(times, t, x), drawn[:, 1] - np.interp(times, t, y))
+    heading = drawn[:, 2] - np.interp(times, t, theta)
+    heading = np.abs((heading + math.pi) % (2 * math.pi) - math.pi)
+    lags = np.arange(0.0, MAX_LAG_S, 0.005)
+    shifted = [
+        np.mean(np.hypot(drawn[:, 0] - np.interp(times - lag, t, x), drawn[:, 1] - np.interp(times - lag, t, y)))
+        for lag in lags
+    ]
+    return err.mean(), np.percentile(err, 95), math.degrees(heading.mean()), lags[int(np.argmin(shifted))] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay pose traces through the drawn-pose smoothing.")
+    parser.add_argument("--log", help="CSV of t,x,y,theta to replay instead of the synthetic drive")
+    args = parser.parse_args()
+
+    trace = load_trace(args.log) if args.log else synthetic_trace()
+    print(f"Trace: {trace[0][-1]:.1f} s, {len(trace[0])} poses; frames every {DRAW_INTERVAL_MS} ms")
+    print(f"{'send Hz':<8} {'method':<8} {'err mean':>9} {'err p95':>9} {'heading':>9} {'lag ms':>8}")
+    for rate in SEND_RATES_HZ:
+        incoming = packets(trace, rate, random.Random(SEED))
+        for label, filtered in (("blend", False), ("filter", True)):
+            times, drawn = replay(trace, incoming, filtered)
+            mean, p95, heading, lag = score(trace, times, drawn)
+            print(f"{rate:<8} {label:<8} {mean:9.3f} {p95:9.3f} {heading:8.1f}° {lag:8.0f}")
+
+
+if __name__ == "__main__":
+    main()
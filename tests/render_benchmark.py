@@ -0,0 +1,141 @@
+"""
+Benchmark for the map's static shelf layer.
+
+Compares drawing one canvas rectangle per occupied cell with the merged
+rectangles from shelf_rectangles, and with the tiled layer StoreMap uses,
+which only keeps the tiles around the view on the canvas: number of canvas
+items, time to build the layer and time to repaint while the view scrolls
+across the map, the way update_visuals follows the cart.
+
+Canvas timings need a display; without one only the item counts and the
+merge time are reported. The tiled layer's item count is the peak reached
+while scrolling. The same scroll is then measured at every zoom level's
+level of detail (merged blocks without labels when zoomed out, one
+rectangle per cell when zoomed in).
+
+Usage:
+    python tests/render_benchmark.py
+"""
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import tkinter as tk
+from map import (generate_map, shelf_rectangles, tile_contents, lod_tiles, lod_tile_cells, TiledLayer,
+                 AISLE_ROWS, CELL_SIZE, ZOOM_LEVELS, VIEW_WIDTH as VIEW_W, VIEW_HEIGHT as VIEW_H)
+
+LAYOUTS = [
+    ("store", 16, AISLE_ROWS),
+    ("large", 600, 15),
+]
+SCROLL_STEPS = 100
+LABEL_FONT = ("Arial", 14, "bold")
+
+
+def cell_rectangles(grid):
+    """One (row0, col0, row1, col1) rectangle per occupied cell, as the map used to draw."""
+    return [(r, c, r + 1, c + 1) for r, row in enumerate(grid) for c, v in enumerate(row) if v == 1]
+
+
+def draw_layer(canvas, rects):
+    """Draws rectangles on a canvas and returns the seconds taken, including the first paint."""
+    start = time.perf_counter()
+    for r0, c0, r1, c1 in rects:
+        canvas.create_rectangle(c0 * CELL_SIZE, r0 * CELL_SIZE, c1 * CELL_SIZE, r1 * CELL_SIZE,
+                                fill="#404040", outline="", tags="shelf")
+    canvas.update()
+    return time.perf_counter() - start
+
+
+def scroll_positions(full_w, full_h):
+    """Camera positions (pixels) of a diagonal scroll across the map."""
+    return [(i / SCROLL_STEPS * max(0, full_w - VIEW_W), i / SCROLL_STEPS * max(0, full_h - VIEW_H))
+            for i in range(SCROLL_STEPS)]
+
+
+def scroll_repaint(canvas, full_w, full_h, layer=None):
+    """Scrolls the view diagonally across the map; returns mean seconds per repaint."""
+    start = time.perf_counter()
+    for x, y in scroll_positions(full_w, full_h):
+        canvas.xview_moveto(x / full_w)
+        canvas.yview_moveto(y / full_h)
+        if layer is not None:
+            layer.sync(x, y, VIEW_W, VIEW_H)
+        canvas.update()
+    return (time.perf_counter() - start) / SCROLL_STEPS
+
+
+def peak_tile_items(layer, full_w, full_h):
+    """Returns the most layer items shown at once during the diagonal scroll."""
+    peak = 0
+    for x, y in scroll_positions(full_w, full_h):
+        _, keys = layer.visible(x, y, VIEW_W, VIEW_H)
+        peak = max(peak, sum(len(layer.tiles[k]["rects"]) + len(layer.tiles[k]["labels"]) for k in keys))
+    return peak
+
+
+def main():
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        root = None
+        print("No display available; skipping canvas timings.\n")
+
+    for name, num_aisles, num_rows in LAYOUTS:
+        grid, aisle_locs, width, height = generate_map(num_aisles, num_rows)
+        full_w = width * CELL_SIZE
+        full_h = height * CELL_SIZE
+        start = time.perf_counter()
+        merged = shelf_rectangles(grid)
+        merge_ms = (time.perf_counter() - start) * 1000
+        print(f"{name.upper()} ({width}x{height}), merge ms: {merge_ms:.2f}")
+
+        for label, rects in (("per cell", cell_rectangles(grid)), ("merged", merged)):
+            line = f"  {label:<10} items: {len(rects):7d}"
+            if root is not None:
+                window = tk.Toplevel(root)
+                canvas = tk.Canvas(window, width=VIEW_W, height=VIEW_H, bg="white",
+                                   scrollregion=(0, 0, full_w, full_h), highlightthickness=0)
+                canvas.pack()
+                build = draw_layer(canvas, rects)
+                repaint = scroll_repaint(canvas, full_w, full_h)
+                window.destroy()
+                line += f"  build ms: {build * 1000:9.2f}  scroll repaint ms: {repaint * 1000:7.3f}"
+            print(line)
+
+        # Tiled: labels included, only the tiles around the view exist
+        tiles = tile_contents(grid, aisle_locs)
+        line = f"  {'tiled':<10} items: {peak_tile_items(TiledLayer(None, tiles, LABEL_FONT), full_w, full_h):7d}"
+        if root is not None:
+            window = tk.Toplevel(root)
+            canvas = tk.Canvas(window, width=VIEW_W, height=VIEW_H, bg="white",
+                               scrollregion=(0, 0, full_w, full_h), highlightthickness=0)
+            canvas.pack()
+            layer = TiledLayer(canvas, tiles, LABEL_FONT)
+            start = time.perf_counter()
+            layer.sync(0, 0, VIEW_W, VIEW_H)
+            canvas.update()
+            build = time.perf_counter() - start
+            repaint = scroll_repaint(canvas, full_w, full_h, layer)
+            window.destroy()
+            line += (f"  build ms: {build * 1000:9.2f}  scroll repaint ms: {repaint * 1000:7.3f}"
+                     f"  canvas items: {layer.item_count()}")
+        print(line)
+
+        for zoom in ZOOM_LEVELS:
+            start = time.perf_counter()
+            tiles = lod_tiles(grid, aisle_locs, zoom)
+            build_ms = (time.perf_counter() - start) * 1000
+            layer = TiledLayer(None, tiles, LABEL_FONT, lod_tile_cells(zoom), cell_px=CELL_SIZE * zoom)
+            peak = peak_tile_items(layer, full_w * zoom, full_h * zoom)
+            print(f"  zoom {zoom:<5} items: {peak:7d}  level build ms: {build_ms:7.2f}")
+
+    if root is not None:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    main()
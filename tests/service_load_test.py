@@ -0,0 +1,130 @@
+"""
+Load test for planning_service.py.
+
+Opens several client connections, each sending batches of random shopping
+routes as fast as the service answers them, and reports requests (batches)
+and routes per second with batch latency percentiles.
+
+Usage:
+    python tests/service_load_test.py --start-server --workers 4
+    python tests/service_load_test.py --port 5006 --clients 8 --batch 16 --duration 10
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from planning_service import SERVICE_AISLES, SERVICE_HOST, SERVICE_PORT
+
+SEED = 42
+CONNECT_TIMEOUT_S = 30.0
+
+
+def random_routes(grid, aisle_locs, count, rng, max_stops=5):
+    """Returns route requests from random free cells to random shopping lists."""
+    free_cells = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v == 0]
+    aisles = list(aisle_locs)
+    return [
+        {"start": list(rng.choice(free_cells)),
+         "aisles": rng.sample(aisles, rng.randint(1, min(max_stops, len(aisles))))}
+        for _ in range(count)
+    ]
+
+
+def connect(host, port, timeout=CONNECT_TIMEOUT_S):
+    """Connects to the service, retrying while it starts up."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return socket.create_connection((host, port))
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def run_client(host, port, batches, stop_at, latencies, errors):
+    """Sends batches until stop_at, recording each batch's round-trip time."""
+    with connect(host, port) as sock:
+        reader = sock.makefile("rb")
+        request_id = 0
+        while time.monotonic() < stop_at:
+            request_id += 1
+            routes = batches[request_id % len(batches)]
+            message = json.dumps({"id": request_id, "routes": routes}).encode("utf-8") + b"\n"
+            started = time.perf_counter()
+            sock.sendall(message)
+            reply = json.loads(reader.readline())
+            latencies.append(time.perf_counter() - started)
+            if "error" in reply or reply.get("id") != request_id:
+                errors.append(reply.get("error", "mismatched id"))
+            else:
+                errors.extend(r["error"] for r in reply["routes"] if "error" in r)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the route-planning service.")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--clients", type=int, default=4, help="concurrent connections")
+    parser.add_argument("--batch", type=int, default=8, help="routes per request")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--aisles", type=int, default=SERVICE_AISLES, help="aisles in the served layout")
+    parser.add_argument("--start-server", action="store_true", help="run planning_service.py for the test")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="workers for --start-server")
+    args = parser.parse_args()
+
+    server = None
+    if args.start_server:
+        script = os.path.join(os.path.dirname(__file__), "..", "planning_service.py")
+        server = subprocess.Popen([sys.executable, script, "--host", args.host, "--port", str(args.port),
+                                   "--workers", str(args.workers), "--aisles", str(args.aisles)])
+    try:
+        grid, aisle_locs, _, _ = generate_map(args.aisles, AISLE_ROWS)
+        rng = random.Random(SEED)
+        batches = [random_routes(grid, aisle_locs, args.batch, rng) for _ in range(64)]
+        # Wait for the service before starting the clock
+        connect(args.host, args.port).close()
+
+        latencies = []
+        errors = []
+        stop_at = time.monotonic() + args.duration
+        started = time.perf_counter()
+        threads = [
+            threading.Thread(target=run_client, args=(args.host, args.port, batches, stop_at, latencies, errors))
+            for _ in range(args.clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    if not latencies:
+        print("No requests completed.")
+        return 1
+    latencies.sort()
+    requests = len(latencies)
+    print(f"{args.clients} clients x {args.batch} routes/request for {elapsed:.1f} s")
+    print(f"  requests/s: {requests / elapsed:9.1f}")
+    print(f"  routes/s:   {requests * args.batch / elapsed:9.1f}")
+    print(f"  p50 ms:     {latencies[len(latencies) // 2] * 1000:9.2f}")
+    print(f"  p95 ms:     {latencies[int(len(latencies) * 0.95)] * 1000:9.2f}")
+    print(f"  errors:     {len(errors):9d}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import CachedPlanner, IncrementalPlanner, PathCache, get_distance_fields, layout_version
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PathCache(maxsize=2)
+    cache.put("a", (1,))
+    cache.put("b", (2,))
+    assert cache.get("a") == (1,)
+    cache.put("c", (3,))
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == (1,)
+    assert cache.get("c") == (3,)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_unreachable_is_cached():
+    cache = PathCache()
+    cache.put("k", None)
+    assert cache.get("k", "missing") is None
+    assert cache.get("other", "missing") == "missing"
+
+
+def test_layout_version_tracks_cell_changes():
+    grid, _, _, _ = generate_map(4, AISLE_ROWS)
+    changed = [row[:] for row in grid]
+    changed[2][2] = 1
+    assert layout_version(grid) == layout_version([row[:] for row in grid])
+    assert layout_version(grid) != layout_version(changed)
+
+
+def test_cached_planner_invalidates_on_update_cells():
+    grid, _, _, _ = generate_map(4, AISLE_ROWS)
+    cache = PathCache()
+    planner = CachedPlanner(IncrementalPlanner(grid), "incremental", grid, cache=cache)
+    start, goal = (1, 1), (2, 7)
+
+    first = planner.plan(start, goal)
+    assert first is not None
+    assert planner.plan(start, goal) == first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    planner.update_cells({goal: 1})
+    assert planner.plan(start, goal) is None
+    assert cache.misses == 2
+
+
+def test_distance_fields_are_shared_only_for_the_same_goal_cells():
+    grid, aisle_locs, _, _ = generate_map(4, AISLE_ROWS)
+    same = {aisle: dict(locs) for aisle, locs in aisle_locs.items()}
+    fewer_goals = {aisle: dict(locs) for aisle, locs in aisle_locs.items()}
+    aisle = next(iter(fewer_goals))
+    fewer_goals[aisle]["goals"] = fewer_goals[aisle]["goals"][:1]
+
+    assert get_distance_fields(grid, aisle_locs) is get_distance_fields(grid, same)
+    assert get_distance_fields(grid, aisle_locs) is not get_distance_fields(grid, fewer_goals)
@@ -0,0 +1,52 @@
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import ClearanceThetaStar, FlatThetaStar, LazyThetaStar, aisle_goals, line_of_sight, theta_star, theta_star_any
+from pathfinding import flat
+
+
+def _queries(grid, count, seed):
+    rng = random.Random(seed)
+    free = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v == 0]
+    return [(rng.choice(free), rng.choice(free)) for _ in range(count)]
+
+
+def test_matches_theta_star():
+    grid, _, _, _ = generate_map(16, AISLE_ROWS)
+    planner = FlatThetaStar(grid)
+    for start, goal in _queries(grid, 50, 11):
+        assert planner.plan(start, goal) == theta_star(grid, start, goal)
+
+
+def test_plan_any_matches_theta_star_any():
+    grid, aisle_locs, _, _ = generate_map(16, AISLE_ROWS)
+    planner = FlatThetaStar(grid)
+    for aisle, locs in aisle_locs.items():
+        goals = aisle_goals(locs)
+        assert planner.plan_any((1, 1), goals) == theta_star_any(grid, (1, 1), goals)
+
+
+def test_flat_line_of_sight_matches_list_grid():
+    grid, _, _, _ = generate_map(8, AISLE_ROWS)
+    cols = len(grid[0])
+    cells = [v for row in grid for v in row]
+    for (ar, ac), (br, bc) in _queries(grid, 300, 5):
+        expected = line_of_sight(grid, (ar, ac), (br, bc))
+        got = flat.flat_line_of_sight(cells, cols, ar * cols + ac, ar, ac, br * cols + bc, br, bc)
+        assert bool(got) == expected
+
+
+def test_generation_wrap_resets_stamps():
+    grid, _, _, _ = generate_map(4, AISLE_ROWS)
+    start, goal = (1, 1), (2, 7)
+    for planner_cls in (FlatThetaStar, LazyThetaStar, ClearanceThetaStar):
+        planner = planner_cls(grid)
+        expected = planner.plan(start, goal)
+        assert expected is not None
+        planner.generation = flat.GENERATION_LIMIT
+        assert planner.plan(start, goal) == expected
+        assert planner.plan(start, goal) == expected
@@ -0,0 +1,54 @@
+import sys
+import os
+import math
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pathfinding import PathFollower
+
+# An L-shaped route: along row 2 to column 10, then down column 10 to row 10
+PATH = [(2, 2), (2, 10), (10, 10)]
+
+
+def test_trims_passed_segments():
+    follower = PathFollower()
+    follower.set_path(PATH)
+    assert follower.remaining() == [(2, 10), (10, 10)]
+
+    assert not follower.update(2.2, 6.0)
+    assert follower.remaining() == [(2, 10), (10, 10)]
+
+    # Past the corner the first segment is dropped
+    assert not follower.update(5.0, 10.1)
+    assert follower.remaining() == [(10, 10)]
+
+
+def test_never_moves_back_to_a_trimmed_segment():
+    follower = PathFollower()
+    follower.set_path(PATH)
+    follower.update(6.0, 10.0)
+    follower.update(2.0, 8.0)
+    assert follower.remaining() == [(10, 10)]
+
+
+def test_detects_leaving_the_corridor():
+    follower = PathFollower(max_deviation=1.5)
+    follower.set_path(PATH)
+    assert not follower.update(3.0, 5.0)
+    assert follower.update(5.0, 5.0)
+    assert math.isclose(follower.cross_track, 3.0)
+
+
+def test_detects_heading_away_from_the_route():
+    follower = PathFollower(max_heading_error=math.radians(120))
+    follower.set_path(PATH)
+    # The first segment runs towards +col (theta 0)
+    assert not follower.update(2.0, 4.0, theta=0.1)
+    assert follower.update(2.0, 4.0, theta=math.pi)
+
+
+def test_empty_path_needs_a_plan():
+    follower = PathFollower()
+    follower.set_path([])
+    assert follower.update(2.0, 2.0)
+    assert follower.remaining() == []
@@ -0,0 +1,61 @@
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import IncrementalPlanner
+
+
+def _fresh_cost(grid, start, goal):
+    """Returns the 8-connected cost found by a from-scratch search, or None."""
+    planner = IncrementalPlanner(grid)
+    if planner.plan(start, goal) is None:
+        return None
+    return planner.g[start[0] * planner.cols + start[1]]
+
+
+def test_repaired_search_matches_fresh_search():
+    # Seed 8 drifts the float key modifier far enough to end the search early
+    grid, _, _, _ = generate_map(16, AISLE_ROWS)
+    free = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v == 0]
+    for seed in (0, 8):
+        rng = random.Random(seed)
+        current = [row[:] for row in grid]
+        goal = rng.choice(free)
+        start = rng.choice(free)
+        planner = IncrementalPlanner(grid)
+        for _ in range(60):
+            changes = {}
+            for _ in range(rng.randint(0, 3)):
+                cell = rng.choice(free)
+                if cell != goal:
+                    changes[cell] = rng.randint(0, 1)
+            for (r, c), value in changes.items():
+                current[r][c] = value
+            planner.update_cells(changes)
+            if current[start[0]][start[1]] == 1:
+                current[start[0]][start[1]] = 0
+                planner.update_cells({start: 0})
+
+            path = planner.plan(start, goal)
+            expected = _fresh_cost(current, start, goal)
+            if expected is None:
+                assert path is None
+            else:
+                assert path is not None and path[0] == start and path[-1] == goal
+                assert planner.g[start[0] * planner.cols + start[1]] == expected
+
+            near = [(r, c) for r, c in free
+                    if abs(r - start[0]) <= 2 and abs(c - start[1]) <= 2 and current[r][c] == 0]
+            start = rng.choice(near) if near else start
+
+
+def test_blocked_goal_has_no_path():
+    grid, _, _, _ = generate_map(4, AISLE_ROWS)
+    planner = IncrementalPlanner(grid)
+    goal = (2, 5)
+    assert planner.plan((2, 2), goal) is not None
+    planner.update_cells({goal: 1})
+    assert planner.plan((2, 2), goal) is None
@@ -0,0 +1,53 @@
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import BitsetGrid, OccupancyGrid, line_of_sight
+
+
+def _grids():
+    """The stock store plus a walled random grid with scattered obstacles."""
+    store, _, _, _ = generate_map(16, AISLE_ROWS)
+    rng = random.Random(21)
+    rows, cols = 30, 40
+    scattered = [[1 if r in (0, rows - 1) or c in (0, cols - 1) or rng.random() < 0.2 else 0
+                  for c in range(cols)] for r in range(rows)]
+    return [store, scattered]
+
+
+def _segments(grid, count, seed):
+    rng = random.Random(seed)
+    rows, cols = len(grid), len(grid[0])
+    return [((rng.randrange(rows), rng.randrange(cols)), (rng.randrange(rows), rng.randrange(cols)))
+            for _ in range(count)]
+
+
+def test_occupancy_grid_matches_line_of_sight():
+    for grid in _grids():
+        occupancy = OccupancyGrid(grid)
+        segments = _segments(grid, 2000, 1)
+        expected = [line_of_sight(grid, a, b) for a, b in segments]
+
+        assert [occupancy.line_of_sight(a, b) for a, b in segments] == expected
+        pairs = occupancy.batch_line_of_sight_pairs([a for a, _ in segments], [b for _, b in segments])
+        assert pairs.tolist() == expected
+        origin = segments[0][0]
+        targets = [b for _, b in segments]
+        batch = occupancy.batch_line_of_sight(origin, targets)
+        assert batch.tolist() == [line_of_sight(grid, origin, b) for b in targets]
+
+
+def test_bitset_grid_matches_line_of_sight():
+    for grid in _grids():
+        bitset = BitsetGrid(grid)
+        segments = _segments(grid, 2000, 2)
+        expected = [line_of_sight(grid, a, b) for a, b in segments]
+
+        assert [bitset.segment_clear(a, b) for a, b in segments] == expected
+        # The first pass fills the cache; the second is answered from it
+        assert [bitset.line_of_sight(a, b) for a, b in segments] == expected
+        assert [bitset.line_of_sight(a, b) for a, b in segments] == expected
+        assert bitset.hits >= len(segments)
@@ -0,0 +1,42 @@
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import PLANNERS, IncrementalPlanner, aisle_goals, make_planner
+from pathfinding.core import path_cost
+
+# Smoothing a different 8-connected route can make a one-search answer
+# slightly longer than the best of the per-goal answers
+COST_SLACK = 1.06
+
+
+def test_every_engine_searches_all_goals_at_once():
+    grid, aisle_locs, _, _ = generate_map(16, AISLE_ROWS)
+    free = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v == 0]
+    rng = random.Random(4)
+    starts = [rng.choice(free) for _ in range(4)]
+    for engine in PLANNERS:
+        planner = make_planner(engine, grid, aisle_locs)
+        assert hasattr(planner, "plan_any"), engine
+        for start in starts:
+            for locs in aisle_locs.values():
+                goals = aisle_goals(locs)
+                path = planner.plan_any(start, goals)
+                assert path is not None and path[0] == start and path[-1] in goals, engine
+                best = min(path_cost(planner.plan(start, goal)) for goal in goals)
+                assert path_cost(path) <= best * COST_SLACK + 1e-9, engine
+
+
+def test_incremental_reuses_its_tree_for_the_same_goal_set():
+    grid, aisle_locs, _, _ = generate_map(16, AISLE_ROWS)
+    goals = aisle_goals(aisle_locs[max(aisle_locs, key=int)])
+    planner = IncrementalPlanner(grid)
+    planner.plan_any((1, 1), goals)
+    path = planner.plan_any((1, 2), goals)
+    assert path[0] == (1, 2) and path[-1] in goals
+    fresh = IncrementalPlanner(grid)
+    fresh.plan_any((1, 2), goals)
+    assert planner.stats["expansions"] < fresh.stats["expansions"]
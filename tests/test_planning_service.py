@@ -0,0 +1,22 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import planning_service
+
+
+def setup_module():
+    planning_service.load_layout(planning_service.SERVICE_AISLES, planning_service.AISLE_ROWS, "distance_field")
+
+
+def test_routes_known_aisles():
+    result = planning_service.plan_route({"start": [2, 2], "aisles": ["3", 7]})
+    assert sorted(result["order"]) == ["3", "7"]
+    assert all(leg for leg in result["legs"])
+
+
+def test_rejects_aisles_that_are_not_a_list_of_names():
+    for aisles in ("37", {"3": 1}, ["3", None], [True], ["3", "no such aisle"]):
+        result = planning_service.plan_route({"start": [2, 2], "aisles": aisles})
+        assert "error" in result, aisles
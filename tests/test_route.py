@@ -0,0 +1,81 @@
+import sys
+import os
+import itertools
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from map import generate_map, AISLE_ROWS
+from pathfinding import make_planner, RoutePlanner
+from pathfinding.route import held_karp, nearest_neighbour_two_opt
+
+
+def _route_cost(costs, order):
+    stops = [0] + list(order)
+    return sum(costs[a][b] for a, b in zip(stops, stops[1:]))
+
+
+def _brute_force_cost(costs):
+    return min(_route_cost(costs, order) for order in itertools.permutations(range(1, len(costs))))
+
+
+def _random_costs(rng, n, symmetric):
+    costs = [[0.0] * n for _ in range(n)]
+    for i in range(n):
+        for j in range(n):
+            if i != j:
+                costs[i][j] = rng.uniform(1.0, 50.0)
+    if symmetric:
+        for i in range(n):
+            for j in range(i):
+                costs[i][j] = costs[j][i]
+    return costs
+
+
+def test_held_karp_matches_brute_force():
+    rng = random.Random(7)
+    for n in range(2, 8):
+        for symmetric in (True, False):
+            costs = _random_costs(rng, n, symmetric)
+            order = held_karp(costs)
+            assert sorted(order) == list(range(1, n))
+            assert abs(_route_cost(costs, order) - _brute_force_cost(costs)) < 1e-9
+
+
+def test_two_opt_visits_every_stop_once():
+    rng = random.Random(3)
+    costs = _random_costs(rng, 14, symmetric=True)
+    order = nearest_neighbour_two_opt(costs)
+    assert sorted(order) == list(range(1, 14))
+
+
+def test_order_drops_unknown_and_duplicate_aisles():
+    grid, aisle_locs, _, _ = generate_map(8, AISLE_ROWS)
+    planner = RoutePlanner(make_planner("distance_field", grid, aisle_locs), aisle_locs)
+    order = planner.order((1, 1), ["3", "1", "3", "missing", 5])
+    assert sorted(order) == ["1", "3", "5"]
+
+
+def test_order_only_costs_the_requested_stops():
+    grid, aisle_locs, _, _ = generate_map(8, AISLE_ROWS)
+    fields = make_planner("distance_field", grid, aisle_locs)
+    queried = []
+
+    class Recording:
+        def cost_any(self, start, goals):
+            queried.append(tuple(goals))
+            return fields.cost_any(start, goals)
+
+    planner = RoutePlanner(Recording(), aisle_locs)
+    stops = ["2", "6", "4"]
+    order = planner.order((1, 1), stops)
+    assert sorted(order) == sorted(stops)
+    requested = {tuple(planner.goals[a]) for a in stops}
+    assert queried and set(queried) <= requested
+
+    # After warming, ordering only costs the legs from the start
+    planner = RoutePlanner(Recording(), aisle_locs)
+    planner.warm(stops)
+    queried.clear()
+    planner.order((1, 1), stops)
+    assert len(queried) == len(stops)
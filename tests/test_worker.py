@@ -0,0 +1,105 @@
+import sys
+import os
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from pathfinding import PlanWorker
+
+
+def _deliver_all(worker, timeout=5.0):
+    """Calls deliver() until nothing is outstanding, like the map's after() loop."""
+    deadline = time.monotonic() + timeout
+    while worker.outstanding():
+        assert time.monotonic() < deadline, "worker did not finish"
+        worker.deliver()
+        time.sleep(0.005)
+
+
+def test_only_newest_result_is_delivered():
+    worker = PlanWorker()
+    release = threading.Event()
+    started = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    worker.submit(slow, results.append)
+    assert started.wait(5)
+    # The first job is running; the second is superseded while still waiting
+    worker.submit(lambda: "second", results.append)
+    worker.submit(lambda: "third", results.append)
+    release.set()
+    _deliver_all(worker)
+    worker.stop()
+
+    assert results == ["third"]
+
+
+def test_cancel_discards_running_result():
+    worker = PlanWorker()
+    release = threading.Event()
+    started = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "cancelled"
+
+    worker.submit(slow, results.append)
+    assert started.wait(5)
+    worker.cancel()
+    release.set()
+    _deliver_all(worker)
+
+    worker.submit(lambda: "next", results.append)
+    _deliver_all(worker)
+    worker.stop()
+
+    assert results == ["next"]
+
+
+def test_failing_job_delivers_none():
+    worker = PlanWorker()
+    results = []
+
+    def broken():
+        raise RuntimeError("search failed")
+
+    worker.submit(broken, results.append)
+    _deliver_all(worker)
+    worker.stop()
+
+    assert results == [None]
+
+
+def test_background_job_survives_later_submits_and_cancel():
+    worker = PlanWorker()
+    release = threading.Event()
+    started = threading.Event()
+    warmed = threading.Event()
+    results = []
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    worker.submit(slow, results.append)
+    assert started.wait(5)
+    # Queued while a plan job runs, then followed by jobs that supersede and cancel
+    worker.submit_background(warmed.set)
+    worker.submit(lambda: "second", results.append)
+    worker.cancel()
+    worker.submit(lambda: "third", results.append)
+    release.set()
+    _deliver_all(worker)
+    assert warmed.wait(5)
+    worker.stop()
+
+    assert results == ["third"]
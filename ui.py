@@ -21,10 +21,12 @@ class CaddyMateUI:
 
         self.fonts = load_fonts(root)
         self.history = []
+        self.shopping_list = []
 
         self.vtt = VoiceToText()
         self.voice_active = False
         self._arrival_popup = None
+        self._store_map = None
         self._scroll_canvases = set()
         self._drag_state = {"active": None, "last_y": None, "accum": 0.0}
         self._drag_bindings_ready = False
@@ -62,10 +64,14 @@ class CaddyMateUI:
     def clear(self):
         """
         Clears all widgets from the root window and stops any active voice recording.
+        The store map is only hidden, so it can be shown again without rebuilding it.
         """
         self.stop_voice()
         for w in self.root.winfo_children():
-            w.destroy()
+            if w is self._store_map:
+                w.hide()
+            else:
+                w.destroy()
 
     def enable_canvas_drag_scroll(self, canvas):
         """
@@ -386,6 +392,17 @@ class CaddyMateUI:
         )
         search_btn.pack(pady=10, ipady=4)
 
+        list_btn = make_button(
+            button_container,
+            f"🛒 Shopping List ({len(self.shopping_list)})",
+            lambda: self.navigate_to(self.show_shopping_list),
+            self.fonts,
+            large=False,
+            primary=False,
+            width=22
+        )
+        list_btn.pack(pady=(10, 0), ipady=4)
+
 
     # Categories
     def show_categories(self):
@@ -675,32 +692,168 @@ class CaddyMateUI:
             fg=PRIMARY
         ).pack()
 
+        button_row = tk.Frame(content_frame, bg=CARD_BG)
+        button_row.pack()
+
         # Navigation button
         make_button(
-            content_frame,
+            button_row,
             "Begin Navigation",
             lambda: self.navigate_to(self.show_map, aisle),
             self.fonts,
             large=True,
             primary=True
-        ).pack(pady=0, ipady=6)
+        ).pack(side="left", padx=(0, 10), ipady=6)
+
+        # Shopping list button
+        in_list = (item, aisle) in self.shopping_list
+        list_btn = make_button(
+            button_row,
+            "✓ In List" if in_list else "+ Add to List",
+            lambda: self._add_to_shopping_list(item, aisle, list_btn),
+            self.fonts,
+            large=True,
+            primary=False,
+            width=14
+        )
+        list_btn.pack(side="left", ipady=6)
+
+    def _add_to_shopping_list(self, item, aisle, button=None):
+        """Adds an item to the shopping list (once) and updates its button."""
+        if (item, aisle) not in self.shopping_list:
+            self.shopping_list.append((item, aisle))
+        if button is not None:
+            button.configure(text="✓ In List")
+
+    # Shopping List
+    def show_shopping_list(self):
+        """Displays the shopping list with an option to navigate the whole route."""
+        self.clear()
+
+        aisles = {aisle for _, aisle in self.shopping_list}
+        self._create_header(
+            "🛒 Shopping List",
+            subtitle=f"{len(self.shopping_list)} items across {len(aisles)} aisles"
+        )
+
+        # Actions stay pinned below the list
+        action_frame = tk.Frame(self.root, bg=BG_COLOR)
+        action_frame.pack(side="bottom", fill="x", padx=20, pady=(0, 15))
+
+        start_btn = make_button(
+            action_frame,
+            "Start Route",
+            lambda: self.navigate_to(self.show_route),
+            self.fonts,
+            large=False,
+            primary=True,
+            width=16
+        )
+        start_btn.pack(side="left")
+        if not self.shopping_list:
+            start_btn.configure(state="disabled")
+
+        make_button(
+            action_frame,
+            "Clear List",
+            self._clear_shopping_list,
+            self.fonts,
+            large=False,
+            primary=False,
+            width=12
+        ).pack(side="right")
+
+        scrollable_frame, canvas = self._create_card_scroll_area()
+
+        padding_frame = tk.Frame(scrollable_frame, bg=CARD_BG)
+        padding_frame.pack(fill="both", expand=True, padx=20, pady=15)
+
+        if not self.shopping_list:
+            tk.Label(
+                padding_frame,
+                text="Your list is empty. Add items from search or categories.",
+                font=self.fonts["subtitle"],
+                bg=CARD_BG,
+                fg=TEXT_LIGHT
+            ).pack(pady=20)
+            return
+
+        for index, (item, aisle) in enumerate(self.shopping_list):
+            row = tk.Frame(padding_frame, bg=CARD_BG)
+            row.pack(fill="x", pady=4)
+
+            tk.Label(
+                row,
+                text=item,
+                font=self.fonts["small"],
+                bg=CARD_BG,
+                fg=TEXT,
+                anchor="w"
+            ).pack(side="left")
+
+            make_button(
+                row,
+                "✕",
+                lambda i=index: self._remove_from_shopping_list(i),
+                self.fonts,
+                large=False,
+                primary=False,
+                width=3
+            ).pack(side="right")
+
+            tk.Label(
+                row,
+                text=f"Aisle {aisle}",
+                font=self.fonts["subtitle"],
+                bg=CARD_BG,
+                fg=TEXT_LIGHT
+            ).pack(side="right", padx=10)
+
+    def _remove_from_shopping_list(self, index):
+        """Removes one entry and redraws the list."""
+        if 0 <= index < len(self.shopping_list):
+            self.shopping_list.pop(index)
+        self.show_shopping_list()
+
+    def _clear_shopping_list(self):
+        """Empties the shopping list and redraws it."""
+        self.shopping_list.clear()
+        self.show_shopping_list()
 
     # Map
-    def show_map(self, aisle):
-        """Initializes and displays the navigation map."""
+    def _show_store_map(self, target, on_arrival):
+        """Shows the navigation map for target, building it the first time only."""
         self.clear()
+        if self._store_map is not None and self._store_map.winfo_exists():
+            self._store_map.navigate(target, on_arrival)
+            return
+
         from map import StoreMap
-        
+
         max_aisles = get_max_aisle()
-        StoreMap(
+        self._store_map = StoreMap(
             self.root,
-            aisle,
+            target,
             max_aisles,
             self.go_back,
-            lambda: self.show_arrival_popup(f"Arrived at Aisle {aisle}"),
+            on_arrival,
             fonts=self.fonts
         )
 
+    def show_map(self, aisle):
+        """Displays the navigation map for a single aisle."""
+        self._show_store_map(aisle, lambda: self.show_arrival_popup(f"Arrived at Aisle {aisle}"))
+
+    def show_route(self):
+        """Displays the navigation map for every aisle on the shopping list."""
+        aisles = [aisle for _, aisle in self.shopping_list]
+        self._show_store_map(aisles, self._finish_route)
+
+    def _finish_route(self):
+        """Clears the completed shopping list and shows the arrival popup."""
+        self.shopping_list.clear()
+        self.show_arrival_popup("Shopping route complete")
+
     def show_arrival_popup(self, message):
         """Shows a short-lived popup, then returns to the main menu."""
         if self._arrival_popup and self._arrival_popup.winfo_exists():